@@ -0,0 +1,185 @@
+# plot_adc_trace.py
+"""
+Decode and plot ADC traces recorded on the device by src/adc_trace.py.
+
+Input is either the raw binary sent over usb_cdc.data or a saved console
+log containing the base64 block between the DTRC markers.
+
+Examples
+--------
+Plot a trace saved from the serial console:
+    python scripts/plot_adc_trace.py console.log
+
+Read the binary straight from the usb_cdc data port (needs pyserial):
+    python scripts/plot_adc_trace.py --port /dev/ttyACM1
+
+Export the samples instead of plotting:
+    python scripts/plot_adc_trace.py console.log --csv trace.csv
+"""
+
+import argparse
+import base64
+import struct
+import sys
+
+TRACE_MAGIC = b"DTRC"
+TRACE_VERSION = 1
+TRACE_HEADER_FORMAT = "<4sBBHB"
+TRACE_CHANNEL_FORMAT = "<BI"
+TRACE_BEGIN_MARKER = "--- DTRC BEGIN ---"
+TRACE_END_MARKER = "--- DTRC END ---"
+
+# Keep in sync with src/game_config.py
+MUX_VOLTAGE_THRESHOLD = 30000
+
+
+def extract_payload(data: bytes) -> bytes:
+    """Return the binary trace from raw bytes or a console log."""
+    if data.startswith(TRACE_MAGIC):
+        return data
+
+    text = data.decode("utf-8", errors="replace")
+    start = text.find(TRACE_BEGIN_MARKER)
+    end = text.find(TRACE_END_MARKER, start)
+    if start < 0 or end < 0:
+        raise ValueError("No DTRC trace found in input")
+
+    body = text[start + len(TRACE_BEGIN_MARKER) : end]
+    return base64.b64decode("".join(body.split()))
+
+
+def decode_trace(payload: bytes) -> dict:
+    """
+    Decode a binary trace.
+
+    Returns
+    -------
+    dict
+        {"sample_bits": int, "channels": [{"channel", "duration_us",
+        "samples"}, ...]} with samples scaled to 16-bit AnalogIn units.
+    """
+    header_size = struct.calcsize(TRACE_HEADER_FORMAT)
+    channel_size = struct.calcsize(TRACE_CHANNEL_FORMAT)
+
+    magic, version, num_channels, num_samples, sample_bits = struct.unpack_from(
+        TRACE_HEADER_FORMAT, payload, 0
+    )
+    if magic != TRACE_MAGIC:
+        raise ValueError(f"Bad trace magic {magic!r}")
+    if version != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version {version}")
+
+    offset = header_size
+    channel_info = []
+    for _ in range(num_channels):
+        channel_info.append(struct.unpack_from(TRACE_CHANNEL_FORMAT, payload, offset))
+        offset += channel_size
+
+    expected = offset + num_channels * num_samples * 2
+    if len(payload) < expected:
+        raise ValueError(f"Trace truncated: {len(payload)} of {expected} bytes")
+
+    shift = 16 - sample_bits
+    channels = []
+    for channel, duration_us in channel_info:
+        raw = struct.unpack_from(f"<{num_samples}H", payload, offset)
+        offset += num_samples * 2
+        channels.append({
+            "channel": channel,
+            "duration_us": duration_us,
+            "samples": [value << shift for value in raw],
+        })
+
+    return {"sample_bits": sample_bits, "channels": channels}
+
+
+def read_from_port(port: str, timeout: float) -> bytes:
+    """Read one binary trace from a usb_cdc data port."""
+    import serial
+
+    with serial.Serial(port, timeout=timeout) as ser:
+        header = ser.read(struct.calcsize(TRACE_HEADER_FORMAT))
+        _, _, num_channels, num_samples, _ = struct.unpack(TRACE_HEADER_FORMAT, header)
+        remaining = num_channels * (
+            struct.calcsize(TRACE_CHANNEL_FORMAT) + num_samples * 2
+        )
+        return header + ser.read(remaining)
+
+
+def print_summary(trace: dict, threshold: int) -> None:
+    """Print per-channel rate, range and threshold crossings."""
+    for info in trace["channels"]:
+        samples = info["samples"]
+        duration_us = max(info["duration_us"], 1)
+        rate = len(samples) * 1_000_000 / duration_us
+        crossings = sum(
+            1
+            for a, b in zip(samples, samples[1:])
+            if (a < threshold) != (b < threshold)
+        )
+        low = sum(1 for value in samples if value < threshold)
+        print(
+            f"Channel {info['channel']}: {len(samples)} samples in "
+            f"{duration_us / 1000:.1f} ms ({rate:.0f} samples/s), "
+            f"min {min(samples)}, max {max(samples)}, "
+            f"{low} below threshold, {crossings} threshold crossings"
+        )
+
+
+def write_csv(trace: dict, path: str) -> None:
+    """Write time (us) and sample columns for every channel."""
+    with open(path, "w") as f:
+        f.write("channel,time_us,value\n")
+        for info in trace["channels"]:
+            step = info["duration_us"] / max(len(info["samples"]), 1)
+            for i, value in enumerate(info["samples"]):
+                f.write(f"{info['channel']},{i * step:.1f},{value}\n")
+
+
+def plot_trace(trace: dict, threshold: int) -> None:
+    """Plot each channel against time with the press threshold."""
+    import matplotlib.pyplot as plt
+
+    channels = trace["channels"]
+    fig, axes = plt.subplots(len(channels), 1, sharex=True, squeeze=False)
+    for ax, info in zip(axes[:, 0], channels):
+        step_ms = info["duration_us"] / 1000 / max(len(info["samples"]), 1)
+        times = [i * step_ms for i in range(len(info["samples"]))]
+        ax.plot(times, info["samples"], linewidth=0.8)
+        ax.axhline(threshold, color="red", linestyle="--", linewidth=0.8)
+        ax.set_ylabel(f"Ch {info['channel']}")
+        ax.set_ylim(0, 65535)
+    axes[-1, 0].set_xlabel("Time (ms)")
+    fig.suptitle("Dancie mux ADC trace")
+    plt.show()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", nargs="?", help="Console log or raw trace file")
+    parser.add_argument("--port", help="usb_cdc data port to read the trace from")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--threshold", type=int, default=MUX_VOLTAGE_THRESHOLD)
+    parser.add_argument("--csv", help="Write samples to CSV instead of plotting")
+    args = parser.parse_args()
+
+    if args.port:
+        payload = read_from_port(args.port, args.timeout)
+    elif args.path:
+        with open(args.path, "rb") as f:
+            payload = extract_payload(f.read())
+    else:
+        payload = extract_payload(sys.stdin.buffer.read())
+
+    trace = decode_trace(payload)
+    print_summary(trace, args.threshold)
+
+    if args.csv:
+        write_csv(trace, args.csv)
+        print(f"Wrote {args.csv}")
+    else:
+        plot_trace(trace, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+# bench_game.py
+"""Headless benchmark of the real game loop (src/code.py) on CPython.
+
+Plays the game on the simulated board (see run_game.py) at maximum speed
+with scripted input and a fixed random seed, and reports:
+
+- frames: display refreshes per wall-clock second, and game time per
+  wall-clock second
+- functions: calls, cumulative and own time per function in src/ (the
+  key drawing, scanning and refresh functions are always listed)
+- allocations: peak bytes the game allocates between two refreshes
+  (mean and max, the refresh itself excluded), and the src/ lines
+  holding the most memory at the end
+
+Each measurement runs in its own subprocess because profiling and
+allocation tracing slow the game down too much to time it at the same
+time. Results are written as JSON; --compare prints the change against an
+earlier result, e.g. from before a renderer or scanner change:
+
+    python bench_game.py --json before.json
+    # ...change something...
+    python bench_game.py --json after.json --compare before.json
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import platform
+import pstats
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import run_game
+import sim_hardware
+
+# Always reported, even when outside the top --top functions
+KEY_FUNCTIONS = (
+    "helpers_esp32c3.py:clear_displayio_bitmap",
+    "helpers_esp32c3.py:draw_numpy_to_displayio_bitmap",
+    "input_handler.py:read_switch",
+    "input_handler.py:detect_tilt_direction",
+    "i2c_bus.py:refresh",
+    "hud.py:update",
+    "feedback_effects.py:tick",
+    "neopixel_manager.py:tick",
+)
+
+
+def default_script(seconds):
+    """
+    Start the game, then press a switch every 0.4 s and tilt every 3 s.
+
+    Switches cycle 1-8 and tilts through every direction, so hits,
+    wrong presses, misses and gesture prompts all happen.
+    """
+    actions = [sim_hardware.ScriptAction(1.0, "button")]
+    directions = ("left", "up", "right", "down")
+    t = 3.0
+    i = 0
+    while t < seconds:
+        actions.append(sim_hardware.ScriptAction(t, "switch", (str(i % 8 + 1),)))
+        if i % 8 == 7:
+            actions.append(
+                sim_hardware.ScriptAction(
+                    t + 0.2, "tilt", (directions[i // 8 % 4], "0.5")
+                )
+            )
+        t += 0.4
+        i += 1
+    return sim_hardware.InputScript(actions)
+
+
+def play(args):
+    """Run the game once; returns (code.py globals, hardware, wall seconds)."""
+    random.seed(args.seed)
+    if args.script is not None:
+        script = sim_hardware.InputScript.load(args.script)
+    else:
+        script = default_script(args.seconds)
+
+    hardware = sim_hardware.install(
+        realtime=False,
+        script=script,
+        display_options={"backend": "headless"},
+        stop_after=args.seconds,
+    )
+    wall_start = time.perf_counter()
+    try:
+        game_globals = run_game.run_code()
+    finally:
+        wall_seconds = time.perf_counter() - wall_start
+    return game_globals, hardware, wall_seconds
+
+
+def _function_key(filename, name):
+    return f"{os.path.basename(filename)}:{name}"
+
+
+def measure_time(args):
+    game_globals, hardware, wall_seconds = play(args)
+    frames = game_globals["ctx"].frames_rendered
+    display = game_globals["display"]
+    hardware.close()
+    return {
+        "game_seconds": hardware.now(),
+        "wall_seconds": wall_seconds,
+        "frames": frames,
+        "frames_presented": display.emulator.frames_presented,
+        "fps": frames / max(wall_seconds, 1e-9),
+        "speedup": hardware.now() / max(wall_seconds, 1e-9),
+    }
+
+
+def measure_functions(args):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        game_globals, hardware, _ = play(args)
+    finally:
+        profiler.disable()
+    frames = max(game_globals["ctx"].frames_rendered, 1)
+    hardware.close()
+
+    stats = pstats.Stats(profiler).stats
+    functions = {}
+    for (filename, _, name), (_, calls, own, cumulative, _) in stats.items():
+        if not os.path.abspath(filename).startswith(run_game.SRC_DIR):
+            continue
+        key = _function_key(filename, name)
+        entry = functions.setdefault(
+            key, {"calls": 0, "own_s": 0.0, "cumulative_s": 0.0}
+        )
+        entry["calls"] += calls
+        entry["own_s"] += own
+        entry["cumulative_s"] += cumulative
+
+    for entry in functions.values():
+        entry["per_call_us"] = entry["cumulative_s"] / max(entry["calls"], 1) * 1e6
+        entry["per_frame_ms"] = entry["cumulative_s"] / frames * 1e3
+
+    # Top functions by own time (cumulative double counts nested calls and
+    # coroutine resumes), plus the key functions
+    ranked = sorted(functions, key=lambda key: functions[key]["own_s"], reverse=True)
+    keep = set(ranked[: args.top]) | {key for key in KEY_FUNCTIONS if key in functions}
+    return {key: functions[key] for key in ranked if key in keep}
+
+
+def measure_allocations(args):
+    import i2c_bus
+
+    samples = []
+    last = {}
+    refresh = i2c_bus.I2CBus.refresh
+
+    def traced_refresh(bus, display):
+        # Peak above the level the previous refresh left, i.e. what the game
+        # and input tasks allocated for this frame. The refresh itself (the
+        # simulator's compositing) is left out.
+        current, peak = tracemalloc.get_traced_memory()
+        if last:
+            samples.append(peak - last["current"])
+        refresh(bus, display)
+        tracemalloc.reset_peak()
+        last["current"] = tracemalloc.get_traced_memory()[0]
+
+    i2c_bus.I2CBus.refresh = traced_refresh
+    tracemalloc.start()
+    try:
+        _, hardware, _ = play(args)
+        snapshot = tracemalloc.take_snapshot()
+        final_current = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+        i2c_bus.I2CBus.refresh = refresh
+    hardware.close()
+
+    snapshot = snapshot.filter_traces(
+        [tracemalloc.Filter(True, os.path.join(run_game.SRC_DIR, "*"))]
+    )
+    top_sites = [
+        {
+            "line": f"{os.path.basename(stat.traceback[0].filename)}:"
+            f"{stat.traceback[0].lineno}",
+            "bytes": stat.size,
+            "blocks": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[: args.top]
+    ]
+
+    # Skip the first frames, which include one-time setup
+    steady = samples[len(samples) // 10 :] or samples
+    return {
+        "per_frame_bytes_mean": sum(steady) / max(len(steady), 1),
+        "per_frame_bytes_max": max(steady, default=0),
+        "frames_sampled": len(steady),
+        "traced_bytes_at_end": final_current,
+        "top_sites": top_sites,
+    }
+
+
+MEASUREMENTS = {
+    "time": measure_time,
+    "functions": measure_functions,
+    "allocations": measure_allocations,
+}
+
+
+def run_worker(args):
+    result = MEASUREMENTS[args.worker](args)
+    with open(args.result, "w") as f:
+        json.dump(result, f)
+
+
+def run_measurement(name, args):
+    """Run one measurement in a fresh interpreter and return its result."""
+    with tempfile.TemporaryDirectory() as tmp:
+        result_path = os.path.join(tmp, "result.json")
+        command = [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--worker",
+            name,
+            "--result",
+            result_path,
+            "--seconds",
+            str(args.seconds),
+            "--seed",
+            str(args.seed),
+            "--top",
+            str(args.top),
+        ]
+        if args.script is not None:
+            command += ["--script", os.path.abspath(args.script)]
+        output = None if args.verbose else subprocess.DEVNULL
+        subprocess.run(command, check=True, stdout=output)
+        with open(result_path) as f:
+            return json.load(f)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=run_game.REPO_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results, baseline=None):
+    def delta(value, old):
+        if old is None or not old:
+            return ""
+        return f" ({(value - old) / old * 100:+.1f}%)"
+
+    frames = results["frames"]
+    old_frames = baseline["frames"] if baseline else {}
+    print(
+        f"\n{frames['frames']} frames in {frames['wall_seconds']:.2f} s: "
+        f"{frames['fps']:.1f} FPS{delta(frames['fps'], old_frames.get('fps'))}, "
+        f"{frames['speedup']:.1f}x real time "
+        f"({frames['game_seconds']:.0f} s of game time)"
+    )
+
+    print(f"\n{'Function':48s} {'Calls':>8s} {'us/call':>9s} {'ms/frame':>9s}")
+    old_functions = baseline["functions"] if baseline else {}
+    for key, entry in results["functions"].items():
+        old = old_functions.get(key, {}).get("per_frame_ms")
+        print(
+            f"{key:48s} {entry['calls']:8d} {entry['per_call_us']:9.1f} "
+            f"{entry['per_frame_ms']:9.3f}{delta(entry['per_frame_ms'], old)}"
+        )
+
+    allocations = results["allocations"]
+    mean = allocations["per_frame_bytes_mean"]
+    old_mean = baseline["allocations"]["per_frame_bytes_mean"] if baseline else None
+    print(
+        f"\nAllocated per frame: {mean:.0f} B mean{delta(mean, old_mean)}, "
+        f"{allocations['per_frame_bytes_max']} B max"
+    )
+    for site in allocations["top_sites"]:
+        print(f"  {site['line']:32s} {site['bytes']:8d} B in {site['blocks']} blocks")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the game loop headless")
+    parser.add_argument(
+        "--seconds", type=float, default=60, help="Game time to play (default 60)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--script", help="Input script (default: switches every 0.4 s, tilts)"
+    )
+    parser.add_argument(
+        "--top", type=int, default=15, help="Functions and allocation sites listed"
+    )
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--compare", help="Earlier --json result to compare with")
+    parser.add_argument(
+        "--verbose", action="store_true", help="Show the game's console output"
+    )
+    parser.add_argument("--worker", choices=MEASUREMENTS, help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.worker is not None:
+        run_worker(args)
+        return
+
+    results = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": __import__("numpy").__version__,
+        "seconds": args.seconds,
+        "seed": args.seed,
+        "script": args.script,
+        "frames": run_measurement("time", args),
+        "functions": run_measurement("functions", args),
+        "allocations": run_measurement("allocations", args),
+    }
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# bench_helpers_host.py
+"""Run the src/bench_helpers.py micro-benchmarks on CPython and NumPy.
+
+The helpers and the benchmark are the same files that run on the device;
+ulab.numpy and displayio come from the shims (see run_game.py). The CSV
+printed here has the same format as the device's REPL output, so the two
+can be compared line by line:
+
+    python bench_helpers_host.py --output host.csv
+    python bench_helpers_host.py --only rotate
+"""
+
+import argparse
+import os
+import sys
+
+SIMULATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+SHIMS_DIR = os.path.join(SIMULATOR_DIR, "shims")
+SRC_DIR = os.path.join(os.path.dirname(SIMULATOR_DIR), "src")
+
+sys.path[:0] = [SHIMS_DIR, SRC_DIR]
+
+import bench_helpers  # noqa: E402
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time the bitmap helpers on the desktop"
+    )
+    parser.add_argument("--only", help="Only time helpers whose name contains this")
+    parser.add_argument(
+        "--min-ms",
+        type=int,
+        default=bench_helpers.BENCH_MIN_MS,
+        help="Shortest timed batch per case",
+    )
+    parser.add_argument(
+        "--max-calls",
+        type=int,
+        default=bench_helpers.BENCH_MAX_CALLS,
+        help="Largest batch per case",
+    )
+    parser.add_argument("--output", help="Also write the CSV to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows = bench_helpers.run(args.only, args.min_ms, args.max_calls)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            f.write(bench_helpers.CSV_HEADER + "\n")
+            f.writelines(row + "\n" for row in rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Presentation backends for the SSD1306 emulator.
+
+The emulator itself only keeps the 1 KB MVLSB framebuffer; a backend decides
+what happens to each frame in show():
+
+- "tk": a desktop window (the default, throttled to the configured FPS)
+- "headless": nothing leaves memory; the latest frame is kept for tests
+- "raw": every frame's 1 KB page buffer is appended to a binary file
+- "gif": frames are collected and written as an animated GIF on close
+- "png": every frame is written as a numbered PNG
+
+All but "tk" run unthrottled, so batch renders and render-cost measurements
+go as fast as the code under test allows, and they get every show(), even
+when nothing changed. A GIF frame lasts 1/fps by default; given a clock
+(the simulated board's, for the real game), it lasts until the next frame,
+so screens that stay up without redrawing keep their real duration.
+"""
+
+import os
+from collections.abc import Callable
+
+import numpy as np
+from PIL import Image
+
+BACKENDS = ("tk", "headless", "raw", "gif", "png")
+
+
+class HeadlessBackend:
+    """Keeps the most recent frame in memory and counts frames."""
+
+    realtime = False
+
+    def __init__(self, width: int, height: int):
+        self.frame = np.zeros((height, width), dtype=np.uint8)
+        self.frames = 0
+
+    def present(self, pixels: np.ndarray, page_buffer: bytearray) -> None:
+        np.copyto(self.frame, pixels)
+        self.frames += 1
+
+    def pump(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class TkBackend:
+    """Desktop window with one long-lived PhotoImage updated in place."""
+
+    realtime = True
+
+    def __init__(self, width: int, height: int, scale: int, title: str):
+        # Imported here so headless runs don't need Tk or a display
+        import tkinter as tk
+
+        from PIL import ImageTk
+
+        # Scaled frame: each OLED pixel is a scale x scale block. The 4-D
+        # view lets one broadcasted copy do the nearest-neighbour upscale,
+        # and the PIL image shares the array's memory, so presenting a frame
+        # allocates nothing.
+        scaled_size = (width * scale, height * scale)
+        self._scaled = np.zeros((scaled_size[1], scaled_size[0]), dtype=np.uint8)
+        self._scaled_blocks = self._scaled.reshape(height, scale, width, scale)
+        self._scaled_image = Image.frombuffer(
+            "L", scaled_size, self._scaled, "raw", "L", 0, 1
+        )
+
+        self._root = tk.Tk()
+        self._root.title(title)
+        self._tk_image = ImageTk.PhotoImage("L", scaled_size)
+        self._label = tk.Label(self._root, bd=0, image=self._tk_image)
+        self._label.pack()
+
+    def present(self, pixels: np.ndarray, page_buffer: bytearray) -> None:
+        np.copyto(self._scaled_blocks, pixels[:, None, :, None])
+        self._tk_image.paste(self._scaled_image)
+        self._root.update_idletasks()
+        self._root.update()
+
+    def pump(self) -> None:
+        self._root.update()
+
+    def bind_keys(self, on_press, on_release) -> None:
+        """Call on_press(keysym) / on_release(keysym) for window key events."""
+        self._root.bind("<KeyPress>", lambda event: on_press(event.keysym))
+        self._root.bind("<KeyRelease>", lambda event: on_release(event.keysym))
+
+    def close(self) -> None:
+        self._root.destroy()
+
+
+class RawBackend:
+    """Appends each frame's MVLSB page buffer to a binary file.
+
+    The file is a plain concatenation of width * height / 8 byte frames in
+    the SSD1306's own layout, e.g. for diffing renders byte for byte.
+    """
+
+    realtime = False
+
+    def __init__(self, path: str):
+        self._file = open(path, "wb")
+        self.frames = 0
+
+    def present(self, pixels: np.ndarray, page_buffer: bytearray) -> None:
+        self._file.write(page_buffer)
+        self.frames += 1
+
+    def pump(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ImageBackend:
+    """Writes frames as a numbered PNG sequence or one animated GIF.
+
+    Parameters
+    ----------
+    path : str
+        For "png", a directory (created if needed). For "gif", the file.
+    fmt : str
+        "png" or "gif".
+    scale : int
+        Pixel upscale applied to the saved images.
+    frame_ms : int
+        GIF frame duration in milliseconds, when there is no clock.
+    clock : callable or None
+        Returns the time in seconds. Each GIF frame then lasts from its
+        present() to the next one (the last one until close()).
+    """
+
+    realtime = False
+
+    def __init__(
+        self,
+        path: str,
+        fmt: str,
+        scale: int = 1,
+        frame_ms: int = 50,
+        clock: Callable[[], float] | None = None,
+    ):
+        self.path = path
+        self.fmt = fmt
+        self.scale = scale
+        self.frame_ms = frame_ms
+        self.clock = clock
+        self.frames = 0
+        self._gif_frames = []
+        self._gif_times = []
+        if fmt == "png":
+            os.makedirs(path, exist_ok=True)
+
+    def _image(self, pixels: np.ndarray) -> Image.Image:
+        image = Image.fromarray(pixels, mode="L").convert("1")
+        if self.scale != 1:
+            image = image.resize(
+                (image.width * self.scale, image.height * self.scale), Image.NEAREST
+            )
+        return image
+
+    def present(self, pixels: np.ndarray, page_buffer: bytearray) -> None:
+        image = self._image(pixels)
+        if self.fmt == "png":
+            image.save(os.path.join(self.path, f"frame_{self.frames:05d}.png"))
+        else:
+            self._gif_frames.append(image)
+            if self.clock is not None:
+                self._gif_times.append(self.clock())
+        self.frames += 1
+
+    def _gif_durations(self) -> int | list[int]:
+        """Milliseconds per GIF frame: fixed, or measured with the clock."""
+        if self.clock is None:
+            return self.frame_ms
+        times = self._gif_times + [self.clock()]
+        # GIF delays are in 10 ms steps; shorter ones play back too fast
+        return [
+            max(10, round((end - start) * 1000))
+            for start, end in zip(times, times[1:])
+        ]
+
+    def pump(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self.fmt == "gif" and self._gif_frames:
+            first, *rest = self._gif_frames
+            first.save(
+                self.path,
+                save_all=True,
+                append_images=rest,
+                duration=self._gif_durations(),
+                loop=0,
+            )
+            self._gif_frames = []
+            self._gif_times = []
+
+
+def create_backend(
+    name: str,
+    width: int,
+    height: int,
+    scale: int = 4,
+    title: str = "SSD1306 Emulator",
+    output: str | None = None,
+    fps: int = 60,
+    clock: Callable[[], float] | None = None,
+):
+    """Build a backend by name (one of BACKENDS)."""
+    if name == "tk":
+        return TkBackend(width, height, scale, title)
+    if name == "headless":
+        return HeadlessBackend(width, height)
+    if name == "raw":
+        return RawBackend(output or "frames.raw")
+    if name == "gif":
+        return ImageBackend(
+            output or "frames.gif",
+            "gif",
+            scale,
+            frame_ms=max(1, 1000 // fps),
+            clock=clock,
+        )
+    if name == "png":
+        return ImageBackend(output or "frames", "png", scale)
+    raise ValueError(f"Unknown display backend {name!r}, expected one of {BACKENDS}")
+
+
+def add_backend_arguments(parser) -> None:
+    """Add --backend, --output, --scale and --fps to an argparse parser."""
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="tk",
+        help="Where frames go (default: tk window)",
+    )
+    parser.add_argument(
+        "--output", help="File or directory for the raw, gif and png backends"
+    )
+    parser.add_argument("--scale", type=int, default=4, help="Pixel upscale")
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=60,
+        help="Redraw cap for the tk window, frame rate of untimed gif output",
+    )
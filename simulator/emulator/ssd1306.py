@@ -1,11 +1,19 @@
 """SSD1306 desktop emulator that mimics CircuitPython's framebuf surface."""
 
 import time
-import tkinter as tk
+from collections.abc import Callable
 from dataclasses import dataclass
 
+import numpy as np
 from adafruit_framebuf import MVLSB, FrameBuffer
-from PIL import Image, ImageTk
+
+from .backends import create_backend
+
+# Row i holds the 8 pixel values (0 or 0xFF) of byte value i, LSB first,
+# matching MVLSB where bit 0 is the top pixel of a page.
+_MVLSB_LUT = np.unpackbits(
+    np.arange(256, dtype=np.uint8)[:, None], axis=1, bitorder="little"
+) * np.uint8(0xFF)
 
 
 @dataclass
@@ -13,8 +21,11 @@ class EmulatorConfig:
     width: int = 128
     height: int = 64
     scale: int = 4  # how many desktop pixels per OLED pixel
-    fps: int = 10  # throttle redraws to avoid pegging the CPU
+    fps: int = 60  # cap on window redraws per second
     title: str = "SSD1306 Emulator"
+    backend: str = "tk"  # "tk", "headless", "raw", "gif" or "png"
+    output: str | None = None  # file/directory for raw, gif and png
+    clock: Callable[[], float] | None = None  # times gif frames (else 1/fps)
 
 
 class SSD1306Emulator(FrameBuffer):
@@ -29,46 +40,69 @@ class SSD1306Emulator(FrameBuffer):
         self.buf = bytearray(self.width * self.height // 8)
         super().__init__(self.buf, self.width, self.height, MVLSB)
 
-        self._root = tk.Tk()
-        self._root.title(cfg.title)
-        self._label = tk.Label(self._root, bd=0)
-        self._label.pack()
-        self._tk_image = None  # keep reference so Tk doesn’t GC it
+        # Reusable views/buffers for the page -> row-major conversion
+        pages = self.height // 8
+        self._pages = np.frombuffer(self.buf, dtype=np.uint8).reshape(
+            pages, self.width
+        )
+        self._unpacked = np.empty((pages, self.width, 8), dtype=np.uint8)
+        self._pixels = np.empty((self.height, self.width), dtype=np.uint8)
+
+        self._last_buf = bytearray(len(self.buf))
+        self._has_presented = False
+        self.frames_presented = 0
+        self.frames_skipped = 0
+
+        self.backend = create_backend(
+            cfg.backend,
+            self.width,
+            self.height,
+            scale=cfg.scale,
+            title=cfg.title,
+            output=cfg.output,
+            fps=cfg.fps,
+            clock=cfg.clock,
+        )
+        # Only a window needs throttling or skips unchanged frames; file and
+        # memory backends run flat out and record every frame
+        self._throttle = self.backend.realtime
 
     def show(self):
-        now = time.perf_counter()
-        if now < self._next_frame_time:
-            self._root.update()
+        if self._throttle:
+            now = time.perf_counter()
+            if now < self._next_frame_time:
+                self.backend.pump()
+                return
+
+        # Window only: nothing drawn since the last presented frame, so
+        # just pump events
+        if self._throttle and self._has_presented and self.buf == self._last_buf:
+            self.frames_skipped += 1
+            self.backend.pump()
             return
-        self._next_frame_time = now + self._frame_interval
 
-        image = Image.frombytes(
-            "L",  # <-- 8-bit grayscale to match our one-byte-per-pixel buffer
-            (self.width, self.height),
-            self._buffer_as_row_major(),
-        ).convert("1")
+        if self._throttle:
+            self._next_frame_time = now + self._frame_interval
+        self._last_buf[:] = self.buf
+        self._has_presented = True
+        self.backend.present(self._buffer_as_row_major(), self.buf)
+        self.frames_presented += 1
 
-        image = image.resize(
-            (self.width * self.scale, self.height * self.scale),
-            Image.NEAREST,
-        )
+    def _buffer_as_row_major(self) -> np.ndarray:
+        """Unpack the MVLSB page buffer into (height, width) 0/0xFF pixels.
 
-        self._tk_image = ImageTk.PhotoImage(image)
-        self._label.configure(image=self._tk_image)
-        self._root.update_idletasks()
-        self._root.update()
-
-    def _buffer_as_row_major(self) -> bytes:
-        out = bytearray(self.width * self.height)
-        for x in range(self.width):
-            column_offset = x
-            for page in range(self.height // 8):
-                byte = self.buf[column_offset + page * self.width]
-                base_y = page * 8
-                for bit in range(8):
-                    if byte & (1 << bit):
-                        out[(base_y + bit) * self.width + x] = 0xFF
-        return bytes(out)
+        Each byte is one column of 8 pixels in a page; a table lookup
+        expands every byte to its 8 pixels at once and a transpose puts the
+        bits of each page on consecutive rows. Both steps write into
+        preallocated arrays, so nothing is allocated per frame.
+        """
+        pages = self._pages.shape[0]
+        np.take(_MVLSB_LUT, self._pages, axis=0, out=self._unpacked)
+        np.copyto(
+            self._pixels.reshape(pages, 8, self.width),
+            self._unpacked.transpose(0, 2, 1),
+        )
+        return self._pixels
 
     def close(self):
-        self._root.destroy()
+        self.backend.close()
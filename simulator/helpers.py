@@ -1,5 +1,7 @@
 # This file was made with the use of various A.I. LLMs, specifically, Claude sonnet 4.5, ChatGPT 4.1, and Gemini 3.0
+import hashlib
 import math
+import os
 import sys
 
 # Detect environment early
@@ -363,6 +365,136 @@ def rotate_bitmap_in_place(
     return rotated_bitmap
 
 
+ROTATION_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "rotations.npz"
+)
+# Bump when rotate_bitmap_in_place changes, so stale files are ignored
+ROTATION_CACHE_VERSION = 1
+
+
+def bitmap_digest(bitmap: np.ndarray) -> str:
+    """Hash a bitmap's shape, dtype and pixels into a short cache key prefix."""
+    data = np.ascontiguousarray(bitmap)
+    digest = hashlib.sha1(data.tobytes()).hexdigest()[:16]
+    rows, cols = data.shape
+    return f"{digest}_{rows}x{cols}_{data.dtype}"
+
+
+class RotationCache:
+    """
+    Memoizes rotate_bitmap_in_place and keeps the results between runs.
+
+    Entries are keyed by the bitmap's hash (see bitmap_digest), the angle
+    and trim_blank_pixels. They are kept in memory, loaded from an .npz file
+    on first use and written back by save() when new ones were added, so
+    after the first run the simulator rotates nothing at all.
+
+    Parameters
+    ----------
+    path : str or None
+        The .npz file to load from and save to. If None, the cache only
+        lives in memory.
+
+    Examples
+    --------
+    >>> cache = RotationCache()
+    >>> rotated = cache.rotate(bitmap, 22.5)
+    >>> cache.save()
+    """
+
+    def __init__(self, path: str = ROTATION_CACHE_PATH):
+        self.path = path
+        self.entries: dict[str, np.ndarray] = {}
+        self.loaded = path is None
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def load(self) -> None:
+        """Read the entries saved by an earlier run (a bad file is ignored)."""
+        self.loaded = True
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                if int(data["version"]) != ROTATION_CACHE_VERSION:
+                    return
+                for key in data.files:
+                    if key != "version":
+                        self.entries.setdefault(key, self._freeze(data[key]))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring rotation cache {self.path} ({e})")
+
+    def save(self) -> None:
+        """Write the entries to path if any were added since loading."""
+        if self.path is None or not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Write to a temporary file first so an interrupted save never leaves
+        # a truncated cache behind
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as f:
+            np.savez_compressed(f, version=ROTATION_CACHE_VERSION, **self.entries)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    @staticmethod
+    def _freeze(bitmap: np.ndarray) -> np.ndarray:
+        # Entries are shared by every caller, so they must not be modified
+        bitmap.flags.writeable = False
+        return bitmap
+
+    def rotate(
+        self,
+        bitmap: np.ndarray,
+        degrees: float,
+        trim_blank_pixels: bool = False,
+        digest: str = None,
+    ) -> np.ndarray:
+        """
+        Same as rotate_bitmap_in_place, from the cache when possible.
+
+        Parameters
+        ----------
+        bitmap : np.ndarray
+            The 2D array representing the monochrome bitmap to rotate.
+        degrees : float
+            The amount of degrees to rotate the bitmap image.
+        trim_blank_pixels : bool, optional
+            Passed on to rotate_bitmap_in_place (default is False).
+        digest : str, optional
+            bitmap_digest(bitmap), when the caller rotates the same bitmap
+            several times and has already computed it.
+
+        Returns
+        -------
+        np.ndarray
+            The rotated bitmap. It is read-only: copy it before modifying.
+        """
+        if not self.loaded:
+            self.load()
+        if digest is None:
+            digest = bitmap_digest(bitmap)
+        key = f"{digest}_{degrees:.6f}_{int(trim_blank_pixels)}"
+
+        rotated = self.entries.get(key)
+        if rotated is not None:
+            self.hits += 1
+            return rotated
+
+        self.misses += 1
+        rotated = self._freeze(
+            rotate_bitmap_in_place(bitmap, degrees, trim_blank_pixels)
+        )
+        self.entries[key] = rotated
+        self.dirty = True
+        return rotated
+
+
+# Shared by draw_rotated_copies and precompute_spinning_animation
+rotation_cache = RotationCache()
+
+
 def rotate_around_anchor_point(
     bitmap: np.ndarray,
     degrees: float = 180.0,
@@ -562,6 +694,7 @@ def draw_rotated_copies(
     origin: tuple = None,
     clear_display: bool = True,
     show_display: bool = True,
+    use_cache: bool = True,
 ) -> None:
     """
     Draw multiple rotated copies of a bitmap on the display.
@@ -583,6 +716,9 @@ def draw_rotated_copies(
         If True, clears the display before drawing (default is True).
     show_display : bool, optional
         If True, calls display.show() after drawing all copies (default is True).
+    use_cache : bool, optional
+        If True, takes the rotated copies from rotation_cache instead of
+        rotating them on every call (default is True).
 
     Examples
     --------
@@ -608,10 +744,16 @@ def draw_rotated_copies(
     # Calculate angle step between copies
     angle_step = 360.0 / num_copies
 
+    # Hash the bitmap once for all copies
+    digest = bitmap_digest(np_bitmap) if use_cache else None
+
     # Draw each rotated copy
     for i in range(num_copies):
         angle = start_angle + (angle_step * i)
-        rotated = rotate_bitmap_in_place(np_bitmap, angle)
+        if use_cache:
+            rotated = rotation_cache.rotate(np_bitmap, angle, digest=digest)
+        else:
+            rotated = rotate_bitmap_in_place(np_bitmap, angle)
         draw_bitmap(display, rotated, center, draw_blank_pixels=False)
 
     if show_display:
@@ -624,6 +766,7 @@ def precompute_spinning_animation(
     base_angle: float = 0.0,
     animation_steps: int = 45,
     degrees_per_cycle: float = 45.0,
+    use_cache: bool = True,
 ) -> list[list[np.ndarray]]:
     """
     Pre-compute all rotated bitmap frames for a spinning animation.
@@ -646,6 +789,9 @@ def precompute_spinning_animation(
         How many degrees to rotate through in one complete animation cycle.
         For 8-fold symmetry, 45 degrees brings you back to the same visual
         (default is 45.0).
+    use_cache : bool, optional
+        If True, takes the rotations from rotation_cache and saves any new
+        ones to disk, so later runs skip the rotating (default is True).
 
     Returns
     -------
@@ -668,9 +814,11 @@ def precompute_spinning_animation(
     Memory usage: For a 50x50 bitmap with 8 copies and 45 steps:
     - Approximate: 50 * 50 * 8 * 45 = ~900KB (worst case)
     - Actual: Much less due to sparse bitmaps and variable sizes
+    - With use_cache, the frames share read-only arrays with rotation_cache
     """
-    rotation_cache = []
+    animation_cache = []
     angle_step = 360.0 / num_copies
+    digest = bitmap_digest(np_bitmap) if use_cache else None
 
     for step in range(animation_steps):
         # Calculate offset for this animation frame
@@ -680,12 +828,18 @@ def precompute_spinning_animation(
         frame_copies = []
         for i in range(num_copies):
             angle = base_angle + (angle_step * i) + animation_offset
-            rotated = rotate_bitmap_in_place(np_bitmap, angle)
+            if use_cache:
+                rotated = rotation_cache.rotate(np_bitmap, angle, digest=digest)
+            else:
+                rotated = rotate_bitmap_in_place(np_bitmap, angle)
             frame_copies.append(rotated)
 
-        rotation_cache.append(frame_copies)
+        animation_cache.append(frame_copies)
+
+    if use_cache:
+        rotation_cache.save()
 
-    return rotation_cache
+    return animation_cache
 
 
 def draw_precomputed_frame(
@@ -2,8 +2,17 @@
 # code.py
 import gc
 import math
+import sys
 import time
 
+if sys.implementation.name != "circuitpython" and __name__ == "__main__":
+    # On the desktop, rerun this file on the simulated board (run_game.py),
+    # e.g. python main.py --backend gif --output main.gif --seconds 10
+    from run_game import run_program
+
+    run_program(__file__, description="Splash and collision point preview")
+    sys.exit()
+
 import adafruit_displayio_ssd1306
 import board
 import busio
@@ -99,4 +108,4 @@ print(f"✓ Free memory: {gc.mem_free()} bytes")
 
 # Game loop (placeholder)
 while True:
-    pass
+    time.sleep(0.1)
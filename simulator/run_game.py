@@ -0,0 +1,260 @@
+# run_game.py
+"""Run the real game (src/code.py) on the desktop through CircuitPython shims.
+
+The modules in shims/ stand in for board, busio, displayio and the other
+CircuitPython libraries, backed by a simulated board (shims/sim_hardware.py)
+and drawn by the SSD1306 emulator. src/code.py runs unmodified.
+
+Inputs come from a script (--script, see sim_hardware.InputScript) and, in
+the Tk window, from the keyboard: 1-8 press the limit switches, space the
+encoder button, +/- turn the encoder, arrow keys tilt. --record saves the
+session's input events and random seed, and --replay plays such a
+recording back, including ones recorded on the device (src/input_trace.py).
+--soak lets a bot play the memory soak test instead (src/soak.py), and
+--trace-heap backs gc.mem_free() with tracemalloc so the per-phase heap
+report (src/heap_marks.py) shows real numbers.
+run_program() runs other device scripts (simulator/main.py) the same way.
+
+By default the game runs in real time. With --max-speed it runs on a
+virtual clock that jumps ahead whenever the game sleeps, so it goes as fast
+as the host can render while seeing the same timing as in real time.
+"""
+
+import argparse
+import os
+import runpy
+import sys
+import time
+import tracemalloc
+
+SIMULATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(SIMULATOR_DIR)
+SHIMS_DIR = os.path.join(SIMULATOR_DIR, "shims")
+SRC_DIR = os.path.join(REPO_DIR, "src")
+ASSETS_DIR = os.path.join(REPO_DIR, "assets")
+
+# Simulated heap for --soak and --trace-heap: CPython, NumPy and the shims
+# take tens of MB
+SOAK_HEAP_SIZE = 256 * 1024 * 1024
+
+# Shims first so they shadow any host CircuitPython-compatibility packages
+sys.path[:0] = [SHIMS_DIR, SRC_DIR]
+
+import sim_hardware  # noqa: E402
+from emulator.backends import add_backend_arguments  # noqa: E402
+
+
+def add_simulation_arguments(parser):
+    """Add the display backend, --max-speed, --script and --seconds options."""
+    add_backend_arguments(parser)
+    parser.add_argument(
+        "--max-speed",
+        action="store_true",
+        help="Run on a virtual clock as fast as possible instead of in real time",
+    )
+    parser.add_argument("--script", help="Timed input script to play")
+    parser.add_argument(
+        "--seconds",
+        type=float,
+        default=None,
+        help="Stop after this many seconds of game time",
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run Dancie on the desktop")
+    add_simulation_arguments(parser)
+    parser.add_argument(
+        "--nvm", help="File that keeps microcontroller.nvm (mux calibration)"
+    )
+    trace = parser.add_mutually_exclusive_group()
+    trace.add_argument(
+        "--record", metavar="FILE", help="Record the inputs and seed to FILE"
+    )
+    trace.add_argument(
+        "--replay",
+        metavar="FILE",
+        help="Replay a recording (from here or a device console log)",
+    )
+    parser.add_argument(
+        "--seed", type=int, help="Random seed for --record (default: random)"
+    )
+    trace.add_argument(
+        "--soak",
+        action="store_true",
+        help="Let the soak test bot play and report heap trends (src/soak.py)",
+    )
+    parser.add_argument(
+        "--soak-plan",
+        help="Comma-separated soak rounds, e.g. win,lose,win (default SOAK_PLAN)",
+    )
+    parser.add_argument(
+        "--trace-heap",
+        action="store_true",
+        help="Trace allocations so gc.mem_free() and the heap report are real "
+        "(slower; --soak always does)",
+    )
+    return parser.parse_args(argv)
+
+
+def configure_trace(mode, path, seed=None):
+    """
+    Set the game_config input trace settings before code.py reads them.
+
+    Parameters
+    ----------
+    mode : str
+        "record" or "replay" (see src/input_trace.py).
+    path : str
+        Trace file to write or read.
+    seed : int or None
+        Random seed for a recording.
+    """
+    import game_config
+
+    game_config.INPUT_TRACE_MODE = mode
+    game_config.INPUT_TRACE_PATH = os.path.abspath(path)
+    game_config.INPUT_TRACE_SEED = seed
+
+
+def run_code():
+    """
+    Run src/code.py on the installed simulated board.
+
+    Returns
+    -------
+    dict
+        code.py's globals once it returns (ctx, display, inputs, ...).
+    """
+    # Like the CIRCUITPY drive, the working directory holds font5x8.bin
+    os.chdir(ASSETS_DIR)
+    return runpy.run_path(os.path.join(SRC_DIR, "code.py"), run_name="__main__")
+
+
+def run_program(path, argv=None, description=None):
+    """
+    Run another device script (like simulator/main.py) on the simulated board.
+
+    Takes the display backend, --max-speed, --script and --seconds options
+    from the command line, like run_game.py itself.
+
+    Parameters
+    ----------
+    path : str
+        The script to run. It runs with __name__ set to "__simulated__".
+    argv : list of str or None
+        Command line arguments (default sys.argv[1:]).
+    description : str or None
+        Help text for --help.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    add_simulation_arguments(parser)
+    args = parser.parse_args(argv)
+
+    script = None
+    if args.script is not None:
+        script = sim_hardware.InputScript.load(os.path.abspath(args.script))
+    output = None if args.output is None else os.path.abspath(args.output)
+
+    hardware = sim_hardware.install(
+        realtime=not args.max_speed,
+        script=script,
+        display_options={
+            "backend": args.backend,
+            "output": output,
+            "scale": args.scale,
+            "fps": args.fps,
+        },
+        stop_after=args.seconds,
+    )
+    try:
+        os.chdir(ASSETS_DIR)
+        runpy.run_path(path, run_name="__simulated__")
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        hardware.close()
+
+
+def configure_soak(plan=None):
+    """
+    Turn on the soak test and start tracing allocations.
+
+    gc.mem_free() on the simulated board is derived from tracemalloc, so
+    tracing has to start before code.py allocates anything, and the
+    simulated heap is sized for everything CPython allocates.
+
+    Parameters
+    ----------
+    plan : str or None
+        Comma-separated rounds ("win" or "lose"), None for SOAK_PLAN.
+
+    Returns
+    -------
+    int
+        Simulated heap size to install the board with.
+    """
+    import game_config
+
+    game_config.SOAK_TEST = True
+    if plan is not None:
+        game_config.SOAK_PLAN = tuple(plan.split(","))
+    tracemalloc.start()
+    return SOAK_HEAP_SIZE
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    def absolute(path):
+        return None if path is None else os.path.abspath(path)
+
+    heap_size = sim_hardware.HEAP_SIZE
+    if args.record is not None:
+        configure_trace("record", args.record, args.seed)
+    elif args.replay is not None:
+        configure_trace("replay", args.replay)
+    elif args.soak:
+        heap_size = configure_soak(args.soak_plan)
+    if args.trace_heap and not tracemalloc.is_tracing():
+        # Like --soak: trace from before code.py allocates anything
+        tracemalloc.start()
+        heap_size = SOAK_HEAP_SIZE
+
+    script = None
+    if args.script is not None:
+        script = sim_hardware.InputScript.load(args.script)
+
+    hardware = sim_hardware.install(
+        realtime=not args.max_speed,
+        script=script,
+        display_options={
+            "backend": args.backend,
+            "output": absolute(args.output),
+            "scale": args.scale,
+            "fps": args.fps,
+        },
+        stop_after=args.seconds,
+        nvm_path=absolute(args.nvm),
+        heap_size=heap_size,
+    )
+
+    wall_start = time.perf_counter()
+    try:
+        run_code()
+    finally:
+        game_seconds = hardware.now()
+        frames = sum(
+            display.emulator.frames_presented for display in hardware.displays
+        )
+        hardware.close()
+
+    wall_seconds = time.perf_counter() - wall_start
+    print(
+        f"\n{game_seconds:.1f} s of game time in {wall_seconds:.1f} s "
+        f"({game_seconds / max(wall_seconds, 1e-9):.1f}x), {frames} frames presented"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Desktop stand-in for the adafruit_adxl34x driver (ADXL345 only)."""
+
+import struct
+
+from adafruit_bus_device.i2c_device import I2CDevice
+
+_REG_DEVID = 0x00
+_REG_BW_RATE = 0x2C
+_REG_POWER_CTL = 0x2D
+_REG_DATA_FORMAT = 0x31
+_REG_DATAX0 = 0x32
+
+_STANDARD_GRAVITY = 9.80665
+_MG_PER_LSB = 0.004
+
+
+class DataRate:
+    RATE_3200_HZ = 0x0F
+    RATE_1600_HZ = 0x0E
+    RATE_800_HZ = 0x0D
+    RATE_400_HZ = 0x0C
+    RATE_200_HZ = 0x0B
+    RATE_100_HZ = 0x0A
+    RATE_50_HZ = 0x09
+    RATE_25_HZ = 0x08
+
+
+class Range:
+    RANGE_16_G = 0x03
+    RANGE_8_G = 0x02
+    RANGE_4_G = 0x01
+    RANGE_2_G = 0x00
+
+
+class ADXL345:
+    """ADXL345 over the simulated I2C bus (acceleration in m/s²)."""
+
+    def __init__(self, i2c, address=0x53):
+        self._device = I2CDevice(i2c, address)
+        self._buffer = bytearray(6)
+        if self._read_register(_REG_DEVID) != 0xE5:
+            raise RuntimeError("Failed to find ADXL345!")
+        self._write_register(_REG_POWER_CTL, 0x08)
+
+    def _read_register(self, register, length=1):
+        self._buffer[0] = register
+        with self._device as device:
+            device.write_then_readinto(
+                self._buffer, self._buffer, out_end=1, in_end=length
+            )
+        return self._buffer[0]
+
+    def _write_register(self, register, value):
+        with self._device as device:
+            device.write(bytes((register, value)))
+
+    @property
+    def acceleration(self):
+        self._read_register(_REG_DATAX0, 6)
+        x, y, z = struct.unpack("<hhh", self._buffer)
+        scale = _MG_PER_LSB * _STANDARD_GRAVITY
+        return (x * scale, y * scale, z * scale)
+
+    @property
+    def data_rate(self):
+        return self._read_register(_REG_BW_RATE) & 0x0F
+
+    @data_rate.setter
+    def data_rate(self, value):
+        self._write_register(_REG_BW_RATE, value)
+
+    @property
+    def range(self):
+        return self._read_register(_REG_DATA_FORMAT) & 0x03
+
+    @range.setter
+    def range(self, value):
+        format_bits = self._read_register(_REG_DATA_FORMAT)
+        self._write_register(_REG_DATA_FORMAT, (format_bits & ~0x0F) | value | 0x08)
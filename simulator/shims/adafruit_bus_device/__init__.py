@@ -0,0 +1 @@
+"""Desktop stand-in for adafruit_bus_device."""
@@ -0,0 +1,82 @@
+"""Desktop stand-in for adafruit_display_text.label."""
+
+import displayio
+
+
+class Label(displayio.Group):
+    """
+    One line of text as a Group, positioned like the library's Label.
+
+    x is the left edge and y the vertical middle of the text. The text is
+    redrawn into its own Bitmap whenever text or color changes.
+    """
+
+    def __init__(
+        self,
+        font,
+        *,
+        text="",
+        color=0xFFFFFF,
+        background_color=None,
+        scale=1,
+        x=0,
+        y=0,
+        **kwargs,
+    ):
+        super().__init__(scale=scale, x=x, y=y)
+        self.font = font
+        self._text = None
+        self._color = color
+        self.background_color = background_color
+        self.text = text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        if text == self._text:
+            return
+        self._text = text
+        self._render()
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, color):
+        self._color = color
+        self._render()
+
+    @property
+    def bounding_box(self):
+        """(x, y, width, height) of the text relative to the label origin."""
+        cell_width, cell_height = self.font.get_bounding_box()
+        return (0, -(cell_height // 2), cell_width * len(self._text), cell_height)
+
+    def _render(self):
+        font = self.font
+        cell_width, cell_height = font.get_bounding_box()
+        bitmap = displayio.Bitmap(max(cell_width * len(self._text), 1), cell_height, 2)
+        for i, char in enumerate(self._text):
+            columns = font.glyph_columns(ord(char))
+            for col, bits in enumerate(columns):
+                for row in range(font.glyph_height):
+                    if (bits >> row) & 1:
+                        bitmap[i * cell_width + col, font.glyph_top + row] = 1
+
+        palette = displayio.Palette(2)
+        palette[0] = self.background_color or 0
+        palette[1] = self._color
+        if self.background_color is None:
+            palette.make_transparent(0)
+
+        tile_grid = displayio.TileGrid(
+            bitmap, pixel_shader=palette, y=-(cell_height // 2)
+        )
+        if len(self):
+            self[0] = tile_grid
+        else:
+            self.append(tile_grid)
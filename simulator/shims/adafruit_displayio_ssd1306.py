@@ -0,0 +1,71 @@
+"""Desktop stand-in for adafruit_displayio_ssd1306, drawn by the emulator.
+
+Each refresh packs the composed frame into the SSD1306's MVLSB page layout
+and hands it to SSD1306Emulator, so every emulator backend (Tk window,
+headless, raw, gif, png) works for the real game. The page buffer's I2C
+transfer time is charged to the virtual clock.
+"""
+
+import numpy as np
+
+import displayio
+import sim_hardware
+from emulator.ssd1306 import EmulatorConfig, SSD1306Emulator
+
+# Control bytes and column/page addressing sent with each frame
+_REFRESH_OVERHEAD_BYTES = 8
+
+
+class SSD1306(displayio.Display):
+    """128x64 (or other size) SSD1306 on an I2CDisplayBus."""
+
+    def __init__(self, bus, *, width=128, height=64, rotation=0, **kwargs):
+        hardware = sim_hardware.get_hardware()
+        options = dict(hardware.display_options)
+        options.setdefault("title", "Dancie")
+        # GIF frames last as long as they were on the simulated screen
+        options.setdefault("clock", hardware.now)
+        self.emulator = SSD1306Emulator(
+            EmulatorConfig(width=width, height=height, **options)
+        )
+        self.bus = bus
+        self.rotation = rotation
+        self._pages = np.zeros((height // 8, width), dtype=np.uint8)
+        self._refresh_bytes = width * height // 8 + _REFRESH_OVERHEAD_BYTES
+
+        bind_keys = getattr(self.emulator.backend, "bind_keys", None)
+        if bind_keys is not None:
+            bind_keys(hardware.key_down, hardware.key_up)
+
+        super().__init__(width=width, height=height, **kwargs)
+
+    def _present(self, frame):
+        pages = self._pages
+        np.copyto(
+            pages,
+            np.packbits(
+                frame.reshape(pages.shape[0], 8, self.width),
+                axis=1,
+                bitorder="little",
+            )[:, 0, :],
+        )
+        self.emulator.buf[:] = pages.tobytes()
+        hardware = sim_hardware.get_hardware()
+        hardware.spend(self._refresh_bytes * 9 / self.bus.i2c_bus.frequency)
+        self.emulator.show()
+
+    def pump(self):
+        self.emulator.backend.pump()
+
+    def sleep(self):
+        pass
+
+    def wake(self):
+        pass
+
+    @property
+    def is_awake(self):
+        return True
+
+    def close(self):
+        self.emulator.close()
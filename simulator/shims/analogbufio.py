@@ -0,0 +1,33 @@
+"""Desktop stand-in for CircuitPython's analogbufio module."""
+
+import sim_hardware
+
+# ESP32-C3 BufferedIn samples are 12-bit
+_SAMPLE_SHIFT = 4
+
+
+class BufferedIn:
+    """Bulk ADC capture from the simulated board."""
+
+    def __init__(self, pin, *, sample_rate):
+        self._hardware = sim_hardware.get_hardware()
+        self._pin = pin
+        self.sample_rate = sample_rate
+
+    def readinto(self, buffer, loop=False):
+        # The capture blocks for as long as the samples take at sample_rate
+        hardware = self._hardware
+        hardware.spend(len(buffer) / self.sample_rate)
+        value = hardware.read_analog(self._pin) >> _SAMPLE_SHIFT
+        for i in range(len(buffer)):
+            buffer[i] = value
+        return len(buffer)
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.deinit()
@@ -0,0 +1,26 @@
+"""Desktop stand-in for CircuitPython's analogio module."""
+
+import sim_hardware
+
+
+class AnalogIn:
+    """16-bit ADC reads from the simulated board."""
+
+    def __init__(self, pin):
+        self._hardware = sim_hardware.get_hardware()
+        self._pin = pin
+        self.reference_voltage = 3.3
+
+    @property
+    def value(self):
+        self._hardware.spend(sim_hardware.ADC_READ_TIME)
+        return self._hardware.read_analog(self._pin)
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.deinit()
@@ -0,0 +1,23 @@
+"""Desktop stand-in for the Seeed XIAO ESP32C3 board module."""
+
+from microcontroller import pin
+
+board_id = "seeed_xiao_esp32c3"
+
+D0 = A0 = pin.GPIO2
+D1 = A1 = pin.GPIO3
+D2 = A2 = pin.GPIO4
+D3 = pin.GPIO5
+D4 = SDA = pin.GPIO6
+D5 = SCL = pin.GPIO7
+D6 = TX = pin.GPIO21
+D7 = RX = pin.GPIO20
+D8 = SCK = pin.GPIO8
+D9 = MISO = pin.GPIO9
+D10 = MOSI = pin.GPIO10
+
+
+def I2C():
+    import busio
+
+    return busio.I2C(SCL, SDA)
@@ -0,0 +1,79 @@
+"""Desktop stand-in for CircuitPython's busio module (I2C only)."""
+
+import sim_hardware
+
+
+def _byte_view(buffer, start, end):
+    view = memoryview(buffer).cast("B")
+    return view[start : len(view) if end is None else end]
+
+
+class I2C:
+    """
+    I2C bus routed to the device models on the simulated board.
+
+    Every transfer advances the virtual clock by its duration at the bus
+    frequency (9 clocks per byte, plus the address byte).
+    """
+
+    def __init__(self, scl, sda, *, frequency=100_000, timeout=255):
+        self._hardware = sim_hardware.get_hardware()
+        self.frequency = frequency
+        self._locked = False
+
+    def _device(self, address):
+        if address not in self._hardware.i2c_devices:
+            raise OSError(19, "No such device")  # ENODEV, like a NACK
+        return self._hardware.i2c_devices[address]
+
+    def _spend(self, num_bytes):
+        self._hardware.spend((num_bytes + 1) * 9 / self.frequency)
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def scan(self):
+        return sorted(self._hardware.i2c_devices)
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        data = _byte_view(buffer, start, end)
+        device = self._device(address)
+        self._spend(len(data))
+        if device is not None:
+            device.write(bytes(data))
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        data = _byte_view(buffer, start, end)
+        device = self._device(address)
+        self._spend(len(data))
+        if device is not None:
+            device.read(data)
+
+    def writeto_then_readfrom(
+        self,
+        address,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start=0,
+        out_end=None,
+        in_start=0,
+        in_end=None,
+    ):
+        self.writeto(address, out_buffer, start=out_start, end=out_end)
+        self.readfrom_into(address, in_buffer, start=in_start, end=in_end)
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.deinit()
@@ -0,0 +1,69 @@
+"""Desktop stand-in for CircuitPython's digitalio module."""
+
+import sim_hardware
+
+
+class Direction:
+    INPUT = "INPUT"
+    OUTPUT = "OUTPUT"
+
+
+class Pull:
+    UP = "UP"
+    DOWN = "DOWN"
+
+
+class DriveMode:
+    PUSH_PULL = "PUSH_PULL"
+    OPEN_DRAIN = "OPEN_DRAIN"
+
+
+class DigitalInOut:
+    """A pin read from or driven into the simulated board."""
+
+    def __init__(self, pin):
+        self._hardware = sim_hardware.get_hardware()
+        self._pin = pin
+        self._direction = Direction.INPUT
+        self.pull = None
+        self.drive_mode = DriveMode.PUSH_PULL
+
+    @property
+    def direction(self):
+        return self._direction
+
+    @direction.setter
+    def direction(self, direction):
+        self._direction = direction
+        if direction == Direction.OUTPUT:
+            self._hardware.write_digital(self._pin, False)
+
+    @property
+    def value(self):
+        if self._direction == Direction.OUTPUT:
+            return self._hardware.output_levels.get(self._pin, False)
+        return self._hardware.read_digital(self._pin, self.pull != Pull.DOWN)
+
+    @value.setter
+    def value(self, value):
+        if self._direction != Direction.OUTPUT:
+            raise AttributeError("Cannot set value when direction is input.")
+        self._hardware.write_digital(self._pin, bool(value))
+
+    def switch_to_output(self, value=False, drive_mode=DriveMode.PUSH_PULL):
+        self.direction = Direction.OUTPUT
+        self.drive_mode = drive_mode
+        self.value = value
+
+    def switch_to_input(self, pull=None):
+        self._direction = Direction.INPUT
+        self.pull = pull
+
+    def deinit(self):
+        self._hardware.output_levels.pop(self._pin, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.deinit()
@@ -0,0 +1,262 @@
+"""Desktop stand-in for CircuitPython's displayio module.
+
+Bitmaps keep one byte per pixel in a bytearray, so per-pixel writes from
+game code stay cheap. A display composes its root group into a 1-bit frame
+with NumPy on refresh(): groups are walked back to front, hidden ones are
+skipped, and each TileGrid is mapped through its palette, leaving
+transparent pixels untouched. Only what the game uses is implemented:
+one tile per TileGrid, integer group scales and Palette shaders.
+"""
+
+import numpy as np
+
+import sim_hardware
+
+# Colors at or above this luminance light a monochrome pixel
+_LIT_THRESHOLD = 128
+
+
+class Bitmap:
+    """A width x height grid of palette indices, indexed [x, y]."""
+
+    def __init__(self, width, height, value_count):
+        if value_count > 256:
+            raise ValueError("value_count must be at most 256")
+        self.width = width
+        self.height = height
+        self.value_count = value_count
+        self._data = bytearray(width * height)
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            x, y = index
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                raise IndexError("pixel coordinates out of bounds")
+            index = y * self.width + x
+        return self._data[index]
+
+    def __setitem__(self, index, value):
+        # Hot path (game code clears and draws pixel by pixel): one bounds
+        # check per write and no helper calls
+        if not 0 <= value < self.value_count:
+            raise ValueError(f"value must be less than {self.value_count}")
+        try:
+            x, y = index
+        except TypeError:
+            self._data[index] = value
+            return
+        width = self.width
+        if not (0 <= x < width and 0 <= y < self.height):
+            raise IndexError("pixel coordinates out of bounds")
+        self._data[y * width + x] = value
+
+    def fill(self, value):
+        self._data[:] = bytes((value,)) * len(self._data)
+
+    def pixels(self):
+        """The bitmap as a (height, width) uint8 array sharing its memory."""
+        return np.frombuffer(self._data, dtype=np.uint8).reshape(
+            self.height, self.width
+        )
+
+
+class Palette:
+    """Color per index, any of which can be transparent."""
+
+    def __init__(self, color_count, *, dither=False):
+        self._colors = [0] * color_count
+        self._transparent = [False] * color_count
+
+    def __len__(self):
+        return len(self._colors)
+
+    def __getitem__(self, index):
+        return self._colors[index]
+
+    def __setitem__(self, index, color):
+        if isinstance(color, (tuple, list)):
+            r, g, b = color
+            color = (r << 16) | (g << 8) | b
+        self._colors[index] = color
+
+    def make_transparent(self, index):
+        self._transparent[index] = True
+
+    def make_opaque(self, index):
+        self._transparent[index] = False
+
+    def is_transparent(self, index):
+        return self._transparent[index]
+
+    def lookup(self):
+        """
+        Map every index to 0 (dark), 1 (lit) or 2 (transparent).
+
+        Returns
+        -------
+        np.ndarray
+            256 entries, so any bitmap value can be looked up.
+        """
+        table = np.full(256, 2, dtype=np.uint8)
+        for i, color in enumerate(self._colors):
+            if self._transparent[i]:
+                continue
+            r, g, b = (color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF
+            luminance = (r * 77 + g * 150 + b * 29) >> 8
+            table[i] = 1 if luminance >= _LIT_THRESHOLD else 0
+        return table
+
+
+class TileGrid:
+    """Shows a bitmap through a palette (a single tile covering it)."""
+
+    def __init__(
+        self,
+        bitmap,
+        *,
+        pixel_shader,
+        width=1,
+        height=1,
+        tile_width=None,
+        tile_height=None,
+        default_tile=0,
+        x=0,
+        y=0,
+    ):
+        self.bitmap = bitmap
+        self.pixel_shader = pixel_shader
+        self.x = x
+        self.y = y
+        self.hidden = False
+
+
+class Group:
+    """An ordered, optionally scaled and offset collection of layers."""
+
+    def __init__(self, *, scale=1, x=0, y=0):
+        self.scale = scale
+        self.x = x
+        self.y = y
+        self.hidden = False
+        self._layers = []
+
+    def append(self, layer):
+        self._layers.append(layer)
+
+    def insert(self, index, layer):
+        self._layers.insert(index, layer)
+
+    def remove(self, layer):
+        self._layers.remove(layer)
+
+    def pop(self, index=-1):
+        return self._layers.pop(index)
+
+    def index(self, layer):
+        return self._layers.index(layer)
+
+    def __len__(self):
+        return len(self._layers)
+
+    def __getitem__(self, index):
+        return self._layers[index]
+
+    def __setitem__(self, index, layer):
+        self._layers[index] = layer
+
+    def __delitem__(self, index):
+        del self._layers[index]
+
+    def __contains__(self, layer):
+        return layer in self._layers
+
+    def __iter__(self):
+        return iter(self._layers)
+
+
+def _draw_tile_grid(frame, tile_grid, x, y, scale):
+    pixels = tile_grid.pixel_shader.lookup()[tile_grid.bitmap.pixels()]
+    if scale != 1:
+        pixels = pixels.repeat(scale, axis=0).repeat(scale, axis=1)
+
+    # Clip to the frame
+    height, width = pixels.shape
+    frame_height, frame_width = frame.shape
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + width, frame_width), min(y + height, frame_height)
+    if x0 >= x1 or y0 >= y1:
+        return
+    source = pixels[y0 - y : y1 - y, x0 - x : x1 - x]
+    target = frame[y0:y1, x0:x1]
+    opaque = source != 2
+    target[opaque] = source[opaque]
+
+
+def _draw_group(frame, group, x, y, scale):
+    scale *= group.scale
+    for layer in group:
+        if layer.hidden:
+            continue
+        layer_x = x + layer.x * scale
+        layer_y = y + layer.y * scale
+        if isinstance(layer, Group):
+            _draw_group(frame, layer, layer_x, layer_y, scale)
+        else:
+            _draw_tile_grid(frame, layer, layer_x, layer_y, scale)
+
+
+class Display:
+    """
+    Base for simulated displays: composes root_group into a 1-bit frame.
+
+    Subclasses implement _present(frame) with the (height, width) array of
+    0/1 pixels.
+    """
+
+    def __init__(self, *, width, height, auto_refresh=True, brightness=1.0):
+        self.width = width
+        self.height = height
+        self.auto_refresh = auto_refresh
+        self.brightness = brightness
+        self._root_group = None
+        self._frame = np.zeros((height, width), dtype=np.uint8)
+        sim_hardware.get_hardware().add_display(self)
+
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value):
+        if not 0 <= value <= 1:
+            raise ValueError("brightness must be 0.0-1.0")
+        self._brightness = value
+
+    @property
+    def root_group(self):
+        return self._root_group
+
+    @root_group.setter
+    def root_group(self, group):
+        self._root_group = group
+        if self.auto_refresh:
+            self.refresh()
+
+    def refresh(self, *, target_frames_per_second=None, minimum_frames_per_second=0):
+        frame = self._frame
+        frame.fill(0)
+        if self._root_group is not None and not self._root_group.hidden:
+            _draw_group(frame, self._root_group, 0, 0, 1)
+        self._present(frame)
+        return True
+
+    def _present(self, frame):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+def release_displays():
+    """Close every simulated display (finishing any file output)."""
+    sim_hardware.get_hardware().release_displays()
@@ -0,0 +1,14 @@
+"""Desktop stand-in for CircuitPython's i2cdisplaybus module."""
+
+
+class I2CDisplayBus:
+    """Display bus on an I2C address (the display draws via displayio)."""
+
+    def __init__(self, i2c_bus, *, device_address, reset=None):
+        if device_address not in i2c_bus.scan():
+            raise ValueError(f"No I2C device at address: 0x{device_address:x}")
+        self.i2c_bus = i2c_bus
+        self.device_address = device_address
+
+    def reset(self):
+        pass
@@ -0,0 +1,115 @@
+"""Desktop stand-in for CircuitPython's keypad module."""
+
+import sim_hardware
+
+
+class Event:
+    """A key transition (reused through EventQueue.get_into)."""
+
+    def __init__(self, key_number=0, pressed=True, timestamp=None):
+        self.key_number = key_number
+        self.pressed = pressed
+        self.timestamp = timestamp
+
+    @property
+    def released(self):
+        return not self.pressed
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Event)
+            and self.key_number == other.key_number
+            and self.pressed == other.pressed
+        )
+
+    def __repr__(self):
+        state = "pressed" if self.pressed else "released"
+        return f"<Event: key_number {self.key_number} {state}>"
+
+
+class EventQueue:
+    """Queued transitions, oldest first, dropping new ones when full."""
+
+    def __init__(self, max_events):
+        self._events = []
+        self._max_events = max_events
+        self.overflowed = False
+
+    def _put(self, key_number, pressed, timestamp):
+        if len(self._events) >= self._max_events:
+            self.overflowed = True
+            return
+        self._events.append((key_number, pressed, timestamp))
+
+    def get(self):
+        if not self._events:
+            return None
+        return Event(*self._events.pop(0))
+
+    def get_into(self, event):
+        sim_hardware.get_hardware().update()
+        if not self._events:
+            return False
+        event.key_number, event.pressed, event.timestamp = self._events.pop(0)
+        return True
+
+    def clear(self):
+        self._events.clear()
+        self.overflowed = False
+
+    def __len__(self):
+        return len(self._events)
+
+    def __bool__(self):
+        return bool(self._events)
+
+
+class Keys:
+    """
+    Individually wired keys, scanned in the background.
+
+    Transitions are queued the moment the simulated pin changes, with that
+    moment's timestamp, so short presses between polls are never lost.
+    """
+
+    def __init__(
+        self,
+        pins,
+        *,
+        value_when_pressed,
+        pull=True,
+        interval=0.02,
+        max_events=64,
+    ):
+        self._hardware = sim_hardware.get_hardware()
+        self._pins = tuple(pins)
+        self._value_when_pressed = value_when_pressed
+        self.events = EventQueue(max_events)
+        self.key_count = len(self._pins)
+
+        self._watchers = []
+        for key_number, pin in enumerate(self._pins):
+            watcher = self._make_watcher(key_number)
+            self._hardware.watch(pin, watcher)
+            self._watchers.append((pin, watcher))
+
+        # A key already held when scanning starts reports a press
+        for key_number, pin in enumerate(self._pins):
+            if self._hardware.read_digital(pin, pull) == value_when_pressed:
+                self.events._put(key_number, True, self._hardware.ticks_ms())
+
+    def _make_watcher(self, key_number):
+        def watcher(level, timestamp_ms):
+            self.events._put(
+                key_number, level == self._value_when_pressed, timestamp_ms
+            )
+
+        return watcher
+
+    def reset(self):
+        self.events.clear()
+
+    def deinit(self):
+        for pin, watcher in self._watchers:
+            self._hardware.unwatch(pin, watcher)
+        self._watchers = []
@@ -0,0 +1,48 @@
+"""Desktop stand-in for CircuitPython's microcontroller module."""
+
+import sim_hardware
+
+
+class Pin:
+    """A GPIO. Pins compare by identity, like on the device."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"microcontroller.pin.{self.name}"
+
+
+class _PinNamespace:
+    pass
+
+
+# ESP32-C3 GPIOs
+pin = _PinNamespace()
+for _number in range(22):
+    setattr(pin, f"GPIO{_number}", Pin(f"GPIO{_number}"))
+
+
+class _Processor:
+    frequency = 160_000_000
+    temperature = 25.0
+    voltage = 3.3
+
+
+cpu = _Processor()
+
+
+def __getattr__(name):
+    # nvm is looked up on first use so importing this module (board does)
+    # doesn't create the simulated board before the launcher configures it
+    if name == "nvm":
+        return sim_hardware.get_hardware().nvm
+    raise AttributeError(f"module 'microcontroller' has no attribute {name!r}")
+
+
+def reset():
+    raise SystemExit("microcontroller.reset()")
+
+
+def delay_us(delay):
+    sim_hardware.get_hardware().sleep(delay / 1_000_000)
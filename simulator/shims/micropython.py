@@ -0,0 +1,17 @@
+"""Desktop stand-in for MicroPython's micropython module."""
+
+
+def const(value):
+    return value
+
+
+def native(function):
+    return function
+
+
+def viper(function):
+    return function
+
+
+def alloc_emergency_exception_buf(size):
+    pass
@@ -0,0 +1,81 @@
+"""Desktop stand-in for the neopixel library."""
+
+import sim_hardware
+
+RGB = "RGB"
+GRB = "GRB"
+RGBW = "RGBW"
+GRBW = "GRBW"
+
+
+class NeoPixel:
+    """
+    LED strip whose latched colors can be inspected on the simulated board.
+
+    `pixels` holds the buffered colors, `shown` what the last show() sent
+    to the strip, and `writes` how many times it was sent.
+    """
+
+    def __init__(
+        self, pin, n, *, bpp=3, brightness=1.0, auto_write=True, pixel_order=None
+    ):
+        self.pin = pin
+        self.n = n
+        self.bpp = bpp
+        self.auto_write = auto_write
+        self.pixel_order = pixel_order or (GRBW if bpp == 4 else GRB)
+        self._brightness = min(max(brightness, 0.0), 1.0)
+        self.pixels = [(0,) * bpp] * n
+        self.shown = list(self.pixels)
+        self.writes = 0
+        sim_hardware.get_hardware().neopixels.append(self)
+
+    def _color(self, value):
+        if isinstance(value, int):
+            color = ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
+            return color + (0,) * (self.bpp - 3)
+        return tuple(value)
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, index):
+        return self.pixels[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self.pixels[index] = [self._color(color) for color in value]
+        else:
+            self.pixels[index] = self._color(value)
+        if self.auto_write:
+            self.show()
+
+    @property
+    def brightness(self):
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value):
+        self._brightness = min(max(value, 0.0), 1.0)
+        if self.auto_write:
+            self.show()
+
+    def fill(self, color):
+        self.pixels = [self._color(color)] * self.n
+        if self.auto_write:
+            self.show()
+
+    def show(self):
+        # About 30 us per LED on the wire
+        sim_hardware.get_hardware().spend(self.n * 30e-6)
+        self.shown = list(self.pixels)
+        self.writes += 1
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.deinit()
@@ -0,0 +1,35 @@
+"""Desktop stand-in for CircuitPython's rotaryio module."""
+
+import sim_hardware
+
+
+class IncrementalEncoder:
+    """
+    Quadrature encoder on the simulated board.
+
+    The simulation counts detents directly, so position moves by one per
+    detent whatever the divisor.
+    """
+
+    def __init__(self, pin_a, pin_b, divisor=4):
+        self._hardware = sim_hardware.get_hardware()
+        self.divisor = divisor
+        self._offset = self._hardware.encoder_detents
+
+    @property
+    def position(self):
+        self._hardware.update()
+        return self._hardware.encoder_detents - self._offset
+
+    @position.setter
+    def position(self, value):
+        self._offset = self._hardware.encoder_detents - value
+
+    def deinit(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.deinit()
@@ -0,0 +1,162 @@
+"""Register-level ADXL345 model for the simulated I2C bus.
+
+Implements what adxl345_stream.py and the adafruit_adxl34x shim touch:
+the data, rate and format registers, the 32-entry FIFO in bypass and
+stream mode, the activity and watermark interrupts on INT1, and
+auto-incrementing multi-byte reads. Samples are produced at the
+configured data rate from the simulated tilt (Hardware.tilt), in raw
+full-resolution counts.
+"""
+
+import struct
+
+import sim_hardware
+
+FIFO_DEPTH = 32
+
+_REG_DEVID = 0x00
+_REG_THRESH_ACT = 0x24
+_REG_ACT_INACT_CTL = 0x27
+_REG_BW_RATE = 0x2C
+_REG_POWER_CTL = 0x2D
+_REG_INT_ENABLE = 0x2E
+_REG_INT_MAP = 0x2F
+_REG_INT_SOURCE = 0x30
+_REG_DATAX0 = 0x32
+_REG_FIFO_CTL = 0x38
+_REG_FIFO_STATUS = 0x39
+
+_DEVICE_ID = 0xE5
+_MEASURE = 0x08
+_INT_DATA_READY = 0x80
+_INT_ACTIVITY = 0x10
+_INT_WATERMARK = 0x02
+_INT_OVERRUN = 0x01
+_ACT_X = 0x40
+_ACT_Y = 0x20
+_FIFO_MODE_MASK = 0xC0
+_FIFO_SAMPLES_MASK = 0x1F
+
+# Activity threshold is 62.5 mg/LSB, samples are 4 mg/LSB
+_ACTIVITY_COUNTS_PER_LSB = 62.5 / 4
+
+
+class ADXL345Model:
+    """
+    One ADXL345 at 0x53, fed by the simulated tilt.
+
+    Parameters
+    ----------
+    hardware : sim_hardware.Hardware
+        Supplies the clock and the current tilt.
+    """
+
+    def __init__(self, hardware):
+        self.hardware = hardware
+        self.registers = bytearray(64)
+        self.registers[_REG_DEVID] = _DEVICE_ID
+        self.registers[_REG_BW_RATE] = 0x0A  # 100 Hz
+        self.pointer = 0
+
+        self.fifo = []  # (x, y, z) oldest first
+        self.activity = False
+        self.overrun = False
+        self.last_sample_time = 0.0
+
+    @property
+    def data_rate(self) -> float:
+        return 3200 / (1 << (0x0F - (self.registers[_REG_BW_RATE] & 0x0F)))
+
+    def _current_sample(self):
+        return sim_hardware.TILT_VECTORS[self.hardware.tilt]
+
+    def _sample(self) -> None:
+        """Produce the samples taken since the last access."""
+        now = self.hardware.now()
+        if not self.registers[_REG_POWER_CTL] & _MEASURE:
+            self.last_sample_time = now
+            return
+
+        period = 1 / self.data_rate
+        count = int((now - self.last_sample_time) / period)
+        if count <= 0:
+            return
+        self.last_sample_time += count * period
+
+        sample = self._current_sample()
+        x, y = sample[0], sample[1]
+        threshold = self.registers[_REG_THRESH_ACT] * _ACTIVITY_COUNTS_PER_LSB
+        act_ctl = self.registers[_REG_ACT_INACT_CTL]
+        if threshold and (
+            (act_ctl & _ACT_X and abs(x) > threshold)
+            or (act_ctl & _ACT_Y and abs(y) > threshold)
+        ):
+            self.activity = True
+
+        if self.registers[_REG_FIFO_CTL] & _FIFO_MODE_MASK:
+            # Stream mode keeps the newest FIFO_DEPTH samples
+            for _ in range(min(count, FIFO_DEPTH)):
+                self.fifo.append(sample)
+            if len(self.fifo) > FIFO_DEPTH:
+                del self.fifo[: len(self.fifo) - FIFO_DEPTH]
+                self.overrun = True
+
+    def _int_source(self) -> int:
+        source = _INT_DATA_READY
+        if self.activity:
+            source |= _INT_ACTIVITY
+        watermark = self.registers[_REG_FIFO_CTL] & _FIFO_SAMPLES_MASK
+        if self.fifo and len(self.fifo) >= watermark:
+            source |= _INT_WATERMARK
+        if self.overrun:
+            source |= _INT_OVERRUN
+        return source
+
+    def int1(self) -> bool:
+        """Level of the INT1 pin (every interrupt is mapped to INT1)."""
+        self._sample()
+        enabled = self.registers[_REG_INT_ENABLE] & ~self.registers[_REG_INT_MAP]
+        return bool(self._int_source() & enabled)
+
+    def write(self, data) -> None:
+        """An I2C write: register address, then values to store."""
+        if not data:
+            return
+        self._sample()
+        self.pointer = data[0]
+        for value in data[1:]:
+            self.registers[self.pointer & 0x3F] = value
+            if self.pointer == _REG_FIFO_CTL and not value & _FIFO_MODE_MASK:
+                self.fifo = []
+            self.pointer += 1
+
+    def read(self, buffer) -> None:
+        """An I2C read from the current register into a byte buffer."""
+        self._sample()
+        i = 0
+        while i < len(buffer):
+            if self.pointer == _REG_DATAX0:
+                data = struct.pack("<hhh", *self._pop_sample())
+                n = min(len(data), len(buffer) - i)
+                buffer[i : i + n] = data[:n]
+                self.pointer += n
+                i += n
+                continue
+
+            if self.pointer == _REG_FIFO_STATUS:
+                value = min(len(self.fifo), FIFO_DEPTH)
+            elif self.pointer == _REG_INT_SOURCE:
+                value = self._int_source()
+                # Reading INT_SOURCE releases the latched interrupts
+                self.activity = False
+                self.overrun = False
+            else:
+                value = self.registers[self.pointer & 0x3F]
+            buffer[i] = value
+            self.pointer += 1
+            i += 1
+
+    def _pop_sample(self):
+        if self.registers[_REG_FIFO_CTL] & _FIFO_MODE_MASK and self.fifo:
+            return self.fifo.pop(0)
+        return self._current_sample()
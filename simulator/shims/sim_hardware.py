@@ -0,0 +1,498 @@
+"""Simulated Dancie board behind the CircuitPython shim modules.
+
+The shims in this directory (board, busio, displayio, analogio, ...) only
+implement the CircuitPython API surface; every pin level, switch, tilt and
+clock reading comes from the one Hardware instance here. It models the
+wiring in game_config.py:
+
+- 8 limit switches behind a CD74HC4067 multiplexer: select pins D8-D10,
+  signal on A2 (pressed reads LOW, released a steady HIGH)
+- the encoder button on D7 and its rotation (counted in detents, and
+  played out as quadrature edges on CLK D0 / DT D1)
+- an ADXL345 at 0x53 with its INT1 line on D6, read when PIN_ACCEL_INT
+  is set to "D6" (see sim_adxl345.py)
+- the SSD1306 at 0x3C, presented through the emulator backends
+
+Inputs come from a timed script (see InputScript) and, in the Tk window,
+from the keyboard. Time is either the host's real clock or a virtual one
+that jumps ahead whenever the game sleeps, so a run can go as fast as the
+host allows while the game still sees device-like timing. Device costs
+(ADC conversions, I2C transfers) advance the virtual clock by their
+nominal duration, so code that times itself with monotonic() still makes
+progress.
+"""
+
+import asyncio
+import gc
+import os
+import selectors
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+import board
+
+# Wiring (same pins as code.py and game_config.py)
+MUX_SELECT_PINS = (board.D8, board.D9, board.D10)
+MUX_SIGNAL_PIN = board.A2
+BUTTON_PIN = board.D7
+ENCODER_CLK_PIN = board.D0
+ENCODER_DT_PIN = board.D1
+ACCEL_INT_PIN = board.D6
+
+# 16-bit AnalogIn levels of a released (pulled-up) and a pressed switch
+ADC_RELEASED = 60000
+ADC_PRESSED = 1000
+ADC_READ_TIME = 50e-6  # Seconds per AnalogIn conversion
+
+# Raw ADXL345 counts (4 mg/LSB): flat, and tilted about 45 degrees
+ACCEL_ONE_G = 250
+ACCEL_TILT = 177
+TILT_VECTORS = {
+    None: (0, 0, ACCEL_ONE_G),
+    "left": (-ACCEL_TILT, 0, ACCEL_TILT),
+    "right": (ACCEL_TILT, 0, ACCEL_TILT),
+    "up": (0, ACCEL_TILT, ACCEL_TILT),
+    "down": (0, -ACCEL_TILT, ACCEL_TILT),
+}
+
+NVM_SIZE = 8192
+HEAP_SIZE = 160_000  # Roughly what an ESP32-C3 build leaves for the VM
+DEFAULT_HOLD = 0.1  # Seconds a scripted press or tilt lasts
+PUMP_INTERVAL = 0.02  # Seconds between window event pumps
+
+# Tk keysyms -> inputs
+KEY_SWITCHES = {str(n): n for n in range(1, 9)}
+KEY_BUTTON = ("space", "Return")
+KEY_TILTS = {"Up": "up", "Down": "down", "Left": "left", "Right": "right"}
+KEY_TURNS = {"plus": 1, "equal": 1, "minus": -1}
+
+ACTIONS = ("button", "switch", "tilt", "turn", "quit")
+
+
+@dataclass(order=True)
+class ScriptAction:
+    time: float
+    action: str = field(compare=False)
+    args: tuple = field(default=(), compare=False)
+
+
+class InputScript:
+    """
+    Timed inputs, one per line: `<seconds> <action> [args...]`.
+
+    ::
+
+        # Start the game, hit switch 4, tilt left, then stop
+        1.0  button          # press and release (default hold 0.1 s)
+        2.5  switch 4 0.2    # hold switch 4 for 0.2 s
+        4.0  tilt left 0.5
+        5.0  turn -2         # encoder detents
+        30   quit
+
+    Times are seconds since the game started, in order or not.
+    """
+
+    def __init__(self, actions=()):
+        self.actions = sorted(actions)
+        self.index = 0
+
+    @classmethod
+    def parse(cls, text: str) -> "InputScript":
+        actions = []
+        for line_number, line in enumerate(text.splitlines(), 1):
+            words = line.split("#", 1)[0].split()
+            if not words:
+                continue
+            if len(words) < 2 or words[1] not in ACTIONS:
+                raise ValueError(f"Line {line_number}: expected '<time> <action>'")
+            actions.append(ScriptAction(float(words[0]), words[1], tuple(words[2:])))
+        return cls(actions)
+
+    @classmethod
+    def load(cls, path: str) -> "InputScript":
+        with open(path) as f:
+            return cls.parse(f.read())
+
+    def next_time(self) -> float | None:
+        if self.index < len(self.actions):
+            return self.actions[self.index].time
+        return None
+
+    def pop(self) -> ScriptAction:
+        action = self.actions[self.index]
+        self.index += 1
+        return action
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Selector that skips the virtual clock ahead instead of blocking."""
+
+    def __init__(self, hardware):
+        super().__init__()
+        self._hardware = hardware
+
+    def select(self, timeout=None):
+        if timeout is None:
+            # Nothing scheduled: only real I/O could wake the loop
+            return super().select(None)
+        if timeout > 0:
+            self._hardware.advance(timeout)
+        return super().select(0)
+
+
+class _VirtualTimePolicy(asyncio.DefaultEventLoopPolicy):
+    def __init__(self, hardware):
+        super().__init__()
+        self._hardware = hardware
+
+    def new_event_loop(self):
+        return asyncio.SelectorEventLoop(_VirtualSelector(self._hardware))
+
+
+class Hardware:
+    """
+    State of every simulated pin, input and peripheral.
+
+    Parameters
+    ----------
+    realtime : bool
+        True to run on the host clock, False for the virtual clock.
+    script : InputScript or None
+        Timed inputs.
+    display_options : dict
+        EmulatorConfig fields for every display (backend, output, ...).
+    stop_after : float or None
+        Seconds of game time after which KeyboardInterrupt is raised.
+    nvm_path : str or None
+        File that backs microcontroller.nvm between runs.
+    heap_size : int
+        Bytes gc.mem_free() counts down from as tracemalloc sees
+        allocations. CPython needs far more than the device, so raise it
+        when tracing from startup.
+    """
+
+    def __init__(
+        self,
+        realtime=True,
+        script=None,
+        display_options=None,
+        stop_after=None,
+        nvm_path=None,
+        heap_size=HEAP_SIZE,
+    ):
+        self.realtime = realtime
+        self.heap_size = heap_size
+        self.script = script or InputScript()
+        self.display_options = display_options or {}
+        self.stop_after = stop_after
+        self.stopping = False
+
+        self._real_start = time.monotonic()
+        self._virtual_now = 0.0
+        self._last_pump = 0.0
+
+        self.output_levels = {}  # Pin -> level driven by a DigitalInOut
+        self.input_levels = {}  # Pin -> level driven by the simulation
+        self.input_sources = {}  # Pin -> callable returning the level
+        self.watchers = {}  # Pin -> callbacks(level, timestamp_ms)
+        self.i2c_devices = {}  # Address -> device model
+
+        self.pressed_switches = set()  # Channels 0-7
+        self.encoder_detents = 0
+        self.tilt = None
+        self.releases = []  # (time, callable) for scripted holds
+
+        self.displays = []
+        self.pumps = []
+        self.neopixels = []
+
+        self.nvm_path = nvm_path
+        self.nvm = bytearray(NVM_SIZE)
+        if nvm_path is not None and os.path.exists(nvm_path):
+            with open(nvm_path, "rb") as f:
+                data = f.read(NVM_SIZE)
+            self.nvm[: len(data)] = data
+
+        # Peripherals on the I2C bus
+        from sim_adxl345 import ADXL345Model
+
+        self.accelerometer = ADXL345Model(self)
+        self.i2c_devices[0x53] = self.accelerometer
+        self.i2c_devices[0x3C] = None  # SSD1306, drawn through displayio
+        self.input_sources[ACCEL_INT_PIN] = self.accelerometer.int1
+
+    # --- Clock ---
+
+    def now(self) -> float:
+        """Seconds since the simulation started."""
+        if self.realtime:
+            return time.monotonic() - self._real_start
+        return self._virtual_now
+
+    def monotonic(self) -> float:
+        return self._virtual_now
+
+    def monotonic_ns(self) -> int:
+        return int(self._virtual_now * 1_000_000_000)
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            self.advance(seconds)
+
+    def ticks_ms(self) -> int:
+        return int(self.now() * 1000) & ((1 << 29) - 1)
+
+    def advance(self, seconds: float) -> None:
+        """Move the virtual clock forward, applying inputs on the way."""
+        target = self._virtual_now + seconds
+        while True:
+            due = self._next_due()
+            if due is None or due > target:
+                break
+            self._virtual_now = max(self._virtual_now, due)
+            self._apply_due()
+        self._virtual_now = target
+        self.update()
+
+    def spend(self, seconds: float) -> None:
+        """
+        Account for time a device operation takes on the real hardware.
+
+        Only the virtual clock moves; in real time the host's own speed
+        stands in for the device's.
+        """
+        if not self.realtime:
+            self.advance(seconds)
+
+    # --- Inputs ---
+
+    def update(self) -> None:
+        """Apply due inputs, keep windows responsive and honor stop_after."""
+        self._apply_due()
+
+        if self.realtime and self.pumps:
+            now = time.monotonic()
+            if now - self._last_pump >= PUMP_INTERVAL:
+                self._last_pump = now
+                for pump in self.pumps:
+                    pump()
+
+        if (
+            self.stop_after is not None
+            and not self.stopping
+            and self.now() >= self.stop_after
+        ):
+            self.stopping = True
+            raise KeyboardInterrupt
+
+    def _next_due(self) -> float | None:
+        times = [release_time for release_time, _ in self.releases]
+        script_time = self.script.next_time()
+        if script_time is not None:
+            times.append(script_time)
+        return min(times) if times else None
+
+    def _apply_due(self) -> None:
+        now = self.now()
+        while True:
+            due = self._next_due()
+            if due is None or due > now:
+                return
+            if self.releases and self.releases[0][0] == due:
+                _, release = self.releases.pop(0)
+                release()
+            else:
+                self._run_action(self.script.pop())
+
+    def _hold(self, seconds: float, release) -> None:
+        self.releases.append((self.now() + seconds, release))
+        self.releases.sort(key=lambda item: item[0])
+
+    def _run_action(self, action: ScriptAction) -> None:
+        args = action.args
+        if action.action == "button":
+            self.set_button(True)
+            self._hold(_hold_time(args, 0), lambda: self.set_button(False))
+        elif action.action == "switch":
+            channel = int(args[0]) - 1
+            self.set_switch(channel, True)
+            self._hold(_hold_time(args, 1), lambda: self.set_switch(channel, False))
+        elif action.action == "tilt":
+            direction = args[0]
+            self.set_tilt(direction)
+            self._hold(_hold_time(args, 1), lambda: self.set_tilt(None))
+        elif action.action == "turn":
+            self.turn(int(args[0]))
+        elif action.action == "quit":
+            self.stopping = True
+            raise KeyboardInterrupt
+
+    def set_switch(self, channel: int, pressed: bool) -> None:
+        if pressed:
+            self.pressed_switches.add(channel)
+        else:
+            self.pressed_switches.discard(channel)
+
+    def set_button(self, pressed: bool) -> None:
+        # Active LOW with the pull-up
+        self.set_input(BUTTON_PIN, not pressed)
+
+    def set_tilt(self, direction: str | None) -> None:
+        if direction not in TILT_VECTORS:
+            raise ValueError(f"Unknown tilt direction {direction!r}")
+        self.tilt = direction
+
+    def turn(self, detents: int) -> None:
+        self.encoder_detents += detents
+        # Full quadrature cycle per detent (pins pulled low in turn, CLK
+        # first when clockwise) for boards that decode it with keypad
+        first, second = ENCODER_CLK_PIN, ENCODER_DT_PIN
+        if detents < 0:
+            first, second = second, first
+        for _ in range(abs(detents)):
+            self.set_input(first, False)
+            self.set_input(second, False)
+            self.set_input(first, True)
+            self.set_input(second, True)
+
+    def key_down(self, keysym: str) -> None:
+        """Keyboard input from the Tk window."""
+        if keysym in KEY_SWITCHES:
+            self.set_switch(KEY_SWITCHES[keysym] - 1, True)
+        elif keysym in KEY_BUTTON:
+            self.set_button(True)
+        elif keysym in KEY_TILTS:
+            self.set_tilt(KEY_TILTS[keysym])
+        elif keysym in KEY_TURNS:
+            self.turn(KEY_TURNS[keysym])
+
+    def key_up(self, keysym: str) -> None:
+        if keysym in KEY_SWITCHES:
+            self.set_switch(KEY_SWITCHES[keysym] - 1, False)
+        elif keysym in KEY_BUTTON:
+            self.set_button(False)
+        elif keysym in KEY_TILTS and self.tilt == KEY_TILTS[keysym]:
+            self.set_tilt(None)
+
+    # --- Pins ---
+
+    def set_input(self, pin, level: bool) -> None:
+        """Drive an input pin from the simulation side."""
+        if self.input_levels.get(pin, True) == level:
+            self.input_levels[pin] = level
+            return
+        self.input_levels[pin] = level
+        timestamp_ms = self.ticks_ms()
+        for callback in self.watchers.get(pin, ()):
+            callback(level, timestamp_ms)
+
+    def watch(self, pin, callback) -> None:
+        """Call callback(level, timestamp_ms) whenever an input pin changes."""
+        self.watchers.setdefault(pin, []).append(callback)
+
+    def unwatch(self, pin, callback) -> None:
+        callbacks = self.watchers.get(pin, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def read_digital(self, pin, pull_up: bool = True) -> bool:
+        self.update()
+        source = self.input_sources.get(pin)
+        if source is not None:
+            return source()
+        if pin in self.input_levels:
+            return self.input_levels[pin]
+        if pin in self.output_levels:
+            return self.output_levels[pin]
+        return pull_up
+
+    def write_digital(self, pin, level: bool) -> None:
+        self.output_levels[pin] = level
+
+    def read_analog(self, pin) -> int:
+        """One 16-bit ADC reading of a pin."""
+        self.update()
+        if pin is not MUX_SIGNAL_PIN:
+            return 0
+        channel = 0
+        for bit, select_pin in enumerate(MUX_SELECT_PINS):
+            if self.output_levels.get(select_pin, False):
+                channel |= 1 << bit
+        return ADC_PRESSED if channel in self.pressed_switches else ADC_RELEASED
+
+    # --- Displays and memory ---
+
+    def add_display(self, display) -> None:
+        self.displays.append(display)
+        pump = getattr(display, "pump", None)
+        if pump is not None:
+            self.pumps.append(pump)
+
+    def release_displays(self) -> None:
+        for display in self.displays:
+            display.close()
+        self.displays = []
+        self.pumps = []
+
+    def mem_alloc(self) -> int:
+        if tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[0]
+        return 0
+
+    def mem_free(self) -> int:
+        return max(self.heap_size - self.mem_alloc(), 0)
+
+    def close(self) -> None:
+        """Close every display (writes gif output) and save NVM."""
+        self.release_displays()
+        if self.nvm_path is not None:
+            with open(self.nvm_path, "wb") as f:
+                f.write(self.nvm)
+
+
+def _hold_time(args: tuple, index: int) -> float:
+    return float(args[index]) if len(args) > index else DEFAULT_HOLD
+
+
+hardware = None
+_gc_collect = gc.collect
+
+
+def get_hardware() -> Hardware:
+    """The installed Hardware (a real-time one with no inputs by default)."""
+    global hardware
+    if hardware is None:
+        hardware = Hardware()
+    return hardware
+
+
+def _collect_young(generation=0):
+    return _gc_collect(generation)
+
+
+def install(**kwargs) -> Hardware:
+    """
+    Create the Hardware and hook it into the host runtime.
+
+    Takes the Hardware arguments. gc gains CircuitPython's mem_free() and
+    mem_alloc(), and gc.collect() only sweeps the youngest generation.
+    With realtime=False, time.monotonic(), monotonic_ns() and sleep() and
+    every new asyncio event loop run on the virtual clock.
+    """
+    global hardware
+    hardware = Hardware(**kwargs)
+
+    gc.mem_free = hardware.mem_free
+    gc.mem_alloc = hardware.mem_alloc
+    # The game collects every frame at times. A full CPython collection
+    # walks the whole interpreter (~10 ms); reference counting already
+    # frees nearly everything, so only the youngest generation is swept.
+    gc.collect = _collect_young
+
+    if not hardware.realtime:
+        time.monotonic = hardware.monotonic
+        time.monotonic_ns = hardware.monotonic_ns
+        time.sleep = hardware.sleep
+        asyncio.set_event_loop_policy(_VirtualTimePolicy(hardware))
+    return hardware
@@ -0,0 +1,21 @@
+"""Desktop stand-in for CircuitPython's supervisor module."""
+
+import sim_hardware
+
+
+def ticks_ms():
+    """Milliseconds on the simulated clock, wrapping at 2**29 like the device."""
+    return sim_hardware.get_hardware().ticks_ms()
+
+
+def reload():
+    raise SystemExit("supervisor.reload()")
+
+
+class _Runtime:
+    serial_connected = True
+    serial_bytes_available = 0
+    usb_connected = False
+
+
+runtime = _Runtime()
@@ -0,0 +1,43 @@
+"""Desktop stand-in for CircuitPython's terminalio module.
+
+FONT draws with the repo's 5x8 font (assets/font5x8.bin) in 6x12 cells,
+the cell size of the device's built-in terminal font, so text lays out
+where it does on the OLED.
+"""
+
+import os
+
+_FONT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "assets", "font5x8.bin"
+)
+
+
+class BuiltinFont:
+    """Fixed-width font: 6x12 cells holding 5x8 glyphs."""
+
+    cell_width = 6
+    cell_height = 12
+    glyph_width = 5
+    glyph_height = 8
+    glyph_top = 2  # Rows of padding above each glyph in its cell
+
+    def __init__(self, path=_FONT_PATH):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[0] != self.glyph_width or data[1] != self.glyph_height:
+            raise ValueError(f"{path} is not a 5x8 font")
+        self._glyphs = data[2:]
+
+    def get_bounding_box(self):
+        return (self.cell_width, self.cell_height)
+
+    def glyph_columns(self, char_code):
+        """Column bytes of one character, bit 0 at the top."""
+        start = char_code * self.glyph_width
+        columns = self._glyphs[start : start + self.glyph_width]
+        if len(columns) < self.glyph_width:
+            return bytes(self.glyph_width)
+        return columns
+
+
+FONT = BuiltinFont()
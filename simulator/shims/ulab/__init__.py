@@ -0,0 +1,6 @@
+"""Desktop stand-in for ulab: ulab.numpy is NumPy."""
+
+import numpy
+
+# The real ulab reports its own version; name the NumPy standing in for it
+__version__ = "numpy-" + numpy.__version__
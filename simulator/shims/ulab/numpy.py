@@ -0,0 +1,8 @@
+"""Desktop stand-in for ulab.numpy, backed by NumPy.
+
+ulab implements a subset of NumPy with the same names, so code written
+for ulab runs unchanged (the reverse is not guaranteed: check new calls
+against the ulab docs before relying on them on the device).
+"""
+
+from numpy import *  # noqa: F401,F403
@@ -1,18 +1,46 @@
 # This file was made with the use of various A.I. LLMs, specifically, Claude sonnet 4.5, ChatGPT 4.1, and Gemini 3.0
 # simulate.py
+import argparse
 import time
 
-from emulator.ssd1306 import SSD1306Emulator
+from emulator.backends import add_backend_arguments
+from emulator.ssd1306 import EmulatorConfig, SSD1306Emulator
 from helpers import (
     convert_bitmap_str_to_np,
     draw_rotated_copies,
     generate_bitmap_with_anchor_offset,
+    rotation_cache,
 )
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Spinning kaleidoscope preview")
+    add_backend_arguments(parser)
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=None,
+        help="Stop after this many frames (default: run until Ctrl+C)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rotate the copies on every frame instead of using the rotation "
+        "cache (simulator/.cache/rotations.npz)",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+
     # Create display (128x64)
-    disp = SSD1306Emulator()
+    disp = SSD1306Emulator(
+        EmulatorConfig(
+            scale=args.scale, fps=args.fps, backend=args.backend, output=args.output
+        )
+    )
+    realtime = disp.backend.realtime
 
     # Screen center
     center = (disp.width // 2, disp.height // 2)
@@ -51,9 +79,10 @@ def main():
     print(f"Piece with anchor: {piece_with_anchor.shape}")
     print("Press Ctrl+C to stop")
 
+    start_time = time.perf_counter()
+    frame_count = 0
     try:
-        frame_count = 0
-        while True:
+        while args.frames is None or frame_count < args.frames:
             # Draw all 8 rotated copies in real-time
             # The start_angle increments to create the spinning effect
             draw_rotated_copies(
@@ -64,6 +93,7 @@ def main():
                 origin=center,
                 clear_display=True,
                 show_display=True,
+                use_cache=not args.no_cache,
             )
 
             # Increment angle for next frame
@@ -74,12 +104,28 @@ def main():
             if frame_count % 60 == 0:
                 print(f"Frame {frame_count}")
 
-            # Control frame rate (~20 FPS for ESP32 compatibility)
-            time.sleep(0.05)
+            # Control frame rate (~20 FPS for ESP32 compatibility);
+            # file and memory backends run as fast as possible
+            if realtime:
+                time.sleep(0.05)
 
     except KeyboardInterrupt:
-        disp.close()
         print("\nAnimation stopped")
+    finally:
+        disp.close()
+        rotation_cache.save()
+
+    elapsed = time.perf_counter() - start_time
+    print(
+        f"{frame_count} frames in {elapsed:.2f}s "
+        f"({frame_count / max(elapsed, 1e-9):.0f} FPS, "
+        f"{disp.frames_presented} presented, {disp.frames_skipped} unchanged)"
+    )
+    if not args.no_cache:
+        print(
+            f"Rotation cache: {rotation_cache.hits} hits, "
+            f"{rotation_cache.misses} rotated ({len(rotation_cache.entries)} kept)"
+        )
 
 
 if __name__ == "__main__":
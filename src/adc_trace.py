@@ -0,0 +1,233 @@
+# adc_trace.py
+"""
+High-rate ADC trace recorder for tuning the multiplexer switch detector.
+
+Samples one or more mux channels as fast as the ADC allows into a single
+preallocated array.array, then sends the whole capture to the host in one
+compact binary transfer. Decode and plot it on the host with
+scripts/plot_adc_trace.py.
+
+Run from the REPL, e.g. to catch a press on switch 4:
+
+    >>> import adc_trace
+    >>> adc_trace.run_trace(channels=(3,), trigger=True)
+
+Trace format (little-endian):
+    header   "<4sBBHB"  magic b"DTRC", version, channel count,
+                        samples per channel, sample bits
+    channels "<BI"      channel number and capture duration in us, per channel
+    samples  uint16     channel-blocked samples (all of channel 0, then 1...)
+"""
+
+import array
+import struct
+import time
+
+from game_config import ADC_TRACE_SAMPLES, ADC_TRACE_TRIGGER_TIMEOUT
+from input_handler import MultiplexerInput
+
+# usb_cdc.data is only present when enabled in boot.py
+try:
+    import usb_cdc
+except ImportError:
+    usb_cdc = None
+
+TRACE_MAGIC = b"DTRC"
+TRACE_VERSION = 1
+TRACE_HEADER_FORMAT = "<4sBBHB"
+TRACE_CHANNEL_FORMAT = "<BI"
+
+# Console fallback framing (base64 lines between markers)
+TRACE_BEGIN_MARKER = "--- DTRC BEGIN ---"
+TRACE_END_MARKER = "--- DTRC END ---"
+
+
+class ADCTrace:
+    """
+    Preallocated trace buffer for one or more multiplexer channels.
+
+    Parameters
+    ----------
+    mux : MultiplexerInput
+        Multiplexer to sample.
+    channels : tuple
+        Channel numbers (0-7) to capture.
+    num_samples : int
+        Samples per channel (default ADC_TRACE_SAMPLES).
+    """
+
+    def __init__(self, mux, channels=(0,), num_samples=ADC_TRACE_SAMPLES):
+        self.mux = mux
+        self.channels = tuple(channels)
+        self.num_samples = num_samples
+
+        # Allocated once from zeroed bytes (a list of ints would need more
+        # heap than the buffer itself), reused for every capture
+        self.samples = array.array("H", bytes(2 * num_samples * len(self.channels)))
+        self.durations_us = array.array("I", bytes(4 * len(self.channels)))
+
+        if mux.buffered_sig is not None:
+            self.sample_bits = 16 - mux.sample_shift
+        else:
+            self.sample_bits = 16
+
+    def wait_for_trigger(self, channel, timeout=ADC_TRACE_TRIGGER_TIMEOUT):
+        """
+        Wait until a channel reads below its threshold (switch closing).
+
+        Parameters
+        ----------
+        channel : int
+            Channel number (0-7) to watch.
+        timeout : float
+            Seconds to wait before giving up.
+
+        Returns
+        -------
+        bool
+            True if triggered, False on timeout.
+        """
+        self.mux.select_channel(channel)
+        threshold = self.mux.thresholds[channel]
+        buffered_sig = self.mux.buffered_sig
+        analog_sig = self.mux.analog_sig
+        probe = self.mux.samples
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            if buffered_sig is not None:
+                buffered_sig.readinto(probe)
+                raw_value = probe[0]
+            else:
+                raw_value = analog_sig.value
+            if raw_value < threshold:
+                return True
+        return False
+
+    def record(self):
+        """
+        Fill the trace buffer, one channel block at a time.
+
+        Returns
+        -------
+        array.array
+            The sample buffer (channel-blocked).
+        """
+        mux = self.mux
+        samples = self.samples
+        samples_view = memoryview(samples)
+        num_samples = self.num_samples
+        buffered_sig = mux.buffered_sig
+        analog_sig = mux.analog_sig
+
+        for block, channel in enumerate(self.channels):
+            start = block * num_samples
+            end = start + num_samples
+            mux.select_channel(channel)
+
+            start_ns = time.monotonic_ns()
+            if buffered_sig is not None:
+                buffered_sig.readinto(samples_view[start:end])
+            else:
+                for i in range(start, end):
+                    samples[i] = analog_sig.value
+            self.durations_us[block] = (time.monotonic_ns() - start_ns) // 1000
+
+        return samples
+
+    def encode(self):
+        """
+        Pack the last capture into the binary trace format.
+
+        Returns
+        -------
+        bytearray
+            Header, per-channel records and samples.
+        """
+        header_size = struct.calcsize(TRACE_HEADER_FORMAT)
+        channel_size = struct.calcsize(TRACE_CHANNEL_FORMAT)
+        payload = bytearray(
+            header_size + channel_size * len(self.channels) + len(self.samples) * 2
+        )
+
+        struct.pack_into(
+            TRACE_HEADER_FORMAT,
+            payload,
+            0,
+            TRACE_MAGIC,
+            TRACE_VERSION,
+            len(self.channels),
+            self.num_samples,
+            self.sample_bits,
+        )
+        offset = header_size
+        for block, channel in enumerate(self.channels):
+            struct.pack_into(
+                TRACE_CHANNEL_FORMAT,
+                payload,
+                offset,
+                channel,
+                self.durations_us[block],
+            )
+            offset += channel_size
+
+        # array("H") is little-endian on every CircuitPython port
+        payload[offset:] = self.samples
+        return payload
+
+    def dump(self):
+        """
+        Send the last capture to the host in one transfer.
+
+        Uses the binary usb_cdc.data channel when it is enabled, otherwise
+        prints the trace as base64 between TRACE_BEGIN/END markers on the
+        console.
+        """
+        payload = self.encode()
+
+        if usb_cdc is not None and usb_cdc.data is not None:
+            usb_cdc.data.write(payload)
+            print(f"Trace sent on usb_cdc.data ({len(payload)} bytes)")
+            return
+
+        import binascii
+
+        print(TRACE_BEGIN_MARKER)
+        # 57 raw bytes per line keeps base64 lines at 76 characters
+        view = memoryview(payload)
+        for offset in range(0, len(payload), 57):
+            print(binascii.b2a_base64(view[offset : offset + 57]).decode(), end="")
+        print(TRACE_END_MARKER)
+
+
+def run_trace(channels=(0,), num_samples=ADC_TRACE_SAMPLES, trigger=False):
+    """
+    Capture one trace and send it to the host.
+
+    Parameters
+    ----------
+    channels : tuple
+        Channel numbers (0-7) to capture.
+    num_samples : int
+        Samples per channel (default ADC_TRACE_SAMPLES).
+    trigger : bool
+        If True, wait for the first channel's switch to close before
+        recording, so the capture starts on the press edge.
+    """
+    mux = MultiplexerInput()
+    try:
+        trace = ADCTrace(mux, channels, num_samples)
+
+        if trigger:
+            print(f"Waiting for press on switch {channels[0] + 1}...")
+            if not trace.wait_for_trigger(channels[0]):
+                print("Trigger timeout, recording anyway")
+
+        trace.record()
+        for block, channel in enumerate(trace.channels):
+            rate = num_samples * 1_000_000 // max(trace.durations_us[block], 1)
+            print(f"Channel {channel}: {num_samples} samples, ~{rate} samples/s")
+
+        trace.dump()
+    finally:
+        mux.deinit()
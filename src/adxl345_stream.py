@@ -0,0 +1,308 @@
+# adxl345_stream.py
+"""
+ADXL345 FIFO streaming, hardware activity interrupts and raw reads.
+
+The adafruit_adxl34x driver reads one float-converted sample per call, so a
+tilt that happens between polls is lost and every poll costs a full I2C
+transaction on the bus the OLED shares. ADXL345Stream instead puts the
+sensor's 32-entry FIFO in stream mode and enables its activity and
+watermark interrupts: the sensor keeps sampling on its own, and the game
+drains everything queued in one burst per frame, or only when the INT1 pin
+says something happened.
+
+All reads land as little-endian int16 counts directly in preallocated
+arrays (through preallocated memoryview slices), so a sample costs no
+float math and no heap allocation. Compare against thresholds converted
+once with counts_from_ms2().
+"""
+
+import array
+import time
+
+from adafruit_bus_device.i2c_device import I2CDevice
+from digitalio import DigitalInOut, Direction, Pull
+from game_config import (
+    ACCEL_DATA_RATE,
+    ACCEL_FIFO_WATERMARK,
+    ACCEL_RANGE_G,
+    ACCEL_TILT_THRESHOLD,
+)
+
+ADXL345_ADDRESS = 0x53
+
+# Registers
+_REG_THRESH_ACT = 0x24
+_REG_ACT_INACT_CTL = 0x27
+_REG_BW_RATE = 0x2C
+_REG_POWER_CTL = 0x2D
+_REG_INT_ENABLE = 0x2E
+_REG_INT_MAP = 0x2F
+_REG_INT_SOURCE = 0x30
+_REG_DATA_FORMAT = 0x31
+_REG_DATAX0 = 0x32
+_REG_FIFO_CTL = 0x38
+_REG_FIFO_STATUS = 0x39
+
+# Register bits
+_POWER_CTL_MEASURE = 0x08
+_INT_ACTIVITY = 0x10
+_INT_WATERMARK = 0x02
+_ACT_X_ENABLE = 0x40
+_ACT_Y_ENABLE = 0x20
+_DATA_FORMAT_FULL_RES = 0x08
+_DATA_FORMAT_INT_INVERT = 0x20  # Left clear: INT pins are active high
+_FIFO_MODE_BYPASS = 0x00
+_FIFO_MODE_STREAM = 0x80
+_FIFO_ENTRIES_MASK = 0x3F
+
+FIFO_DEPTH = 32
+
+# BW_RATE codes by output data rate (Hz)
+DATA_RATE_CODES = {
+    3200: 0x0F,
+    1600: 0x0E,
+    800: 0x0D,
+    400: 0x0C,
+    200: 0x0B,
+    100: 0x0A,
+    50: 0x09,
+    25: 0x08,
+    12.5: 0x07,
+    6.25: 0x06,
+}
+
+# DATA_FORMAT range bits by full-scale range (g)
+RANGE_CODES = {2: 0x00, 4: 0x01, 8: 0x02, 16: 0x03}
+
+# Full resolution keeps 4 mg/LSB at every range
+STANDARD_GRAVITY = 9.80665
+ACCEL_SCALE = 0.004 * STANDARD_GRAVITY  # m/s² per LSB
+ACTIVITY_SCALE = 0.0625 * STANDARD_GRAVITY  # m/s² per THRESH_ACT LSB
+
+
+def counts_from_ms2(acceleration):
+    """
+    Convert an acceleration in m/s² to raw full-resolution counts.
+
+    Parameters
+    ----------
+    acceleration : float
+        Acceleration in m/s².
+
+    Returns
+    -------
+    int
+        Equivalent raw count (4 mg/LSB).
+    """
+    return int(acceleration / ACCEL_SCALE + 0.5)
+
+
+class ADXL345Stream:
+    """
+    FIFO-backed ADXL345 sample stream with a raw single-sample fast path.
+
+    Samples are drained into a preallocated array of interleaved x, y, z
+    counts; `count` holds how many samples the last drain() produced.
+    read_raw() reads the current sample into `raw` without the FIFO.
+
+    Parameters
+    ----------
+    i2c : busio.I2C
+        I2C bus object (shared with the display).
+    int_pin : board pin or None
+        Pin wired to the ADXL345 INT1 output (active high, pulled down).
+        When given, drain() is only needed when pending() reports the pin
+        is active. Leave it None unless INT1 is actually wired: an
+        unconnected pin reads inactive, so the FIFO would never be drained.
+    address : int
+        I2C address (default 0x53).
+    stats : BusStats or None
+        If given, bytes and bus time of every read are recorded in it.
+    """
+
+    def __init__(self, i2c, int_pin=None, address=ADXL345_ADDRESS, stats=None):
+        self.device = I2CDevice(i2c, address)
+        self.stats = stats
+
+        # Preallocated transfer buffers
+        self._register = bytearray(1)
+        self._write_buffer = bytearray(2)
+        self._read_buffer = bytearray(1)
+
+        self.samples = array.array("h", bytes(2 * 3 * FIFO_DEPTH))
+        self.count = 0
+        self.raw = array.array("h", bytes(2 * 3))
+
+        # One 3-element view per FIFO entry so reads never allocate
+        samples_view = memoryview(self.samples)
+        self._entry_views = [samples_view[3 * i : 3 * i + 3] for i in range(FIFO_DEPTH)]
+        self._raw_view = memoryview(self.raw)
+
+        # INT1 is driven active high (see configure()); the pull-down holds
+        # the pin inactive while the sensor is off or being reconfigured
+        self.int_pin = None
+        if int_pin is not None:
+            self.int_pin = DigitalInOut(int_pin)
+            self.int_pin.direction = Direction.INPUT
+            self.int_pin.pull = Pull.DOWN
+
+    def _write_register(self, register, value):
+        self._write_buffer[0] = register
+        self._write_buffer[1] = value
+        with self.device as device:
+            device.write(self._write_buffer)
+
+    def _read_register(self, device, register):
+        self._register[0] = register
+        device.write_then_readinto(self._register, self._read_buffer)
+        return self._read_buffer[0]
+
+    def configure(
+        self,
+        fifo=True,
+        data_rate=ACCEL_DATA_RATE,
+        range_g=ACCEL_RANGE_G,
+        watermark=ACCEL_FIFO_WATERMARK,
+        activity_threshold=ACCEL_TILT_THRESHOLD,
+    ):
+        """
+        Set data rate and range, and optionally stream through the FIFO.
+
+        Parameters
+        ----------
+        fifo : bool
+            If True, put the FIFO in stream mode and enable the activity
+            and watermark interrupts. If False, bypass the FIFO and use
+            read_raw().
+        data_rate : float
+            Output data rate in Hz (a key of DATA_RATE_CODES).
+        range_g : int
+            Full-scale range in g (2, 4, 8 or 16). Full resolution keeps
+            4 mg/LSB at every range, so thresholds don't change with it.
+        watermark : int
+            FIFO entries (1-31) that raise the watermark interrupt.
+        activity_threshold : float
+            Acceleration in m/s² on X or Y that raises the activity
+            interrupt. DC-coupled, so it fires while the device is tilted.
+        """
+        if data_rate not in DATA_RATE_CODES:
+            raise ValueError(f"Unsupported ADXL345 data rate: {data_rate} Hz")
+        if range_g not in RANGE_CODES:
+            raise ValueError(f"Unsupported ADXL345 range: {range_g} g")
+
+        threshold = int(activity_threshold / ACTIVITY_SCALE + 0.5)
+        if threshold > 255:
+            threshold = 255
+
+        # Stop measuring while reconfiguring
+        self._write_register(_REG_POWER_CTL, 0)
+        self._write_register(_REG_INT_ENABLE, 0)
+        self._write_register(_REG_BW_RATE, DATA_RATE_CODES[data_rate])
+        # INT_INVERT stays clear, matching the int_pin pull-down
+        self._write_register(
+            _REG_DATA_FORMAT, _DATA_FORMAT_FULL_RES | RANGE_CODES[range_g]
+        )
+
+        if fifo:
+            self._write_register(_REG_THRESH_ACT, threshold)
+            self._write_register(_REG_ACT_INACT_CTL, _ACT_X_ENABLE | _ACT_Y_ENABLE)
+            self._write_register(_REG_INT_MAP, 0)  # Everything on INT1
+            self._write_register(_REG_FIFO_CTL, _FIFO_MODE_STREAM | (watermark & 0x1F))
+            self._write_register(_REG_INT_ENABLE, _INT_ACTIVITY | _INT_WATERMARK)
+        else:
+            self._write_register(_REG_FIFO_CTL, _FIFO_MODE_BYPASS)
+
+        self._write_register(_REG_POWER_CTL, _POWER_CTL_MEASURE)
+
+    def read_raw(self):
+        """
+        Burst-read the six data registers into `raw`.
+
+        Returns
+        -------
+        array.array
+            The preallocated (x, y, z) int16 counts, overwritten every call.
+        """
+        stats = self.stats
+        if stats is not None:
+            start_ns = time.monotonic_ns()
+
+        self._register[0] = _REG_DATAX0
+        with self.device as device:
+            device.write_then_readinto(self._register, self._raw_view)
+
+        if stats is not None:
+            stats.record(7, time.monotonic_ns() - start_ns)
+        return self.raw
+
+    def pending(self):
+        """
+        Check whether there is anything worth draining.
+
+        Returns
+        -------
+        bool
+            True if INT1 is active, or always True without an INT pin.
+        """
+        if self.int_pin is None:
+            return True
+        return self.int_pin.value
+
+    def drain(self):
+        """
+        Read every queued FIFO entry into `samples` under one bus lock.
+
+        The ADXL345 pops one FIFO entry per complete 6-byte read from
+        DATAX0 (a longer read runs on into FIFO_CTL rather than the next
+        entry), so each entry is its own write_then_readinto. They all
+        happen inside one `with device:` block, so the bus is locked once
+        per drain, and no display transfer can fall in between.
+
+        Returns
+        -------
+        int
+            Number of samples read (also stored in `count`).
+        """
+        entry_views = self._entry_views
+        register = self._register
+        stats = self.stats
+        if stats is not None:
+            start_ns = time.monotonic_ns()
+
+        with self.device as device:
+            entries = self._read_register(device, _REG_FIFO_STATUS)
+            entries &= _FIFO_ENTRIES_MASK
+
+            # Each 6-byte read from DATAX0 pops one FIFO entry
+            register[0] = _REG_DATAX0
+            for i in range(entries):
+                device.write_then_readinto(register, entry_views[i])
+
+            # Reading INT_SOURCE releases the latched activity interrupt
+            if self.int_pin is not None:
+                self._read_register(device, _REG_INT_SOURCE)
+
+        if stats is not None:
+            # FIFO_STATUS, one 6-byte read per entry and INT_SOURCE, each a
+            # register address byte plus the data read
+            transfers = 1 + entries
+            num_bytes = 2 + 7 * entries
+            if self.int_pin is not None:
+                transfers += 1
+                num_bytes += 2
+            stats.record(num_bytes, time.monotonic_ns() - start_ns, transfers)
+
+        self.count = entries
+        return entries
+
+    def flush(self):
+        """Discard everything queued (e.g. before a new gesture prompt)."""
+        self.drain()
+        self.count = 0
+
+    def deinit(self):
+        """Stop streaming and release the INT pin."""
+        self._write_register(_REG_INT_ENABLE, 0)
+        self._write_register(_REG_FIFO_CTL, 0)
+        if self.int_pin is not None:
+            self.int_pin.deinit()
@@ -0,0 +1,240 @@
+# bench_helpers.py
+"""
+Micro-benchmarks for the bitmap helpers in helpers_esp32c3.
+
+Times each helper over the inputs the game actually uses: the 11x13
+kaleidoscope piece, the four gesture arrows, the 64x64 kaleidoscope
+frames and the full 128x64 screen. Runs unchanged on the device (ulab)
+and on the desktop (NumPy, through simulator/bench_helpers_host.py) and
+prints the same CSV on both, so results can be diffed directly:
+
+    helper,input,pixels,calls,us_per_call,ns_per_pixel
+
+pixels is the number of input pixels one call processes (for
+draw_rotated_copies_esp32, all copies), so ns_per_pixel compares inputs
+of different sizes.
+
+Run from the REPL with the game stopped:
+
+    >>> import bench_helpers
+    >>> bench_helpers.run()
+"""
+
+import gc
+import sys
+import time
+
+import displayio
+import ulab
+from arrow_sprites import ARROWS
+from game_config import (
+    DISPLAY_CENTER,
+    DISPLAY_HEIGHT,
+    DISPLAY_WIDTH,
+    KALEIDOSCOPE_BASE_ANGLE,
+    KALEIDOSCOPE_NUM_COPIES,
+    KALEIDOSCOPE_RADIUS,
+)
+from helpers_esp32c3 import (
+    clear_displayio_bitmap,
+    convert_bitmap_str_to_np,
+    draw_numpy_to_displayio_bitmap,
+    draw_rotated_copies_esp32,
+    generate_bitmap_with_anchor_offset,
+    rotate_bitmap_in_place,
+)
+from splash_frames import SPLASH_FRAMES
+
+# Same bitmap as the sliding shapes and kaleidoscope pieces in game_loop.py
+PIECE = """
+1111111111111
+1111111111111
+1100000000011
+1100000000011
+0110000000110
+0110000000110
+0011000001100
+0011000001100
+0001100011000
+0001111111000
+0000111110000
+"""
+
+BENCH_MIN_MS = 200  # Keep calling a helper until this much time has passed
+BENCH_MAX_CALLS = 1024
+
+CSV_HEADER = "helper,input,pixels,calls,us_per_call,ns_per_pixel"
+
+
+def _input_name(name, np_bitmap):
+    rows, cols = np_bitmap.shape
+    return f"{name}_{cols}x{rows}"
+
+
+def _pixels(np_bitmap):
+    rows, cols = np_bitmap.shape
+    return rows * cols
+
+
+def time_call(function, args, min_ms=BENCH_MIN_MS, max_calls=BENCH_MAX_CALLS):
+    """
+    Time repeated calls of function(*args).
+
+    One untimed call warms up, then the number of calls doubles until a
+    batch takes at least min_ms (or max_calls is reached). A batch is
+    timed as a whole so the timer's resolution does not matter.
+
+    Parameters
+    ----------
+    function : callable
+        The helper to time.
+    args : tuple
+        Positional arguments passed on every call.
+    min_ms : int
+        Shortest batch that counts as a measurement.
+    max_calls : int
+        Largest batch, for helpers too fast to reach min_ms.
+
+    Returns
+    -------
+    tuple
+        (calls, elapsed_ns) of the measured batch.
+    """
+    function(*args)
+    calls = 1
+    while True:
+        gc.collect()
+        start = time.monotonic_ns()
+        for _ in range(calls):
+            function(*args)
+        elapsed = time.monotonic_ns() - start
+        if elapsed >= min_ms * 1_000_000 or calls >= max_calls:
+            return calls, elapsed
+        calls *= 2
+
+
+def build_cases():
+    """
+    Inputs and calls to time, in print order.
+
+    Returns
+    -------
+    list of tuple
+        (helper name, input name, pixels per call, function, args).
+    """
+    screen = displayio.Bitmap(DISPLAY_WIDTH, DISPLAY_HEIGHT, 2)
+    piece = convert_bitmap_str_to_np(PIECE)
+    anchored = generate_bitmap_with_anchor_offset(piece, KALEIDOSCOPE_RADIUS)
+    sources = [("piece", PIECE)]
+    # Fixed order: CircuitPython dicts do not keep insertion order
+    for direction in ("up", "down", "left", "right"):
+        sources.append(("arrow_" + direction, ARROWS[direction]))
+    sources.append(("kaleidoscope", SPLASH_FRAMES[0]))
+
+    cases = []
+    for name, source in sources:
+        np_bitmap = convert_bitmap_str_to_np(source)
+        input_name = _input_name(name, np_bitmap)
+        pixels = _pixels(np_bitmap)
+        cases.append(
+            (
+                "convert_bitmap_str_to_np",
+                input_name,
+                pixels,
+                convert_bitmap_str_to_np,
+                (source,),
+            )
+        )
+        cases.append(
+            (
+                "rotate_bitmap_in_place",
+                input_name,
+                pixels,
+                rotate_bitmap_in_place,
+                (np_bitmap, KALEIDOSCOPE_BASE_ANGLE),
+            )
+        )
+        cases.append(
+            (
+                "draw_numpy_to_displayio_bitmap",
+                input_name,
+                pixels,
+                draw_numpy_to_displayio_bitmap,
+                (np_bitmap, screen, DISPLAY_CENTER),
+            )
+        )
+
+    cases.append(
+        (
+            "generate_bitmap_with_anchor_offset",
+            _input_name("piece", piece),
+            _pixels(piece),
+            generate_bitmap_with_anchor_offset,
+            (piece, KALEIDOSCOPE_RADIUS),
+        )
+    )
+    cases.append(
+        (
+            "draw_rotated_copies_esp32",
+            _input_name("anchored_piece", anchored),
+            _pixels(anchored) * KALEIDOSCOPE_NUM_COPIES,
+            draw_rotated_copies_esp32,
+            (
+                screen,
+                anchored,
+                KALEIDOSCOPE_NUM_COPIES,
+                KALEIDOSCOPE_BASE_ANGLE,
+                DISPLAY_CENTER,
+            ),
+        )
+    )
+    cases.append(
+        (
+            "clear_displayio_bitmap",
+            f"screen_{DISPLAY_WIDTH}x{DISPLAY_HEIGHT}",
+            DISPLAY_WIDTH * DISPLAY_HEIGHT,
+            clear_displayio_bitmap,
+            (screen,),
+        )
+    )
+    return cases
+
+
+def format_row(helper, input_name, pixels, calls, elapsed_ns):
+    """One CSV row; the same text on the device and the desktop."""
+    per_call_ns = elapsed_ns / calls
+    return (
+        f"{helper},{input_name},{pixels},{calls},"
+        f"{per_call_ns / 1000:.1f},{per_call_ns / pixels:.1f}"
+    )
+
+
+def run(only=None, min_ms=BENCH_MIN_MS, max_calls=BENCH_MAX_CALLS):
+    """
+    Time every helper and print the results as CSV.
+
+    Parameters
+    ----------
+    only : str or None
+        If given, only time helpers whose name contains this text.
+    min_ms : int
+        Shortest timed batch per case (see time_call).
+    max_calls : int
+        Largest batch per case.
+
+    Returns
+    -------
+    list of str
+        The printed CSV rows, without the header.
+    """
+    print(f"# bench_helpers on {sys.implementation.name}, ulab {ulab.__version__}")
+    print(CSV_HEADER)
+    rows = []
+    for helper, input_name, pixels, function, args in build_cases():
+        if only is not None and only not in helper:
+            continue
+        calls, elapsed_ns = time_call(function, args, min_ms, max_calls)
+        row = format_row(helper, input_name, pixels, calls, elapsed_ns)
+        print(row)
+        rows.append(row)
+    return rows
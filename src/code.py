@@ -3,14 +3,24 @@
 """Main entry point for Dancie rhythm game."""
 
 import gc
+import random
 
 import adafruit_displayio_ssd1306
+import asyncio
 import board
-import busio
 import displayio
+import heap_tracker
 import i2cdisplaybus
+from feedback_effects import FeedbackEffects
+from game_config import HEAP_TRACKING, INPUT_TRACE_MODE, PIN_ACCEL_INT, SOAK_TEST
 from game_loop import run_game
+from game_over_screen import TextScreens
+from game_tasks import GameContext, run_tasks
+from hud import Hud
+from helpers_esp32c3 import clear_displayio_bitmap
+from i2c_bus import I2CBus
 from input_handler import AccelerometerInput, MultiplexerInput, RotaryEncoderButton
+from mux_calibration import calibrate_multiplexer
 from neopixel_manager import NeoPixelManager
 from splash_screen import run_splash_screen
 
@@ -28,7 +38,8 @@ print("Initializing hardware...")
 # --- Display Setup ---
 print("  • Setting up OLED display...")
 displayio.release_displays()
-i2c = busio.I2C(board.SCL, board.SDA)
+bus = I2CBus(board.SCL, board.SDA)
+i2c = bus.i2c
 display_bus = i2cdisplaybus.I2CDisplayBus(i2c, device_address=0x3C)
 display = adafruit_displayio_ssd1306.SSD1306(display_bus, width=128, height=64)
 
@@ -44,7 +55,7 @@ main_group = displayio.Group()
 main_group.append(tile_grid)
 display.root_group = main_group
 
-print("    ✓ Display ready (128x64 OLED)")
+print(f"    ✓ Display ready (128x64 OLED, I2C @ {bus.frequency // 1000} kHz)")
 
 # --- NeoPixel Setup ---
 print("  • Setting up NeoPixels...")
@@ -56,57 +67,104 @@ print("  • Setting up input devices...")
 
 # Multiplexer (8 limit switches)
 mux = MultiplexerInput()
-print("    ✓ Multiplexer ready (8 limit switches)")
-
-# Accelerometer
-accel = AccelerometerInput(i2c)
-print("    ✓ Accelerometer ready (ADXL345)")
-
-# Rotary encoder button
-button = RotaryEncoderButton(pin=board.D7)
-print("    ✓ Rotary encoder button ready (D7)")
+print(f"    ✓ Multiplexer ready (8 limit switches, {mux.capture_mode} capture)")
+
+# Accelerometer (FIFO streaming, INT1 only if wired to PIN_ACCEL_INT)
+accel_int_pin = None if PIN_ACCEL_INT is None else getattr(board, PIN_ACCEL_INT)
+accel = AccelerometerInput(
+    i2c, int_pin=accel_int_pin, bus_stats=bus.register("accel")
+)
+bus.schedule(accel.service)
+if accel_int_pin is not None:
+    print(f"    ✓ Accelerometer ready (ADXL345, FIFO stream, INT1 {PIN_ACCEL_INT})")
+else:
+    print("    ✓ Accelerometer ready (ADXL345, FIFO stream, polled)")
+
+# Rotary encoder (button + rotation, counted by rotaryio or decoded from keypad)
+button = RotaryEncoderButton(pin=board.D7, clk_pin=board.D0, dt_pin=board.D1)
+if button.encoder is not None:
+    print("    ✓ Rotary encoder ready (button D7, CLK D0, DT D1)")
+else:
+    print("    ✓ Rotary encoder button ready (D7, rotation unavailable)")
+
+# Hold the encoder button during boot to recalibrate the multiplexer
+if button.is_pressed():
+    print("  • Encoder button held: calibrating multiplexer...")
+    calibrate_multiplexer(mux)
+elif not mux.is_calibrated:
+    print("    (Multiplexer not calibrated - hold encoder button at boot)")
 
 # Package inputs into dictionary
 inputs = {
     "mux": mux,
     "accel": accel,
     "button": button,
+    "bus": bus,
 }
 
 print("\n✓ All hardware initialized successfully!")
 print(f"Free memory after init: {gc.mem_free()} bytes\n")
 
 # ============================================================================
-# SPLASH SCREEN
+# SPLASH SCREEN AND MAIN GAME LOOP
 # ============================================================================
 
-print("Starting splash screen...")
-print("Press rotary encoder button to start game!\n")
+# Build every text screen and countdown digit once, hidden until needed
+screens = TextScreens(main_group)
+hud = Hud(main_group)
+feedback = FeedbackEffects(display, palette, bus)
 
-# Run splash screen (loops until button pressed)
-run_splash_screen(display, bitmap, button)
+# Record this session's inputs, replay a recorded one with its seed, or
+# let the soak test bot play (imported only when used, to save heap)
+trace = None
+if SOAK_TEST:
+    from soak import SoakBot
 
-# Clear screen after splash
-display.auto_refresh = False
-from helpers_esp32c3 import clear_displayio_bitmap
+    trace = SoakBot()
+    print(f"Soak test: the bot plays {len(trace.plan)} rounds")
+elif INPUT_TRACE_MODE == "record":
+    from input_trace import InputRecorder
 
-clear_displayio_bitmap(bitmap)
-display.refresh()
+    trace = InputRecorder()
+    print(f"Recording inputs (seed {trace.seed})")
+elif INPUT_TRACE_MODE == "replay":
+    from input_trace import InputPlayer
 
-gc.collect()
-print(f"Free memory after splash: {gc.mem_free()} bytes\n")
+    trace = InputPlayer.load()
+    print(f"Replaying {trace.count - 1} recorded inputs (seed {trace.seed})")
+if trace is not None:
+    random.seed(trace.seed)
 
-# ============================================================================
-# MAIN GAME LOOP
-# ============================================================================
+# Input scanning, rendering and LEDs run as tasks beside the game
+ctx = GameContext(display, bitmap, inputs, neopixels, screens, hud, feedback, trace)
 
-print("=" * 50)
-print("   Starting Game!")
-print("=" * 50)
 
-try:
+async def play():
+    """Game task: splash screen, then the game (runs until interrupted)."""
+    print("Starting splash screen...")
+    print("Press rotary encoder button to start game!\n")
+
+    # Run splash screen (loops until button pressed, encoder picks the level)
+    heap_tracker.enter(heap_tracker.SPLASH)
+    starting_level = await run_splash_screen(ctx)
+
+    # Clear screen after splash
+    clear_displayio_bitmap(bitmap)
+    ctx.request_frame()
+
+    gc.collect()
+    print(f"Free memory after splash: {gc.mem_free()} bytes\n")
+
+    print("=" * 50)
+    print("   Starting Game!")
+    print("=" * 50)
+
     # Run the game (infinite loop with level progression and restarts)
-    run_game(display, bitmap, inputs, neopixels)
+    await run_game(ctx, starting_level=starting_level)
+
+
+try:
+    asyncio.run(run_tasks(ctx, play()))
 
 except KeyboardInterrupt:
     # Clean shutdown on Ctrl+C
@@ -123,7 +181,12 @@ except Exception as e:
 finally:
     # Cleanup
     print("\nCleaning up...")
+    if trace is not None:
+        trace.finish()
+    if HEAP_TRACKING:
+        heap_tracker.report()
     neopixels.turn_off_all()
     mux.deinit()
+    accel.deinit()
     button.deinit()
     print("Goodbye!")
@@ -0,0 +1,118 @@
+# event_queue.py
+"""
+Preallocated event queues for passing messages between asyncio tasks.
+
+An event is a small integer kind, an int16 value and the supervisor.ticks_ms
+timestamp of when it happened. Events are stored in fixed arrays used as a
+ring buffer, so putting and popping never allocate and a burst of input
+can't grow the heap. When the queue is full the oldest event is dropped
+(and counted), since a stale input matters less than a fresh one.
+"""
+
+import array
+
+import asyncio
+import supervisor
+
+# Input events (input task -> game task)
+EVENT_SWITCH = 1  # value: button number 1-8
+EVENT_BUTTON = 2  # value: unused
+EVENT_ROTATE = 3  # value: encoder detents turned
+EVENT_TILT = 4  # value: index into TILT_DIRECTIONS
+
+# LED commands (game task -> LED task)
+LED_HEALTH = 1  # value: health 0-5
+LED_VICTORY = 2  # value: duration in ms
+LED_BRIGHTNESS = 4  # value: brightness steps
+
+TILT_DIRECTIONS = ("up", "down", "left", "right")
+
+
+class EventQueue:
+    """
+    Fixed-size FIFO of (kind, value, timestamp) events.
+
+    pop() returns the kind and leaves the value and timestamp of that event
+    in `value` and `timestamp_ms`, so reading an event doesn't build a tuple.
+
+    Parameters
+    ----------
+    size : int
+        Maximum number of queued events.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.kinds = bytearray(size)
+        self.values = array.array("h", bytes(2 * size))
+        self.timestamps = array.array("I", bytes(4 * size))
+
+        self.head = 0
+        self.count = 0
+        self.dropped = 0
+
+        self.value = 0
+        self.timestamp_ms = 0
+        self._ready = asyncio.Event()
+
+    def __len__(self):
+        return self.count
+
+    def put(self, kind, value=0, timestamp_ms=None):
+        """
+        Add an event, dropping the oldest one if the queue is full.
+
+        Parameters
+        ----------
+        kind : int
+            Event kind (EVENT_* or LED_* constant).
+        value : int
+            Event value (-32768 to 32767).
+        timestamp_ms : int or None
+            When the event happened (supervisor.ticks_ms() if not given).
+        """
+        if timestamp_ms is None:
+            timestamp_ms = supervisor.ticks_ms()
+
+        if self.count == self.size:
+            self.head = (self.head + 1) % self.size
+            self.count -= 1
+            self.dropped += 1
+
+        tail = (self.head + self.count) % self.size
+        self.kinds[tail] = kind
+        self.values[tail] = value
+        self.timestamps[tail] = timestamp_ms
+        self.count += 1
+        self._ready.set()
+
+    def pop(self):
+        """
+        Remove the oldest event.
+
+        Returns
+        -------
+        int
+            Its kind, or 0 if the queue is empty. The event's value and
+            timestamp are left in self.value and self.timestamp_ms.
+        """
+        if self.count == 0:
+            return 0
+
+        head = self.head
+        self.value = self.values[head]
+        self.timestamp_ms = self.timestamps[head]
+        self.head = (head + 1) % self.size
+        self.count -= 1
+        return self.kinds[head]
+
+    def clear(self):
+        """Discard every queued event."""
+        self.head = 0
+        self.count = 0
+
+    async def wait(self):
+        """Wait until at least one event is queued."""
+        while self.count == 0:
+            self._ready.clear()
+            await self._ready.wait()
@@ -0,0 +1,121 @@
+# feedback_effects.py
+"""
+Hit, miss and damage feedback without redrawing the bitmap.
+
+The playfield is a 1-bit Bitmap drawn through a 2-entry Palette, so
+swapping the two palette colors inverts the whole screen, and the SSD1306
+contrast (display.brightness) can dim it with a single command. Effects
+are per-frame patterns: an invert bitmask consumed one bit per frame and
+a short brightness sequence. tick() applies the next step of each, so a
+judgement's feedback costs a couple of attribute writes per frame and
+never touches a pixel.
+"""
+
+from game_config import (
+    DISPLAY_BRIGHTNESS,
+    FEEDBACK_DAMAGE_INVERT,
+    FEEDBACK_DIM_STEPS,
+    FEEDBACK_HIT_INVERT,
+)
+
+
+class FeedbackEffects:
+    """
+    Screen flashes and contrast pulses driven once per frame.
+
+    Parameters
+    ----------
+    display : adafruit_displayio_ssd1306.SSD1306
+        The display (its brightness sets the SSD1306 contrast).
+    palette : displayio.Palette
+        The playfield's 2-entry palette (0 = background, 1 = foreground).
+    bus : I2CBus
+        Sends the contrast commands, so they count as display traffic.
+    """
+
+    def __init__(self, display, palette, bus):
+        self.display = display
+        self.palette = palette
+        self.bus = bus
+        self.background = palette[0]
+        self.foreground = palette[1]
+
+        self.inverted = False
+        self.invert_pattern = 0
+        self.dim_steps = ()
+        self.dim_index = 0
+
+    @property
+    def is_active(self):
+        """True while an effect still has frames left."""
+        return self.invert_pattern != 0 or bool(self.dim_steps)
+
+    def hit(self):
+        """Short full-screen flash for a correct press or gesture."""
+        self.invert_pattern = FEEDBACK_HIT_INVERT
+
+    def miss(self):
+        """Contrast dip for a wrong button."""
+        self.dim_steps = FEEDBACK_DIM_STEPS
+        self.dim_index = 0
+
+    def damage(self):
+        """Double flash plus contrast dip when health is lost."""
+        self.invert_pattern = FEEDBACK_DAMAGE_INVERT
+        self.miss()
+
+    def tick(self):
+        """
+        Advance effects by one frame.
+
+        Returns
+        -------
+        bool
+            True if the palette changed and the display needs a refresh.
+            Brightness changes take effect immediately without one.
+        """
+        changed = False
+
+        want_inverted = bool(self.invert_pattern & 1)
+        self.invert_pattern >>= 1
+        if want_inverted != self.inverted:
+            self._set_inverted(want_inverted)
+            changed = True
+
+        if self.dim_index < len(self.dim_steps):
+            self.bus.set_brightness(self.display, self.dim_steps[self.dim_index])
+            self.dim_index += 1
+        elif self.dim_steps:
+            # Sequence done: back to normal contrast
+            self.bus.set_brightness(self.display, DISPLAY_BRIGHTNESS)
+            self.dim_steps = ()
+            self.dim_index = 0
+
+        return changed
+
+    def reset(self):
+        """
+        Cancel all effects and restore normal colors and contrast.
+
+        Returns
+        -------
+        bool
+            True if the palette changed and the display needs a refresh.
+        """
+        self.invert_pattern = 0
+        self.dim_steps = ()
+        self.dim_index = 0
+        self.bus.set_brightness(self.display, DISPLAY_BRIGHTNESS)
+        if self.inverted:
+            self._set_inverted(False)
+            return True
+        return False
+
+    def _set_inverted(self, inverted):
+        if inverted:
+            self.palette[0] = self.foreground
+            self.palette[1] = self.background
+        else:
+            self.palette[0] = self.background
+            self.palette[1] = self.foreground
+        self.inverted = inverted
@@ -6,6 +6,21 @@
 DISPLAY_WIDTH = 128
 DISPLAY_HEIGHT = 64
 DISPLAY_CENTER = (DISPLAY_WIDTH // 2, DISPLAY_HEIGHT // 2)
+DISPLAY_FRAME_BYTES = 1030  # 1 KB framebuffer + addressing commands per refresh
+DISPLAY_COMMAND_BYTES = 3  # Control byte + 2-byte command (e.g. set contrast)
+DISPLAY_BRIGHTNESS = 1.0  # Normal SSD1306 contrast (0.0-1.0)
+
+# Judgement feedback (palette invert / contrast, see feedback_effects.py)
+FEEDBACK_HIT_INVERT = 0b11  # Frames inverted, read LSB first: 2-frame flash
+FEEDBACK_DAMAGE_INVERT = 0b110011  # Two 2-frame flashes
+FEEDBACK_DIM_STEPS = (0.05, 0.2, 0.5)  # Contrast per frame before restoring
+
+# HUD (score/level/health row, see hud.py)
+HUD_FONT_PATH = "font5x8.bin"  # Copy assets/font5x8.bin to the CIRCUITPY root
+HUD_Y = 0  # Top pixel row of the HUD
+
+# I2C bus (display + accelerometer share it, see i2c_bus.py)
+I2C_FREQUENCY = 400_000  # Hz; SSD1306 and ADXL345 are both rated for 400 kHz
 
 # Kaleidoscope settings
 KALEIDOSCOPE_BASE_ANGLE = 22.5
@@ -14,15 +29,21 @@ KALEIDOSCOPE_RADIUS = 24
 
 # Pin definitions
 PIN_ROTARY_BUTTON = "D7"  # Rotary encoder button
+PIN_ROTARY_CLK = "D0"  # Rotary encoder CLK (A)
+PIN_ROTARY_DT = "D1"  # Rotary encoder DT (B)
 PIN_NEOPIXEL = "D3"  # NeoPixel data pin
 PIN_MUX_S0 = "D8"  # Multiplexer select 0
 PIN_MUX_S1 = "D9"  # Multiplexer select 1
 PIN_MUX_S2 = "D10"  # Multiplexer select 2
 PIN_MUX_SIG = "A2"  # Multiplexer analog signal
+PIN_ACCEL_INT = None  # ADXL345 INT1 if wired (e.g. "D6"); None polls the FIFO
 
 # NeoPixel settings
 NUM_NEOPIXELS = 6
 NEOPIXEL_BRIGHTNESS = 0.3
+NEOPIXEL_BRIGHTNESS_STEP = 0.05  # Brightness change per encoder detent
+NEOPIXEL_MIN_BRIGHTNESS = 0.05
+NEOPIXEL_MAX_BRIGHTNESS = 1.0
 COLOR_POWER_ON = (0, 255, 0)  # Green for power indicator (first LED)
 COLOR_HEALTH_FULL = (128, 0, 128)  # Purple for health LEDs
 COLOR_HEALTH_OFF = (0, 0, 0)  # Off
@@ -99,6 +120,29 @@ def get_level_requirements(level):
 MUX_VOLTAGE_THRESHOLD = 30000  # ADC threshold (1.5V)
 MUX_DEBOUNCE_SAMPLES = 5  # Number of samples for debouncing
 MUX_SETTLE_TIME = 0.001  # Seconds for mux to settle
+MUX_SAMPLE_INTERVAL = 0.001  # Seconds between AnalogIn samples (fallback path)
+
+# Bulk capture settings (analogbufio.BufferedIn, where the port supports it)
+MUX_CAPTURE_MODE = "auto"  # "auto", "buffered" or "analog"
+MUX_CAPTURE_SAMPLES = 32  # Samples captured per channel in one native call
+MUX_CAPTURE_RATE = 20000  # Hz, 32 samples = 1.6 ms per channel
+MUX_CAPTURE_BITS = 12  # Native ADC resolution of BufferedIn samples
+
+# Per-channel calibration (see mux_calibration.py, stored in microcontroller.nvm)
+MUX_CAL_NVM_OFFSET = 0  # Byte offset of the calibration record in NVM
+MUX_CAL_SAMPLES = 200  # Samples per channel for baseline and noise
+MUX_CAL_NOISE_FACTOR = 4  # Threshold sits this many noise spans below baseline
+MUX_CAL_MIN_MARGIN = 4000  # Minimum gap between baseline and threshold (~0.2V)
+MUX_CAL_MIN_BASELINE = 40000  # Below this a channel isn't a released switch
+MUX_CAL_SETTLE_BAND = 500  # Extra ADC units allowed while settling
+MUX_CAL_STABLE_READS = 3  # Consecutive in-band reads that count as settled
+MUX_CAL_SETTLE_SAFETY = 2  # Multiplier applied to the worst measured settle
+MUX_CAL_MIN_SETTLE = 0.0001  # Seconds, floor for the derived settle time
+MUX_CAL_MAX_SETTLE = 0.010  # Seconds, ceiling (diagnostics recommend 5-10 ms)
+
+# ADC trace recorder (see adc_trace.py and scripts/plot_adc_trace.py)
+ADC_TRACE_SAMPLES = 4096  # Samples per channel (8 KB per channel)
+ADC_TRACE_TRIGGER_TIMEOUT = 10.0  # Seconds to wait for a press when triggered
 
 # Accelerometer settings
 ACCEL_TILT_THRESHOLD = 5.0  # m/s² threshold for detecting tilt
@@ -108,11 +152,67 @@ ACCEL_TILT_THRESHOLD = 5.0  # m/s² threshold for detecting tilt
 # Y-axis tilt forward: Y > threshold
 # Y-axis tilt back: Y < -threshold
 
+# ADXL345 FIFO streaming (see adxl345_stream.py)
+ACCEL_USE_FIFO = True  # Buffer samples in the sensor FIFO instead of polling
+ACCEL_FIFO_WATERMARK = 16  # FIFO entries that raise the watermark interrupt
+ACCEL_DATA_RATE = 100  # Hz (6.25-3200, see adxl345_stream.DATA_RATE_CODES)
+ACCEL_RANGE_G = 2  # Full-scale range in g (2, 4, 8 or 16)
+# Seconds without a display refresh before input_task reads the FIFO itself
+# (one watermark's worth of samples, e.g. while a gesture prompt is static)
+ACCEL_SERVICE_INTERVAL = ACCEL_FIFO_WATERMARK / ACCEL_DATA_RATE
+
+# Streaming tilt classifier (see tilt_classifier.py)
+ACCEL_TILT_RELEASE_THRESHOLD = 3.5  # m/s², hysteresis: tilt ends below this
+ACCEL_TILT_DWELL_SAMPLES = 3  # Samples past threshold to confirm (rejects jolts)
+ACCEL_FILTER_SHIFT = 2  # Low-pass strength, each sample moves the filter 1/4
+
+# Encoder button settings (keypad.Keys background scanner)
+BUTTON_DEBOUNCE_INTERVAL = 0.02  # Seconds between scans, also the debounce time
+BUTTON_MAX_EVENTS = 8  # Size of the queued press/release event buffer
+
+# Encoder rotation settings (rotaryio.IncrementalEncoder, or KeypadEncoder on
+# boards without rotaryio such as the ESP32-C3)
+ENCODER_DIVISOR = 4  # Quadrature transitions per detent
+ENCODER_SCAN_INTERVAL = 0.001  # Seconds between KeypadEncoder pin scans
+ENCODER_MAX_EVENTS = 32  # KeypadEncoder edge buffer (4 edges per detent)
+
 # Frame rate
 TARGET_FPS = 20
 FRAME_DELAY = 1.0 / TARGET_FPS  # 0.05 seconds
 
+# Cooperative runtime (asyncio tasks, see game_tasks.py)
+INPUT_SCAN_INTERVAL = 0.01  # Seconds between input scans (bounds input latency)
+LED_TICK_INTERVAL = 0.02  # Seconds between LED animation steps
+EVENT_QUEUE_SIZE = 16  # Input events buffered for the game task
+LED_QUEUE_SIZE = 8  # LED commands buffered for the LED task
+
 # Debug mode
 DEBUG_SHOW_HITBOXES = False  # Set to True to see collision boxes
 DEBUG_HITBOX_SIZE = 4
 DEBUG_PRINT_INPUTS = False  # Set to True to print input events
+DEBUG_PRINT_BUS_STATS = False  # Set to True to print I2C usage after each level
+
+# Logging (binary ring buffer, see game_log.py)
+LOG_LEVEL = 20  # 10 = DEBUG, 20 = INFO, 30 = WARNING, 40 = ERROR
+LOG_CAPACITY = 256  # Records kept between flushes (12 bytes each)
+
+# Input recording and replay (see input_trace.py)
+INPUT_TRACE_MODE = None  # None, "record" or "replay"
+INPUT_TRACE_PATH = "input_trace.bin"  # Written when recording, read to replay
+INPUT_TRACE_CAPACITY = 1024  # Events kept while recording (9 bytes each)
+INPUT_TRACE_SEED = None  # Fixed random seed for recordings (None: hardware RNG)
+
+# Memory soak test (see soak.py): a bot plays unattended, heap sampled per level
+SOAK_TEST = False  # Set to True to run the soak instead of waiting for a player
+SOAK_PLAN = ("win", "lose", "lose", "lose", "win")  # Playthroughs, in order
+SOAK_SEED = 0  # Random seed, so every soak sees the same shapes and prompts
+SOAK_REACTION_TIME = 0.25  # Seconds the bot waits before tilting at a prompt
+SOAK_PRESS_INTERVAL = 0.5  # Seconds between start presses on the screens
+SOAK_LEAK_BYTES = 1024  # Free heap lost at one level across rounds = leak
+SOAK_FRAGMENT_BYTES = 2048  # Largest free block lost across rounds = fragmenting
+
+# Heap budget tracker (see heap_tracker.py)
+HEAP_TRACKING = True  # Sample free heap per phase (startup, splash, play, ...)
+HEAP_HEADROOM_WARNING = 16 * 1024  # Bytes; log a warning when free heap drops below
+HEAP_SAMPLE_INTERVAL = 4  # Rendered frames between samples within a phase
+DEBUG_PRINT_HEAP = False  # Set to True to print the per-phase report on each screen
@@ -0,0 +1,228 @@
+# game_log.py
+"""
+Leveled binary logger for the game's hot paths.
+
+print() of an f-string during a level allocates the string and can stall
+the loop for as long as USB CDC takes to drain it. log() instead packs a
+fixed-size binary record (timestamp, level, message code and three int16
+arguments) into a preallocated ring buffer, which costs the same whether
+anyone is listening or not. Records are only turned into text by flush(),
+which the game calls in idle windows (screens waiting for a button press)
+or which can be called by hand from the REPL. When the buffer is full the
+oldest records are overwritten and counted.
+
+Messages below the active level return after a single integer compare,
+and the level constants are const() so MicroPython folds them at compile
+time.
+"""
+
+import struct
+
+import supervisor
+from game_config import LOG_CAPACITY, LOG_LEVEL
+
+try:
+    from micropython import const
+except ImportError:
+
+    def const(value):
+        return value
+
+
+# Levels
+DEBUG = const(10)
+INFO = const(20)
+WARNING = const(30)
+ERROR = const(40)
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN", ERROR: "ERROR"}
+
+# Message codes
+SPAWN = const(1)
+HIT = const(2)
+WRONG_BUTTON = const(3)
+MISS = const(4)
+SHAPE_DONE = const(5)
+GESTURE_PROMPT = const(6)
+GESTURE_OK = const(7)
+GESTURE_TIMEOUT = const(8)
+GESTURE_WRONG = const(9)
+SCORE = const(10)
+HEAP_LOW = const(11)
+
+# Text for each code, filled in at flush time. {a}, {b}, {c} are the int
+# arguments; {da}, {db} name a direction index (see DIRECTIONS) and {pa}
+# a heap tracker phase (see PHASES).
+MESSAGES = {
+    SPAWN: "Spawned shape targeting piece {a} from {db}",
+    HIT: "HIT! Button {a}, Distance: {b}px, Score: {c:+d}",
+    WRONG_BUTTON: "Wrong button! Pressed {a}, needed {b}, Score: {c:+d}",
+    MISS: "Missed shape! Health: {a}",
+    SHAPE_DONE: "Shape {a}/{b} complete",
+    GESTURE_PROMPT: "Gesture prompt: Tilt {da} within {b} ms",
+    GESTURE_OK: "Gesture SUCCESS! +{a} points, gestures {b}/{c}",
+    GESTURE_TIMEOUT: "Gesture TIMEOUT! Lost {a} health, Health: {b}",
+    GESTURE_WRONG: "Gesture WRONG! Tilted {da}, needed {db}, Health: {c}",
+    SCORE: "Total score: {a}",
+    HEAP_LOW: "Heap low in {pa}: {b} KB free (warning below {c} KB)",
+}
+
+# Same order as event_queue.TILT_DIRECTIONS
+DIRECTIONS = ("up", "down", "left", "right")
+
+# Same order as the phase constants in heap_tracker.py
+PHASES = ("startup", "splash", "countdown", "play", "gesture", "results")
+
+# timestamp_ms, level, code, a, b, c
+RECORD_FORMAT = "<IBBhhh"
+RECORD_SIZE = struct.calcsize(RECORD_FORMAT)
+
+_buffer = bytearray(LOG_CAPACITY * RECORD_SIZE)
+_head = 0  # Index of the oldest record
+_count = 0
+_dropped = 0
+_level = LOG_LEVEL
+
+
+def set_level(level):
+    """
+    Change the minimum level that gets recorded.
+
+    Parameters
+    ----------
+    level : int
+        DEBUG, INFO, WARNING or ERROR.
+    """
+    global _level
+    _level = level
+
+
+def enabled(level):
+    """
+    Check whether a level is recorded, to skip computing costly arguments.
+
+    Parameters
+    ----------
+    level : int
+        DEBUG, INFO, WARNING or ERROR.
+
+    Returns
+    -------
+    bool
+        True if log() at this level would record.
+    """
+    return level >= _level
+
+
+def log(level, code, a=0, b=0, c=0):
+    """
+    Record one message. Never allocates or blocks.
+
+    Parameters
+    ----------
+    level : int
+        DEBUG, INFO, WARNING or ERROR.
+    code : int
+        Message code (key of MESSAGES).
+    a, b, c : int
+        Message arguments (-32768 to 32767).
+    """
+    global _head, _count, _dropped
+    if level < _level:
+        return
+
+    if _count == LOG_CAPACITY:
+        _head = (_head + 1) % LOG_CAPACITY
+        _count -= 1
+        _dropped += 1
+
+    index = (_head + _count) % LOG_CAPACITY
+    struct.pack_into(
+        RECORD_FORMAT,
+        _buffer,
+        index * RECORD_SIZE,
+        supervisor.ticks_ms(),
+        level,
+        code,
+        a,
+        b,
+        c,
+    )
+    _count += 1
+
+
+def format_record(timestamp_ms, level, code, a, b, c):
+    """
+    Turn one record into a line of text.
+
+    Returns
+    -------
+    str
+        "[timestamp LEVEL] message".
+    """
+    message = MESSAGES.get(code, "code {code}: {a} {b} {c}")
+    text = message.format(
+        code=code,
+        a=a,
+        b=b,
+        c=c,
+        da=DIRECTIONS[a] if 0 <= a < len(DIRECTIONS) else a,
+        db=DIRECTIONS[b] if 0 <= b < len(DIRECTIONS) else b,
+        pa=PHASES[a] if 0 <= a < len(PHASES) else a,
+    )
+    return f"[{timestamp_ms:>9d} {LEVEL_NAMES.get(level, level)}] {text}"
+
+
+def flush(max_records=None):
+    """
+    Print and remove buffered records, oldest first.
+
+    Call this when nothing time-critical is running.
+
+    Parameters
+    ----------
+    max_records : int or None
+        Stop after this many records (None prints everything).
+
+    Returns
+    -------
+    int
+        Number of records printed.
+    """
+    global _head, _count, _dropped
+    if _dropped:
+        print(f"[log] {_dropped} records overwritten")
+        _dropped = 0
+
+    printed = 0
+    while _count and (max_records is None or printed < max_records):
+        record = struct.unpack_from(RECORD_FORMAT, _buffer, _head * RECORD_SIZE)
+        _head = (_head + 1) % LOG_CAPACITY
+        _count -= 1
+        print(format_record(*record))
+        printed += 1
+    return printed
+
+
+def dump():
+    """
+    Copy the buffered records out as raw binary, oldest first.
+
+    Returns
+    -------
+    bytes
+        Concatenated RECORD_FORMAT records (buffer left unchanged).
+    """
+    start = _head * RECORD_SIZE
+    end = start + _count * RECORD_SIZE
+    if end <= len(_buffer):
+        return bytes(_buffer[start:end])
+    return bytes(_buffer[start:]) + bytes(_buffer[: end - len(_buffer)])
+
+
+def clear():
+    """Discard every buffered record."""
+    global _head, _count, _dropped
+    _head = 0
+    _count = 0
+    _dropped = 0
@@ -6,9 +6,20 @@ import gc
 import random
 import time
 
+import heap_tracker
 from arrow_sprites import ARROWS
+from event_queue import (
+    EVENT_ROTATE,
+    EVENT_SWITCH,
+    EVENT_TILT,
+    LED_BRIGHTNESS,
+    LED_HEALTH,
+    LED_VICTORY,
+    TILT_DIRECTIONS,
+)
 from game_config import (
     DEBUG_HITBOX_SIZE,
+    DEBUG_PRINT_BUS_STATS,
     DEBUG_SHOW_HITBOXES,
     DISPLAY_CENTER,
     FRAME_DELAY,
@@ -23,6 +34,21 @@ from game_config import (
     SHAPE_SPAWN_DELAY,
     get_gesture_time,
 )
+from game_log import (
+    DEBUG,
+    GESTURE_OK,
+    GESTURE_PROMPT,
+    GESTURE_TIMEOUT,
+    GESTURE_WRONG,
+    HIT,
+    INFO,
+    MISS,
+    SCORE,
+    SHAPE_DONE,
+    SPAWN,
+    WRONG_BUTTON,
+    log,
+)
 from game_objects import SlidingShape, calculate_collision_centers, determine_spawn_side
 from game_over_screen import (
     show_countdown,
@@ -40,20 +66,18 @@ from helpers_esp32c3 import (
 from splash_frames import SPLASH_FRAMES
 
 
-def run_game(display, bitmap, inputs, neopixels):
+async def run_game(ctx, starting_level=1):
     """
-    Main game loop.
+    Main game loop (the game task of game_tasks.run_tasks).
 
     Parameters
     ----------
-    display : adafruit_displayio_ssd1306.SSD1306
-        The display object.
-    bitmap : displayio.Bitmap
-        The bitmap to draw on.
-    inputs : dict
-        Dictionary with keys: 'mux', 'accel', 'button' for input handlers.
-    neopixels : NeoPixelManager
-        NeoPixel manager for health display.
+    ctx : GameContext
+        Shared display, inputs and queues. Inputs arrive as events on
+        ctx.events; LED changes are sent as commands on ctx.leds.
+    starting_level : int
+        Level to start the first game at (default 1). Restarts after game
+        over or victory always begin at level 1.
     """
     print("\n=== Starting Dancie ===")
 
@@ -84,12 +108,11 @@ def run_game(display, bitmap, inputs, neopixels):
 """)
 
     # Initialize game state
-    game_state = GameState(starting_level=1)
+    game_state = GameState(starting_level=starting_level)
+    ctx.game_state = game_state
 
-    # Extract input handlers
-    mux = inputs["mux"]
-    accel = inputs["accel"]
-    button = inputs["button"]
+    bus = ctx.bus
+    leds = ctx.leds
 
     # Main game loop - runs until player quits
     while True:
@@ -100,62 +123,60 @@ def run_game(display, bitmap, inputs, neopixels):
         print(f"Shape speed: {game_state.current_speed:.2f} px/frame")
 
         # Show countdown before level starts
-        show_countdown(display, bitmap, count_from=3)
+        await show_countdown(ctx, count_from=3)
 
         # Reset health LEDs for new level
-        neopixels.set_health(game_state.health)
+        leds.put(LED_HEALTH, game_state.health)
 
         # Level loop - run shapes and gestures
-        run_level(
-            display,
-            bitmap,
+        await run_level(
+            ctx,
             game_state,
-            inputs,
-            neopixels,
             static_kaleidoscope,
             piece_bitmap,
             collision_centers,
         )
 
+        if DEBUG_PRINT_BUS_STATS:
+            bus.print_report()
+            bus.reset_stats()
+
         # Check if game over
         if game_state.is_game_over:
             # Show game over screen
-            show_game_over_screen(display, bitmap, button)
+            await show_game_over_screen(ctx)
 
             # Reset game state
             game_state.reset_game()
-            neopixels.set_health(game_state.health)
+            leds.put(LED_HEALTH, game_state.health)
             continue
 
         # Check if level complete
         if game_state.level_complete:
-            # Play victory animation on LEDs
-            neopixels.victory_animation(duration=2.0)
+            # Victory animation runs on the LEDs while the next screen shows
+            leds.put(LED_VICTORY, 2000)
 
             # Check if all levels complete
             if game_state.level >= NUM_LEVELS:
                 # Show final victory screen
-                show_victory_screen(display, bitmap, button, game_state.score)
+                await show_victory_screen(ctx, game_state.score)
 
                 # Reset to level 1
                 game_state.reset_game()
-                neopixels.set_health(game_state.health)
+                leds.put(LED_HEALTH, game_state.health)
             else:
                 # Show level complete screen
-                show_level_complete_screen(
-                    display, bitmap, button, game_state.level, game_state.score
+                await show_level_complete_screen(
+                    ctx, game_state.level, game_state.score
                 )
 
                 # Advance to next level
                 game_state.advance_level()
 
 
-def run_level(
-    display,
-    bitmap,
+async def run_level(
+    ctx,
     game_state,
-    inputs,
-    neopixels,
     static_kaleidoscope,
     piece_bitmap,
     collision_centers,
@@ -165,16 +186,10 @@ def run_level(
 
     Parameters
     ----------
-    display : adafruit_displayio_ssd1306.SSD1306
-        Display object.
-    bitmap : displayio.Bitmap
-        Bitmap to draw on.
+    ctx : GameContext
+        Shared display, inputs and queues.
     game_state : GameState
         Current game state.
-    inputs : dict
-        Input handlers.
-    neopixels : NeoPixelManager
-        NeoPixel manager.
     static_kaleidoscope : np.ndarray
         Background kaleidoscope bitmap.
     piece_bitmap : np.ndarray
@@ -182,15 +197,20 @@ def run_level(
     collision_centers : list
         List of target centers for each map piece.
     """
-    mux = inputs["mux"]
-    accel = inputs["accel"]
-    button = inputs["button"]
+    heap_tracker.enter(heap_tracker.PLAY)
+    bitmap = ctx.bitmap
+    events = ctx.events
+    leds = ctx.leds
+    hud = ctx.hud
+    hud.visible = True
+    feedback = ctx.feedback
 
     # Active sliding shape
     current_shape = None
     shape_spawn_timer = 0
 
-    # Game loop timing
+    # Game loop timing (fixed steps while inputs are recorded or replayed)
+    fixed_step = ctx.fixed_step
     last_frame_time = time.monotonic()
 
     # Level runs until complete or game over
@@ -198,6 +218,8 @@ def run_level(
         current_time = time.monotonic()
         delta_time = current_time - last_frame_time
         last_frame_time = current_time
+        if fixed_step:
+            delta_time = FRAME_DELAY  # One frame of game time per tick
 
         # Check if it's time to show gesture or spawn shape
         if current_shape is None:
@@ -209,24 +231,28 @@ def run_level(
                 # Decide: gesture or shape?
                 if game_state.should_show_gesture():
                     # Show gesture prompt
-                    run_gesture_prompt(
-                        display,
-                        bitmap,
-                        game_state,
-                        accel,
-                        neopixels,
-                        static_kaleidoscope,
-                    )
+                    await run_gesture_prompt(ctx, game_state, static_kaleidoscope)
                 else:
                     # Spawn new shape (if we still need shapes)
                     if game_state.shapes_completed < game_state.shapes_required:
                         current_shape = spawn_random_shape(
                             piece_bitmap, collision_centers, game_state.current_speed
                         )
+                        ctx.shape = current_shape
+
+        # Handle queued inputs (only the first switch press counts per frame)
+        button_pressed = None
+        while len(events):
+            kind = events.pop()
+            if kind == EVENT_SWITCH:
+                if button_pressed is None:
+                    button_pressed = events.value
+            elif kind == EVENT_ROTATE:
+                # Live tuning: encoder rotation adjusts LED brightness
+                leds.put(LED_BRIGHTNESS, events.value)
 
         # Update and render current shape
         if current_shape is not None:
-            display.auto_refresh = False
             clear_displayio_bitmap(bitmap)
 
             # Draw background kaleidoscope
@@ -255,37 +281,55 @@ def run_level(
                 )
 
             # Check for button press
-            pressed_buttons = mux.get_pressed_buttons()
-            if pressed_buttons:
-                button_pressed = pressed_buttons[0]  # Take first button
+            if button_pressed is not None:
                 handle_button_press(
-                    button_pressed, current_shape, game_state, neopixels
+                    button_pressed, current_shape, game_state, feedback
                 )
 
             # Check if shape passed target without being hit
             if current_shape.has_passed_target() and not current_shape.was_hit:
                 current_shape.mark_as_missed()
                 game_state.lose_health(1)
-                neopixels.set_health(game_state.health)
-                print(f"Missed shape! Health: {game_state.health}")
+                feedback.damage()
+                leds.put(LED_HEALTH, game_state.health)
+                log(INFO, MISS, game_state.health)
 
             # Remove shape if inactive
             if not current_shape.active:
                 game_state.complete_shape()
-                print(
-                    f"Shape {game_state.shapes_completed}/{game_state.shapes_required} complete"
+                log(
+                    DEBUG,
+                    SHAPE_DONE,
+                    game_state.shapes_completed,
+                    game_state.shapes_required,
                 )
                 current_shape = None
+                ctx.shape = None
 
-            display.refresh()
+            # Hand the frame to the render task
+            hud.update(game_state.level, game_state.score, game_state.health)
+            feedback.tick()
+            ctx.request_frame()
+        else:
+            # Between shapes only refresh if the HUD or an effect changed
+            hud_changed = hud.update(
+                game_state.level, game_state.score, game_state.health
+            )
+            if feedback.tick() or hud_changed:
+                ctx.request_frame()
 
-        # Frame rate control
-        time.sleep(FRAME_DELAY)
+        # Frame rate control (input, render and LED tasks run meanwhile)
+        await ctx.sleep()
 
         # Garbage collection
         if game_state.shapes_completed % 10 == 0:
             gc.collect()
 
+    # End-of-level screens are drawn without the HUD or effects
+    ctx.shape = None
+    hud.visible = False
+    feedback.reset()
+
 
 def spawn_random_shape(piece_bitmap, collision_centers, speed):
     """
@@ -321,11 +365,11 @@ def spawn_random_shape(piece_bitmap, collision_centers, speed):
         target_index=target_index,
     )
 
-    print(f"Spawned shape targeting piece {target_index + 1} from {spawn_side}")
+    log(DEBUG, SPAWN, target_index + 1, TILT_DIRECTIONS.index(spawn_side))
     return shape
 
 
-def handle_button_press(button_number, current_shape, game_state, neopixels):
+def handle_button_press(button_number, current_shape, game_state, feedback):
     """
     Handle button press during shape movement.
 
@@ -337,8 +381,8 @@ def handle_button_press(button_number, current_shape, game_state, neopixels):
         Current active shape.
     game_state : GameState
         Game state.
-    neopixels : NeoPixelManager
-        NeoPixel manager.
+    feedback : FeedbackEffects
+        Screen effects for the judgement.
     """
     # Check if correct button
     if button_number == current_shape.button_number:
@@ -348,39 +392,39 @@ def handle_button_press(button_number, current_shape, game_state, neopixels):
 
         game_state.add_score(score)
         current_shape.mark_as_hit(score)
+        feedback.hit()
 
-        print(f"HIT! Button {button_number}, Distance: {distance}px, Score: {score:+d}")
-        print(f"Total score: {game_state.score}")
+        log(INFO, HIT, button_number, distance, score)
+        log(INFO, SCORE, game_state.score)
     else:
         # Wrong button pressed
         game_state.add_score(SCORE_WRONG_BUTTON)
-        print(
-            f"Wrong button! Pressed {button_number}, needed {current_shape.button_number}"
+        feedback.miss()
+        log(
+            INFO,
+            WRONG_BUTTON,
+            button_number,
+            current_shape.button_number,
+            SCORE_WRONG_BUTTON,
         )
-        print(f"Score: {SCORE_WRONG_BUTTON:+d}, Total: {game_state.score}")
+        log(INFO, SCORE, game_state.score)
 
 
-def run_gesture_prompt(
-    display, bitmap, game_state, accel, neopixels, static_kaleidoscope
-):
+async def run_gesture_prompt(ctx, game_state, static_kaleidoscope):
     """
     Show gesture prompt and wait for user to tilt accelerometer.
 
     Parameters
     ----------
-    display : adafruit_displayio_ssd1306.SSD1306
-        Display object.
-    bitmap : displayio.Bitmap
-        Bitmap to draw on.
+    ctx : GameContext
+        Shared display, inputs and queues.
     game_state : GameState
         Game state.
-    accel : AccelerometerInput
-        Accelerometer input handler.
-    neopixels : NeoPixelManager
-        NeoPixel manager.
     static_kaleidoscope : np.ndarray
         Background kaleidoscope.
     """
+    heap_tracker.enter(heap_tracker.GESTURE)
+
     # Choose random direction
     directions = ["up", "down", "left", "right"]
     required_direction = random.choice(directions)
@@ -391,12 +435,15 @@ def run_gesture_prompt(
     # Calculate gesture timeout for this level
     gesture_timeout = get_gesture_time(game_state.level)
 
-    print(
-        f"Gesture prompt: Tilt {required_direction.upper()} within {gesture_timeout:.1f}s"
+    log(
+        INFO,
+        GESTURE_PROMPT,
+        TILT_DIRECTIONS.index(required_direction),
+        int(gesture_timeout * 1000),
     )
 
     # Show arrow on screen
-    display.auto_refresh = False
+    bitmap = ctx.bitmap
     clear_displayio_bitmap(bitmap)
 
     # Draw background
@@ -405,38 +452,54 @@ def run_gesture_prompt(
     # Draw arrow in center
     draw_numpy_to_displayio_bitmap(arrow_bitmap, bitmap, origin=DISPLAY_CENTER)
 
-    display.refresh()
+    ctx.request_frame()
+
+    # Tilts from before the prompt don't count
+    ctx.inputs["accel"].reset()
+    ctx.events.clear()
 
     # Wait for tilt
-    detected_direction = accel.wait_for_tilt(timeout=gesture_timeout)
+    detected_direction = None
+    ctx.gesture = TILT_DIRECTIONS.index(required_direction)
+    if await ctx.wait_for_event(EVENT_TILT, timeout=gesture_timeout):
+        detected_direction = TILT_DIRECTIONS[ctx.events.value]
+    ctx.gesture = None
 
     # Check result
     if detected_direction == required_direction:
         # Correct!
         game_state.add_score(SCORE_GESTURE)
+        ctx.feedback.hit()
         game_state.complete_gesture()
-        print(f"Gesture SUCCESS! +{SCORE_GESTURE} points")
-        print(
-            f"Gestures: {game_state.gestures_completed}/{game_state.gestures_required}"
+        log(
+            INFO,
+            GESTURE_OK,
+            SCORE_GESTURE,
+            game_state.gestures_completed,
+            game_state.gestures_required,
         )
     else:
         # Wrong or timeout
         game_state.lose_health(GESTURE_PENALTY_HEALTH)
+        ctx.feedback.damage()
         game_state.complete_gesture()  # Still counts as completed (just with penalty)
-        neopixels.set_health(game_state.health)
+        ctx.leds.put(LED_HEALTH, game_state.health)
 
         if detected_direction is None:
-            print(f"Gesture TIMEOUT! Lost {GESTURE_PENALTY_HEALTH} health")
+            log(INFO, GESTURE_TIMEOUT, GESTURE_PENALTY_HEALTH, game_state.health)
         else:
-            print(
-                f"Gesture WRONG! Tilted {detected_direction}, needed {required_direction}"
+            log(
+                INFO,
+                GESTURE_WRONG,
+                TILT_DIRECTIONS.index(detected_direction),
+                TILT_DIRECTIONS.index(required_direction),
+                game_state.health,
             )
-            print(f"Lost {GESTURE_PENALTY_HEALTH} health")
 
-        print(f"Health: {game_state.health}")
-        print(
-            f"Gestures: {game_state.gestures_completed}/{game_state.gestures_required}"
-        )
+    # Brief pause before continuing, playing the judgement effect
+    for _ in range(int(0.5 / FRAME_DELAY)):
+        if ctx.feedback.tick():
+            ctx.request_frame()
+        await ctx.sleep()
 
-    # Brief pause before continuing
-    time.sleep(0.5)
+    heap_tracker.enter(heap_tracker.PLAY)
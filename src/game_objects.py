@@ -32,6 +32,7 @@ class SlidingShape:
         self.bitmap = shape_bitmap
         self.target_x, self.target_y = target_center
         self.speed = speed
+        self.start_side = start_side
         self.active = True
         self.target_index = target_index  # Which map piece (0-7)
         self.button_number = target_index + 1  # Corresponding button (1-8)
@@ -56,15 +57,16 @@ class SlidingShape:
         if not self.active:
             return
 
-        # Move toward target
-        if self.x < self.target_x:
-            self.x += self.speed
-            if self.x > self.target_x:
-                self.x = self.target_x
-        elif self.x > self.target_x:
-            self.x -= self.speed
-            if self.x < self.target_x:
-                self.x = self.target_x
+        # Move away from the start side, through the target and past it, so
+        # an unhit shape ends up missed (see has_passed_target)
+        direction = 1 if self.start_side == "left" else -1
+        was_before_target = (self.x - self.target_x) * direction < 0
+        self.x += direction * self.speed
+
+        # Stop on the target for the frame it is crossed, so a perfect hit is
+        # possible at any speed
+        if was_before_target and (self.x - self.target_x) * direction > 0:
+            self.x = self.target_x
 
     def is_at_target(self, tolerance=5):
         """
@@ -127,7 +129,7 @@ class SlidingShape:
             True if shape passed target without being hit.
         """
         # Shape has passed if it's on opposite side of target from start
-        if self.speed > 0:  # Moving right
+        if self.start_side == "left":  # Moving right
             return self.x > self.target_x + 10
         else:  # Moving left
             return self.x < self.target_x - 10
@@ -1,13 +1,26 @@
 # This file was made with the use of various A.I. LLMs, specifically, Claude sonnet 4.5
 # game_over_screen.py
-"""Game over and level complete screen displays."""
+"""
+Game over, level complete, victory and countdown screens.
 
-import time
+Building an adafruit_display_text Label lays out every glyph and allocates,
+so TextScreens builds every screen and countdown digit once at startup as a
+hidden displayio Group. Showing a screen just flips `hidden`; only the level
+and score labels change text, and only when their value changed.
+"""
 
 import displayio
+import game_log
+import heap_tracker
 import terminalio
 from adafruit_display_text import label
-from game_config import DISPLAY_CENTER, DISPLAY_HEIGHT, DISPLAY_WIDTH, FRAME_DELAY
+from event_queue import EVENT_BUTTON
+from game_config import (
+    DEBUG_PRINT_HEAP,
+    DISPLAY_CENTER,
+    DISPLAY_HEIGHT,
+    DISPLAY_WIDTH,
+)
 from helpers_esp32c3 import clear_displayio_bitmap
 
 
@@ -42,18 +55,124 @@ def create_text_label(text, x, y, color=0xFFFFFF):
     return text_label
 
 
-def show_game_over_screen(display, bitmap, button):
+def set_centered_text(text_label, text, x):
+    """
+    Change a label's text, re-centering it, only if the text changed.
+
+    Parameters
+    ----------
+    text_label : label.Label
+        Label created by create_text_label().
+    text : str
+        New text.
+    x : int
+        X position to center on.
+    """
+    if text_label.text == text:
+        return
+    text_label.text = text
+    text_label.x = x - (text_label.bounding_box[2] // 2)
+
+
+def _build_group(root_group, *labels):
+    """Put labels in a hidden group on top of root_group and return it."""
+    group = displayio.Group()
+    for text_label in labels:
+        group.append(text_label)
+    group.hidden = True
+    root_group.append(group)
+    return group
+
+
+class TextScreens:
+    """
+    Prebuilt text screens, shown and hidden instead of rebuilt.
+
+    Parameters
+    ----------
+    root_group : displayio.Group
+        The display's root group; every screen is appended to it hidden.
+    countdown_from : int
+        Highest countdown digit to prebuild (default 3).
+    """
+
+    def __init__(self, root_group, countdown_from=3):
+        center_x = DISPLAY_WIDTH // 2
+        center_y = DISPLAY_HEIGHT // 2
+
+        self.game_over = _build_group(
+            root_group,
+            create_text_label("GAME OVER", center_x, 20),
+            create_text_label("Press Start", center_x, 45),
+        )
+
+        self.level_title = create_text_label("Level 1", center_x, 15)
+        self.level_score = create_text_label("Score: 0", center_x, 41)
+        self.level_complete = _build_group(
+            root_group,
+            self.level_title,
+            create_text_label("Complete!", center_x, 28),
+            self.level_score,
+            create_text_label("Press Start", center_x, 54),
+        )
+
+        self.victory_score = create_text_label("Score: 0", center_x, 50)
+        self.victory_text = _build_group(
+            root_group,
+            create_text_label("VICTORY!", center_x, 15),
+            create_text_label("All Levels", center_x, 28),
+            create_text_label("Complete!", center_x, 38),
+            self.victory_score,
+        )
+        self.victory_prompt = _build_group(
+            root_group, create_text_label("Press Start", center_x, 60)
+        )
+
+        # countdown[i] shows digit i; countdown[0] shows "GO!"
+        self.countdown = []
+        for i in range(countdown_from + 1):
+            text = str(i) if i else "GO!"
+            self.countdown.append(
+                _build_group(root_group, create_text_label(text, center_x, center_y))
+            )
+
+    def set_level(self, level, score):
+        """Update the level complete screen's level and score."""
+        set_centered_text(self.level_title, f"Level {level}", DISPLAY_WIDTH // 2)
+        set_centered_text(self.level_score, f"Score: {score}", DISPLAY_WIDTH // 2)
+
+    def set_victory_score(self, score):
+        """Update the victory screen's final score."""
+        set_centered_text(self.victory_score, f"Score: {score}", DISPLAY_WIDTH // 2)
+
+
+async def wait_for_start(ctx):
+    """
+    Wait for a fresh encoder button press.
+
+    Parameters
+    ----------
+    ctx : GameContext
+        Shared game context (see game_tasks.py).
+    """
+    # Nothing time-critical runs while we wait: write out the log
+    game_log.flush()
+    if DEBUG_PRINT_HEAP:
+        heap_tracker.report()
+
+    # Ignore inputs queued before the screen appeared
+    ctx.events.clear()
+    await ctx.wait_for_event(EVENT_BUTTON)
+
+
+async def show_game_over_screen(ctx):
     """
     Display game over screen with "GAME OVER" and "Press Start".
 
     Parameters
     ----------
-    display : adafruit_displayio_ssd1306.SSD1306
-        The display object.
-    bitmap : displayio.Bitmap
-        The bitmap to draw on.
-    button : RotaryEncoderButton
-        Button to wait for restart.
+    ctx : GameContext
+        Shared game context (display, bitmap, screens and input events).
 
     Returns
     -------
@@ -61,48 +180,30 @@ def show_game_over_screen(display, bitmap, button):
         True if user wants to restart.
     """
     print("\n=== GAME OVER ===")
+    heap_tracker.enter(heap_tracker.RESULTS)
 
-    # Create a new group for text
-    text_group = displayio.Group()
-
-    # Create text labels
-    title_label = create_text_label("GAME OVER", DISPLAY_WIDTH // 2, 20)
-    prompt_label = create_text_label("Press Start", DISPLAY_WIDTH // 2, 45)
+    screen = ctx.screens.game_over
 
-    text_group.append(title_label)
-    text_group.append(prompt_label)
-
-    # Clear bitmap and add text group
-    display.auto_refresh = False
-    clear_displayio_bitmap(bitmap)
-
-    # Get the main root group and append text
-    root_group = display.root_group
-    root_group.append(text_group)
-
-    display.refresh()
+    # Clear bitmap and show the prebuilt text
+    clear_displayio_bitmap(ctx.bitmap)
+    screen.hidden = False
+    ctx.request_frame()
 
     # Wait for button press
-    button.wait_for_press()
-
-    # Clean up text group
-    root_group.remove(text_group)
+    await wait_for_start(ctx)
 
+    screen.hidden = True
     return True
 
 
-def show_level_complete_screen(display, bitmap, button, level, score):
+async def show_level_complete_screen(ctx, level, score):
     """
     Display level complete screen with stats.
 
     Parameters
     ----------
-    display : adafruit_displayio_ssd1306.SSD1306
-        The display object.
-    bitmap : displayio.Bitmap
-        The bitmap to draw on.
-    button : RotaryEncoderButton
-        Button to continue.
+    ctx : GameContext
+        Shared game context (display, bitmap, screens and input events).
     level : int
         Level just completed.
     score : int
@@ -115,51 +216,31 @@ def show_level_complete_screen(display, bitmap, button, level, score):
     """
     print(f"\n=== LEVEL {level} COMPLETE ===")
     print(f"Score: {score}")
+    heap_tracker.enter(heap_tracker.RESULTS)
 
-    # Create text group
-    text_group = displayio.Group()
-
-    # Create labels
-    title_label = create_text_label(f"Level {level}", DISPLAY_WIDTH // 2, 15)
-    complete_label = create_text_label("Complete!", DISPLAY_WIDTH // 2, 28)
-    score_label = create_text_label(f"Score: {score}", DISPLAY_WIDTH // 2, 41)
-    prompt_label = create_text_label("Press Start", DISPLAY_WIDTH // 2, 54)
-
-    text_group.append(title_label)
-    text_group.append(complete_label)
-    text_group.append(score_label)
-    text_group.append(prompt_label)
+    screens = ctx.screens
+    screens.set_level(level, score)
 
     # Display
-    display.auto_refresh = False
-    clear_displayio_bitmap(bitmap)
-
-    root_group = display.root_group
-    root_group.append(text_group)
-
-    display.refresh()
+    clear_displayio_bitmap(ctx.bitmap)
+    screens.level_complete.hidden = False
+    ctx.request_frame()
 
     # Wait for button press
-    button.wait_for_press()
-
-    # Clean up
-    root_group.remove(text_group)
+    await wait_for_start(ctx)
 
+    screens.level_complete.hidden = True
     return True
 
 
-def show_victory_screen(display, bitmap, button, score):
+async def show_victory_screen(ctx, score):
     """
     Display victory screen after beating all 10 levels.
 
     Parameters
     ----------
-    display : adafruit_displayio_ssd1306.SSD1306
-        The display object.
-    bitmap : displayio.Bitmap
-        The bitmap to draw on.
-    button : RotaryEncoderButton
-        Button to continue.
+    ctx : GameContext
+        Shared game context (display, bitmap, screens and input events).
     score : int
         Final score.
 
@@ -170,96 +251,58 @@ def show_victory_screen(display, bitmap, button, score):
     """
     print("\n=== VICTORY! ALL LEVELS COMPLETE ===")
     print(f"Final Score: {score}")
+    heap_tracker.enter(heap_tracker.RESULTS)
 
-    # Create text group
-    text_group = displayio.Group()
-
-    # Create labels
-    title_label = create_text_label("VICTORY!", DISPLAY_WIDTH // 2, 15)
-    all_levels_label = create_text_label("All Levels", DISPLAY_WIDTH // 2, 28)
-    complete_label = create_text_label("Complete!", DISPLAY_WIDTH // 2, 38)
-    score_label = create_text_label(f"Score: {score}", DISPLAY_WIDTH // 2, 50)
-
-    text_group.append(title_label)
-    text_group.append(all_levels_label)
-    text_group.append(complete_label)
-    text_group.append(score_label)
+    screens = ctx.screens
+    screens.set_victory_score(score)
+    text_group = screens.victory_text
 
     # Display
-    display.auto_refresh = False
-    clear_displayio_bitmap(bitmap)
-
-    root_group = display.root_group
-    root_group.append(text_group)
-
-    display.refresh()
+    clear_displayio_bitmap(ctx.bitmap)
+    text_group.hidden = False
+    ctx.request_frame()
 
     # Flash the text for celebration effect
     for _ in range(3):
-        time.sleep(0.3)
-        for text_label in text_group:
-            text_label.color = 0x000000  # Black (invisible)
-        display.refresh()
+        await ctx.sleep(0.3)
+        text_group.hidden = True
+        ctx.request_frame()
 
-        time.sleep(0.3)
-        for text_label in text_group:
-            text_label.color = 0xFFFFFF  # White (visible)
-        display.refresh()
+        await ctx.sleep(0.3)
+        text_group.hidden = False
+        ctx.request_frame()
 
     # Add "Press Start" after celebration
-    prompt_label = create_text_label("Press Start", DISPLAY_WIDTH // 2, 60)
-    text_group.append(prompt_label)
-    display.refresh()
+    screens.victory_prompt.hidden = False
+    ctx.request_frame()
 
     # Wait for button press
-    button.wait_for_press()
-
-    # Clean up
-    root_group.remove(text_group)
+    await wait_for_start(ctx)
 
+    text_group.hidden = True
+    screens.victory_prompt.hidden = True
     return True
 
 
-def show_countdown(display, bitmap, count_from=3):
+async def show_countdown(ctx, count_from=3):
     """
     Show a countdown animation before starting level.
 
     Parameters
     ----------
-    display : adafruit_displayio_ssd1306.SSD1306
-        The display object.
-    bitmap : displayio.Bitmap
-        The bitmap to draw on.
+    ctx : GameContext
+        Shared game context (display, bitmap and screens).
     count_from : int
-        Number to count down from (default 3).
+        Number to count down from (default 3, at most the number of digits
+        prebuilt by TextScreens).
     """
-    root_group = display.root_group
-    display.auto_refresh = False
-
-    for i in range(count_from, 0, -1):
-        clear_displayio_bitmap(bitmap)
-
-        # Create countdown number
-        text_group = displayio.Group()
-        countdown_label = create_text_label(
-            str(i), DISPLAY_WIDTH // 2, DISPLAY_HEIGHT // 2
-        )
-        text_group.append(countdown_label)
-
-        root_group.append(text_group)
-        display.refresh()
-        time.sleep(0.5)
-
-        root_group.remove(text_group)
-
-    # Show "GO!"
-    clear_displayio_bitmap(bitmap)
-    text_group = displayio.Group()
-    go_label = create_text_label("GO!", DISPLAY_WIDTH // 2, DISPLAY_HEIGHT // 2)
-    text_group.append(go_label)
-
-    root_group.append(text_group)
-    display.refresh()
-    time.sleep(0.5)
-
-    root_group.remove(text_group)
+    heap_tracker.enter(heap_tracker.COUNTDOWN)
+    countdown = ctx.screens.countdown
+    clear_displayio_bitmap(ctx.bitmap)
+
+    # Digits, then "GO!" (index 0)
+    for i in range(count_from, -1, -1):
+        countdown[i].hidden = False
+        ctx.request_frame()
+        await ctx.sleep(0.5)
+        countdown[i].hidden = True
@@ -0,0 +1,307 @@
+# game_tasks.py
+"""
+Cooperative asyncio runtime for Dancie.
+
+The game runs as four tasks sharing one GameContext:
+
+- input_task scans the switches and encoder every INPUT_SCAN_INTERVAL,
+  picks up the tilt the accelerometer reported after the last display
+  refresh (reading the sensor itself when no refresh has for
+  ACCEL_SERVICE_INTERVAL), and puts timestamped events on ctx.events.
+- render_task refreshes the display whenever the game asks for a frame.
+- led_task applies LED commands from ctx.leds and ticks LED animations.
+- the game task (splash screen, then game_loop.run_game) draws frames,
+  reacts to events and sends LED commands.
+
+The game task also counts its own clock: ctx.ticks counts FRAME_DELAY
+steps, and every pause or wait in the game goes through ctx.sleep() and
+ctx.wait_for_event(), which advance it. In normal play, spawn and gesture
+timing follow the wall clock, so a slow frame doesn't slow the game down.
+While inputs are recorded or replayed (ctx.fixed_step, see input_trace.py),
+they run on ticks instead, so a session replays against the same game
+state however long the frames took to draw.
+
+Because the tasks only switch at `await`, none of them can interrupt a
+display refresh, so accelerometer reads still only happen between frame
+transfers (see i2c_bus.py). Inputs keep being scanned while any screen is
+up, so input latency is bounded by the scan interval everywhere, not just
+during a level.
+"""
+
+import time
+
+import asyncio
+import heap_tracker
+from event_queue import (
+    EVENT_BUTTON,
+    EVENT_ROTATE,
+    EVENT_SWITCH,
+    EVENT_TILT,
+    LED_BRIGHTNESS,
+    LED_HEALTH,
+    LED_VICTORY,
+    TILT_DIRECTIONS,
+    EventQueue,
+)
+from game_config import (
+    ACCEL_SERVICE_INTERVAL,
+    EVENT_QUEUE_SIZE,
+    FRAME_DELAY,
+    INPUT_SCAN_INTERVAL,
+    LED_QUEUE_SIZE,
+    LED_TICK_INTERVAL,
+)
+
+
+class GameContext:
+    """
+    Hardware and queues shared by the game tasks.
+
+    Parameters
+    ----------
+    display : adafruit_displayio_ssd1306.SSD1306
+        The display object.
+    bitmap : displayio.Bitmap
+        The bitmap the game draws on.
+    inputs : dict
+        Input handlers with keys 'mux', 'accel', 'button' and 'bus'.
+    neopixels : NeoPixelManager
+        LED manager (only touched by led_task).
+    screens : TextScreens
+        Prebuilt text screens (see game_over_screen.py).
+    hud : Hud
+        In-game score/level/health row (see hud.py).
+    feedback : FeedbackEffects
+        Palette/contrast judgement effects (see feedback_effects.py).
+    trace : InputRecorder, InputPlayer, SoakBot or None
+        Records input events, replays a recording (see input_trace.py) or
+        plays the game unattended (see soak.py). Traces with a true
+        fixed_step attribute switch game timing to ticks.
+    """
+
+    def __init__(
+        self, display, bitmap, inputs, neopixels, screens, hud, feedback, trace=None
+    ):
+        self.display = display
+        self.bitmap = bitmap
+        self.inputs = inputs
+        self.bus = inputs["bus"]
+        self.neopixels = neopixels
+        self.screens = screens
+        self.hud = hud
+        self.feedback = feedback
+        self.trace = trace
+
+        self.events = EventQueue(EVENT_QUEUE_SIZE)
+        self.leds = EventQueue(LED_QUEUE_SIZE)
+        self.frame_ready = asyncio.Event()
+        self.frames_rendered = 0
+        self.game_task = None
+
+        # Game time in FRAME_DELAY steps (advanced by sleep() and
+        # wait_for_event()); with fixed_step, game logic runs on it instead
+        # of elapsed time so recorded inputs replay deterministically
+        self.ticks = 0
+        self.fixed_step = getattr(trace, "fixed_step", False)
+
+        # What the game is showing, for bots and diagnostics (see soak.py):
+        # the GameState, the active SlidingShape and the index into
+        # TILT_DIRECTIONS of the gesture being prompted, if any
+        self.game_state = None
+        self.shape = None
+        self.gesture = None
+
+    def request_frame(self):
+        """Ask render_task to push the bitmap to the display."""
+        self.display.auto_refresh = False
+        self.frame_ready.set()
+
+    def stop(self):
+        """End the game task, which makes run_tasks return."""
+        if self.game_task is not None:
+            self.game_task.cancel()
+
+    async def sleep(self, seconds=FRAME_DELAY):
+        """
+        Pause the game task for a span of game time.
+
+        Sleeps one FRAME_DELAY step at a time and advances self.ticks after
+        each, so the other tasks see the game clock move while it waits.
+
+        Parameters
+        ----------
+        seconds : float
+            Game time to wait, rounded to whole frames (at least one).
+        """
+        for _ in range(max(1, round(seconds / FRAME_DELAY))):
+            await asyncio.sleep(FRAME_DELAY)
+            self.ticks += 1
+
+    async def wait_for_event(self, kind, timeout=None):
+        """
+        Wait for an event of one kind, discarding other events.
+
+        Wakes as soon as an event is queued. Every FRAME_DELAY without one
+        advances self.ticks, so game time moves on while the game waits.
+
+        Parameters
+        ----------
+        kind : int
+            Event kind to wait for (EVENT_* constant).
+        timeout : float or None
+            Seconds to wait, or None to wait forever. With fixed_step the
+            timeout is counted in ticks rather than elapsed time.
+
+        Returns
+        -------
+        bool
+            True if the event arrived (its value is in self.events.value),
+            False on timeout.
+        """
+        events = self.events
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+            ticks_left = round(timeout / FRAME_DELAY)
+
+        while True:
+            while len(events):
+                if events.pop() == kind:
+                    return True
+
+            wait = FRAME_DELAY
+            if timeout is not None:
+                if self.fixed_step:
+                    if ticks_left <= 0:
+                        return False
+                    ticks_left -= 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+
+            try:
+                await asyncio.wait_for(events.wait(), wait)
+            except asyncio.TimeoutError:
+                self.ticks += 1
+
+
+async def input_task(ctx):
+    """
+    Scan every input and queue an event for each new press, turn or tilt.
+
+    Switches are edge-detected, so holding one down queues a single press.
+    The task yields after every multiplexer channel so a full scan never
+    holds up rendering or the LEDs. With ctx.trace set, events go through
+    its input sink, which records them or (when replaying) drops them.
+    """
+    mux = ctx.inputs["mux"]
+    accel = ctx.inputs["accel"]
+    button = ctx.inputs["button"]
+    bus = ctx.bus
+    service_interval_ns = int(ACCEL_SERVICE_INTERVAL * 1_000_000_000)
+    events = ctx.events
+    put = events.put if ctx.trace is None else ctx.trace.input_sink(events)
+
+    pressed_mask = 0
+    last_tilt = None
+    button.clear_events()
+
+    while True:
+        # Limit switches (only new presses)
+        for channel in range(8):
+            bit = 1 << channel
+            if mux.read_switch(channel):
+                if not pressed_mask & bit:
+                    pressed_mask |= bit
+                    put(EVENT_SWITCH, channel + 1)
+            else:
+                pressed_mask &= ~bit
+            await asyncio.sleep(0)
+
+        # Encoder button and rotation
+        while button.was_pressed():
+            put(EVENT_BUTTON, 0, button.last_press_ms)
+        delta = button.get_delta()
+        if delta:
+            put(EVENT_ROTATE, delta)
+
+        # Tilt classified after the last refresh (AccelerometerInput.service,
+        # run by I2CBus.refresh). Screens that don't redraw, like a gesture
+        # prompt, would never read the sensor, so read it here once a FIFO
+        # watermark's worth of time has passed without a refresh.
+        bus.service_if_idle(service_interval_ns)
+        direction = accel.last_direction
+        if direction != last_tilt:
+            last_tilt = direction
+            if direction is not None:
+                put(
+                    EVENT_TILT,
+                    TILT_DIRECTIONS.index(direction),
+                    accel.classifier.onset_ms,
+                )
+
+        await asyncio.sleep(INPUT_SCAN_INTERVAL)
+
+
+async def render_task(ctx):
+    """Refresh the display each time the game requests a frame."""
+    while True:
+        await ctx.frame_ready.wait()
+        ctx.frame_ready.clear()
+        ctx.bus.refresh(ctx.display)
+        ctx.frames_rendered += 1
+        heap_tracker.tick()
+        # Let the other tasks run before the next refresh
+        await asyncio.sleep(0)
+
+
+async def led_task(ctx):
+    """Apply queued LED commands and step LED animations."""
+    neopixels = ctx.neopixels
+    leds = ctx.leds
+
+    while True:
+        while len(leds):
+            command = leds.pop()
+            value = leds.value
+            if command == LED_HEALTH:
+                neopixels.set_health(value)
+            elif command == LED_VICTORY:
+                neopixels.victory_animation(duration=value / 1000)
+            elif command == LED_BRIGHTNESS:
+                neopixels.adjust_brightness(value)
+
+        neopixels.tick()
+        await asyncio.sleep(LED_TICK_INTERVAL)
+
+
+async def run_tasks(ctx, game):
+    """
+    Run the game coroutine alongside the input, render and LED tasks.
+
+    Parameters
+    ----------
+    ctx : GameContext
+        Shared hardware and queues.
+    game : coroutine
+        The game task, e.g. the splash screen followed by run_game(). The
+        runtime stops when it returns, raises or ctx.stop() is called.
+    """
+    background = []
+    # The trace task starts first so its clock starts before any input
+    if ctx.trace is not None:
+        background.append(asyncio.create_task(ctx.trace.run(ctx)))
+    background += [
+        asyncio.create_task(input_task(ctx)),
+        asyncio.create_task(render_task(ctx)),
+        asyncio.create_task(led_task(ctx)),
+    ]
+    ctx.game_task = asyncio.create_task(game)
+    try:
+        await ctx.game_task
+    except asyncio.CancelledError:
+        pass
+    finally:
+        for task in background:
+            task.cancel()
@@ -0,0 +1,166 @@
+# heap_marks.py
+"""
+Per-phase heap budget tracker (loaded by heap_tracker.py when
+HEAP_TRACKING is on; import heap_tracker, not this module).
+
+The game moves through phases (startup, splash, countdown, play, gesture
+prompt, result screens). enter() marks each boundary and tick(), called
+once per rendered frame, samples the heap every HEAP_SAMPLE_INTERVAL
+frames in between. For every phase the tracker keeps:
+
+- the lowest gc.mem_free() and highest gc.mem_alloc() seen (high-water
+  marks)
+- the net change in allocated bytes over its last visit and its largest
+  net growth over any visit
+
+Samples are taken without collecting first, so they also count garbage
+not yet collected: the numbers show how close the heap came to its limit,
+which is where MemoryError strikes. When free heap drops below
+HEAP_HEADROOM_WARNING and below the phase's previous low, a warning is
+logged (see game_log.py). report() prints the table; call it from the
+REPL, or set DEBUG_PRINT_HEAP to print it on every result screen.
+
+Like game_log, all state lives in preallocated arrays, so tracking does
+not allocate itself.
+"""
+
+import array
+import gc
+
+from game_config import HEAP_HEADROOM_WARNING, HEAP_SAMPLE_INTERVAL
+from game_log import HEAP_LOW, PHASES, WARNING, log
+
+_STARTUP = 0  # heap_tracker.STARTUP
+_NUM_PHASES = len(PHASES)
+_NEVER = -1
+
+# 32-bit marks per phase, set up by reset() at the end of this module
+_visits = array.array("I", bytes(4 * _NUM_PHASES))
+_min_free = array.array("i", bytes(4 * _NUM_PHASES))
+_peak_alloc = array.array("i", bytes(4 * _NUM_PHASES))
+_last_delta = array.array("i", bytes(4 * _NUM_PHASES))
+_max_delta = array.array("i", bytes(4 * _NUM_PHASES))
+
+_phase = _STARTUP
+_entry_alloc = 0
+_frames = 0
+
+
+def sample():
+    """
+    Record the heap now against the current phase.
+
+    Returns
+    -------
+    int
+        Free heap in bytes.
+    """
+    free = gc.mem_free()
+    alloc = gc.mem_alloc()
+    phase = _phase
+
+    if alloc > _peak_alloc[phase]:
+        _peak_alloc[phase] = alloc
+
+    low = _min_free[phase]
+    if low == _NEVER or free < low:
+        _min_free[phase] = free
+        # Only new lows warn, so a tight phase isn't reported every frame
+        if free < HEAP_HEADROOM_WARNING:
+            log(WARNING, HEAP_LOW, phase, free // 1024, HEAP_HEADROOM_WARNING // 1024)
+    return free
+
+
+def enter(phase):
+    """
+    Close the current phase and start another.
+
+    Parameters
+    ----------
+    phase : int
+        STARTUP, SPLASH, COUNTDOWN, PLAY, GESTURE or RESULTS.
+    """
+    global _phase, _entry_alloc, _frames
+    sample()
+    alloc = gc.mem_alloc()
+    previous = _phase
+    delta = alloc - _entry_alloc
+    _last_delta[previous] = delta
+    if delta > _max_delta[previous]:
+        _max_delta[previous] = delta
+
+    _phase = phase
+    _visits[phase] += 1
+    _entry_alloc = alloc
+    _frames = 0
+    sample()
+
+
+def tick():
+    """Sample every HEAP_SAMPLE_INTERVAL calls (once per rendered frame)."""
+    global _frames
+    _frames += 1
+    if _frames >= HEAP_SAMPLE_INTERVAL:
+        _frames = 0
+        sample()
+
+
+def headroom():
+    """
+    Get the lowest free heap seen in any phase.
+
+    Returns
+    -------
+    int
+        Bytes, or -1 if nothing has been sampled.
+    """
+    lowest = _NEVER
+    for free in _min_free:
+        if free != _NEVER and (lowest == _NEVER or free < lowest):
+            lowest = free
+    return lowest
+
+
+def report():
+    """Print the high-water marks and allocation deltas of every phase."""
+    if gc.mem_alloc() == 0:
+        # Nothing allocated means no real heap behind gc (the desktop
+        # simulator unless it traces allocations), so every mark is bogus
+        print(
+            "\nHeap by phase: not available, gc.mem_alloc() reports no heap"
+            " (in the simulator, run with --trace-heap or --soak)"
+        )
+        return
+    print(
+        f"\nHeap by phase (now {gc.mem_free()} B free, in {PHASES[_phase]}; "
+        f"warning below {HEAP_HEADROOM_WARNING} B)"
+    )
+    print(
+        f"{'Phase':10s} {'Visits':>6s} {'Min free':>9s} {'Peak alloc':>10s} "
+        f"{'Last +/-':>9s} {'Max +':>8s}"
+    )
+    for phase in range(_NUM_PHASES):
+        if not _visits[phase]:
+            continue
+        print(
+            f"{PHASES[phase]:10s} {_visits[phase]:6d} {_min_free[phase]:9d} "
+            f"{_peak_alloc[phase]:10d} {_last_delta[phase]:+9d} "
+            f"{_max_delta[phase]:8d}"
+        )
+
+
+def reset():
+    """Forget every phase's marks (the current phase stays current)."""
+    global _entry_alloc, _frames
+    for phase in range(_NUM_PHASES):
+        _visits[phase] = 0
+        _min_free[phase] = _NEVER
+        _peak_alloc[phase] = 0
+        _last_delta[phase] = 0
+        _max_delta[phase] = 0
+    _visits[_phase] = 1
+    _entry_alloc = gc.mem_alloc()
+    _frames = 0
+
+
+reset()
@@ -0,0 +1,55 @@
+# heap_tracker.py
+"""
+Per-phase heap budget tracking, or nothing when HEAP_TRACKING is off.
+
+The game marks its phases with enter() and calls tick() once per rendered
+frame. With HEAP_TRACKING on, those calls go to heap_marks.py, which
+keeps the high-water marks and prints them with report(). With it off,
+they are empty stand-ins and heap_marks is never loaded, so the tracker
+takes next to no heap.
+"""
+
+import gc
+
+from game_config import HEAP_TRACKING
+
+try:
+    from micropython import const
+except ImportError:
+
+    def const(value):
+        return value
+
+
+# Phases (names in game_log.PHASES, same order)
+STARTUP = const(0)
+SPLASH = const(1)
+COUNTDOWN = const(2)
+PLAY = const(3)
+GESTURE = const(4)
+RESULTS = const(5)
+
+if HEAP_TRACKING:
+    from heap_marks import enter, headroom, report, reset, sample, tick
+else:
+
+    def enter(phase):
+        """Heap tracking is off (HEAP_TRACKING = False)."""
+
+    def tick():
+        """Heap tracking is off (HEAP_TRACKING = False)."""
+
+    def sample():
+        """Heap tracking is off (HEAP_TRACKING = False): nothing is recorded."""
+        return gc.mem_free()
+
+    def headroom():
+        """Heap tracking is off (HEAP_TRACKING = False): nothing sampled."""
+        return -1
+
+    def report():
+        """Heap tracking is off (HEAP_TRACKING = False)."""
+        print("Heap tracking is off (set HEAP_TRACKING = True in game_config.py)")
+
+    def reset():
+        """Heap tracking is off (HEAP_TRACKING = False)."""
@@ -0,0 +1,227 @@
+# hud.py
+"""
+In-game score, level and health HUD drawn with the bundled 5x8 font.
+
+The HUD is one text row on its own 1-bit Bitmap and TileGrid above the game
+bitmap, so clearing and redrawing the playfield every frame never touches
+it. Glyphs come straight from font5x8.bin (the adafruit_framebuf font:
+a 2-byte header with the glyph size, then 5 column bytes per character,
+least significant bit at the top). Each glyph is read from the file once
+and cached. Numbers are written digit by digit into a preallocated cell
+buffer, and only cells whose character changed are redrawn, so updating
+the HUD every frame costs nothing when the values haven't changed and
+never creates a Label. Without the font file (only src/ copied to the
+board) the HUD prints a warning and stays blank instead of stopping boot.
+"""
+
+import displayio
+from game_config import DISPLAY_WIDTH, HUD_FONT_PATH, HUD_Y
+
+GLYPH_WIDTH = 5
+GLYPH_HEIGHT = 8
+CELL_WIDTH = GLYPH_WIDTH + 1  # One blank column between characters
+HUD_COLUMNS = DISPLAY_WIDTH // CELL_WIDTH
+
+# Cell layout: "L10 S-1234  H5"
+_LEVEL_LABEL = 0
+_LEVEL_DIGITS = (1, 2)  # (first cell, width)
+_SCORE_LABEL = 4
+_SCORE_DIGITS = (5, 5)
+_HEALTH_LABEL = HUD_COLUMNS - 2
+_HEALTH_DIGITS = (HUD_COLUMNS - 1, 1)
+
+_SPACE = 32
+_MINUS = 45
+_ZERO = 48
+
+
+class Font5x8:
+    """
+    Glyph reader for font5x8.bin with a per-character cache.
+
+    Parameters
+    ----------
+    path : str
+        Path to the font file.
+    """
+
+    def __init__(self, path=HUD_FONT_PATH):
+        self.path = path
+        self.glyphs = {}
+
+        with open(path, "rb") as f:
+            header = f.read(2)
+        if header[0] != GLYPH_WIDTH or header[1] != GLYPH_HEIGHT:
+            raise ValueError(f"{path} is not a {GLYPH_WIDTH}x{GLYPH_HEIGHT} font")
+
+    def glyph(self, char_code):
+        """
+        Get the column bytes of one character.
+
+        Parameters
+        ----------
+        char_code : int
+            Character code (0-255).
+
+        Returns
+        -------
+        bytes
+            GLYPH_WIDTH column bytes, bit 0 is the top row.
+        """
+        glyph = self.glyphs.get(char_code)
+        if glyph is None:
+            with open(self.path, "rb") as f:
+                f.seek(2 + char_code * GLYPH_WIDTH)
+                glyph = f.read(GLYPH_WIDTH)
+            self.glyphs[char_code] = glyph
+        return glyph
+
+    def preload(self, text):
+        """Cache every glyph of a string up front (e.g. "0123456789-")."""
+        for char in text:
+            self.glyph(ord(char))
+
+
+class Hud:
+    """
+    One-row level/score/health display on its own TileGrid.
+
+    Parameters
+    ----------
+    root_group : displayio.Group
+        Group the HUD TileGrid is appended to (on top of the game).
+    font : Font5x8 or None
+        Font to draw with (loaded from HUD_FONT_PATH if not given). If the
+        file can't be read, the HUD is left blank and update() does nothing.
+    """
+
+    def __init__(self, root_group, font=None):
+        if font is None:
+            try:
+                font = Font5x8()
+            except OSError as e:
+                print(
+                    f"HUD disabled: can't read {HUD_FONT_PATH} ({e}),"
+                    " copy assets/font5x8.bin to CIRCUITPY"
+                )
+        self.font = font
+        if font is not None:
+            font.preload("0123456789- LSH")
+
+        self.bitmap = displayio.Bitmap(DISPLAY_WIDTH, GLYPH_HEIGHT, 2)
+        palette = displayio.Palette(2)
+        palette[0] = 0x000000
+        palette[1] = 0xFFFFFF
+        palette.make_transparent(0)  # Only lit pixels cover the playfield
+        self.palette = palette
+
+        self.group = displayio.Group(y=HUD_Y)
+        self.group.append(displayio.TileGrid(self.bitmap, pixel_shader=palette))
+        self.group.hidden = True
+        root_group.append(self.group)
+
+        # What is drawn in each cell, and what should be
+        self.cells = bytearray(b" " * HUD_COLUMNS)
+        self.pending = bytearray(b" " * HUD_COLUMNS)
+        self.pending[_LEVEL_LABEL] = ord("L")
+        self.pending[_SCORE_LABEL] = ord("S")
+        self.pending[_HEALTH_LABEL] = ord("H")
+
+        self.level = None
+        self.score = None
+        self.health = None
+
+    @property
+    def visible(self):
+        """Whether the HUD is shown."""
+        return not self.group.hidden
+
+    @visible.setter
+    def visible(self, value):
+        self.group.hidden = not value
+
+    def update(self, level, score, health):
+        """
+        Show new values, redrawing only the cells that changed.
+
+        Parameters
+        ----------
+        level : int
+            Current level.
+        score : int
+            Current score (may be negative).
+        health : int
+            Current health.
+
+        Returns
+        -------
+        bool
+            True if any pixel changed (the display needs a refresh).
+        """
+        if self.font is None:
+            return False
+        if level == self.level and score == self.score and health == self.health:
+            return False
+
+        self.level = level
+        self.score = score
+        self.health = health
+
+        self._write_number(_LEVEL_DIGITS, level)
+        self._write_number(_SCORE_DIGITS, score)
+        self._write_number(_HEALTH_DIGITS, health)
+
+        changed = False
+        cells = self.cells
+        pending = self.pending
+        for i in range(HUD_COLUMNS):
+            if cells[i] != pending[i]:
+                cells[i] = pending[i]
+                self._draw_cell(i, pending[i])
+                changed = True
+        return changed
+
+    def _write_number(self, field, value):
+        """
+        Right-align a number in its cells.
+
+        Values that don't fit are clamped to the largest that do (99999 or
+        -9999 in a 5-cell field), so a long negative score never loses its
+        minus sign.
+        """
+        start, width = field
+        pending = self.pending
+        limit = 10**width - 1
+        if value > limit:
+            value = limit
+        elif value < -(limit // 10):
+            value = -(limit // 10)
+        negative = value < 0
+        if negative:
+            value = -value
+
+        i = start + width - 1
+        while i >= start:
+            pending[i] = _ZERO + value % 10
+            value //= 10
+            i -= 1
+            if value == 0:
+                break
+
+        if negative and i >= start:
+            pending[i] = _MINUS
+            i -= 1
+        while i >= start:
+            pending[i] = _SPACE
+            i -= 1
+
+    def _draw_cell(self, cell, char_code):
+        """Blit one glyph into its cell."""
+        bitmap = self.bitmap
+        glyph = self.font.glyph(char_code)
+        x0 = cell * CELL_WIDTH
+        for col in range(GLYPH_WIDTH):
+            bits = glyph[col]
+            x = x0 + col
+            for row in range(GLYPH_HEIGHT):
+                bitmap[x, row] = (bits >> row) & 1
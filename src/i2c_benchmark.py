@@ -0,0 +1,133 @@
+# i2c_benchmark.py
+"""
+Measure display refresh and accelerometer read time at several I2C clocks.
+
+Run from the REPL with the game stopped:
+
+    >>> import i2c_benchmark
+    >>> i2c_benchmark.run_benchmark()
+
+Each frequency gets a fresh bus and display. Every refresh redraws a
+different full-screen pattern so displayio has to send the whole frame.
+"""
+
+import time
+
+import adafruit_displayio_ssd1306
+import board
+import displayio
+import i2cdisplaybus
+from adxl345_stream import ADXL345Stream
+from game_config import DISPLAY_HEIGHT, DISPLAY_WIDTH, FRAME_DELAY
+from i2c_bus import I2CBus
+
+BENCHMARK_FREQUENCIES = (100_000, 400_000, 1_000_000)
+
+
+def _fill_pattern(bitmap, phase):
+    """Fill the bitmap with a checkerboard that changes every call."""
+    for x in range(bitmap.width):
+        for y in range(bitmap.height):
+            bitmap[x, y] = ((x >> 3) + (y >> 3) + phase) & 1
+
+
+def benchmark_frequency(frequency, num_refreshes=20, num_reads=100):
+    """
+    Time full-frame refreshes and accelerometer reads at one clock.
+
+    Parameters
+    ----------
+    frequency : int
+        I2C clock in Hz.
+    num_refreshes : int
+        Display refreshes to time.
+    num_reads : int
+        Raw accelerometer reads to time.
+
+    Returns
+    -------
+    dict
+        {"frequency", "refresh_ms", "accel_read_us", "frame_share"} where
+        frame_share is the fraction of one FRAME_DELAY spent refreshing.
+    """
+    displayio.release_displays()
+    bus = I2CBus(board.SCL, board.SDA, frequency=frequency)
+
+    display_bus = i2cdisplaybus.I2CDisplayBus(bus.i2c, device_address=0x3C)
+    display = adafruit_displayio_ssd1306.SSD1306(
+        display_bus, width=DISPLAY_WIDTH, height=DISPLAY_HEIGHT
+    )
+    display.auto_refresh = False
+
+    bitmap = displayio.Bitmap(DISPLAY_WIDTH, DISPLAY_HEIGHT, 2)
+    palette = displayio.Palette(2)
+    palette[0] = 0x000000
+    palette[1] = 0xFFFFFF
+    group = displayio.Group()
+    group.append(displayio.TileGrid(bitmap, pixel_shader=palette))
+    display.root_group = group
+
+    # Refresh time (pattern drawing is excluded from the timing)
+    for i in range(num_refreshes):
+        _fill_pattern(bitmap, i)
+        bus.refresh(display)
+    refresh_ms = bus.display_stats.busy_ns / num_refreshes / 1_000_000
+
+    # Accelerometer raw read time on the same bus
+    accel_stats = bus.register("accel")
+    accel_read_us = None
+    try:
+        stream = ADXL345Stream(bus.i2c, stats=accel_stats)
+        stream.configure(fifo=False)
+        for _ in range(num_reads):
+            stream.read_raw()
+        accel_read_us = accel_stats.busy_ns / num_reads / 1000
+    except (OSError, ValueError) as e:
+        print(f"  Accelerometer not reachable at {frequency} Hz: {e}")
+
+    displayio.release_displays()
+    bus.i2c.deinit()
+
+    return {
+        "frequency": frequency,
+        "refresh_ms": refresh_ms,
+        "accel_read_us": accel_read_us,
+        "frame_share": refresh_ms / 1000 / FRAME_DELAY,
+    }
+
+
+def run_benchmark(frequencies=BENCHMARK_FREQUENCIES):
+    """
+    Benchmark every frequency and print a summary table.
+
+    Parameters
+    ----------
+    frequencies : tuple
+        I2C clocks in Hz to test.
+
+    Returns
+    -------
+    list
+        One result dict per frequency (see benchmark_frequency()).
+    """
+    print("\n=== I2C BUS BENCHMARK ===")
+    results = []
+    for frequency in frequencies:
+        print(f"Testing {frequency // 1000} kHz...")
+        try:
+            results.append(benchmark_frequency(frequency))
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f"  Failed at {frequency} Hz: {e}")
+        time.sleep(0.1)
+
+    print("\nClock    | Refresh (ms) | Accel read (us) | % of frame")
+    print("-" * 55)
+    for result in results:
+        accel = result["accel_read_us"]
+        accel_text = f"{accel:15.0f}" if accel is not None else "            n/a"
+        print(
+            f"{result['frequency'] // 1000:4d} kHz | {result['refresh_ms']:12.2f} | "
+            f"{accel_text} | {result['frame_share'] * 100:9.1f}"
+        )
+
+    return results
@@ -0,0 +1,203 @@
+# i2c_bus.py
+"""
+Shared I2C bus arbitration and utilization accounting.
+
+The SSD1306 and the ADXL345 share one busio.I2C. A full display refresh
+pushes about 1 KB, and while it runs any accelerometer read has to wait.
+I2CBus owns the bus at a configurable clock, times every display refresh,
+and runs the accelerometer work registered with schedule() right after each
+refresh, in the gap before the next frame's transfer. When the screen
+stays still (a gesture prompt waits without redrawing), input_task runs it
+through service_if_idle() instead, so the sensor is still read about once
+per FIFO watermark but never right before a refresh that is due anyway.
+Display commands outside a refresh
+(contrast changes) go through set_brightness(). Every device's bytes and
+busy time are counted so we can see how much of a frame the bus eats.
+"""
+
+import time
+
+import busio
+from game_config import DISPLAY_COMMAND_BYTES, DISPLAY_FRAME_BYTES, I2C_FREQUENCY
+
+
+class BusStats:
+    """
+    Byte and time counters for one device on the bus.
+
+    Parameters
+    ----------
+    name : str
+        Device name used in reports.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.reset()
+
+    def reset(self):
+        """Zero all counters."""
+        self.transfers = 0
+        self.bytes = 0
+        self.busy_ns = 0
+        self.max_ns = 0
+
+    def record(self, num_bytes, elapsed_ns, transfers=1):
+        """
+        Count one hold of the bus.
+
+        Parameters
+        ----------
+        num_bytes : int
+            Bytes moved on the bus (payload, excluding address bytes).
+        elapsed_ns : int
+            Time the device held the bus.
+        transfers : int
+            I2C transactions made while holding it (e.g. one per FIFO
+            entry in ADXL345Stream.drain()).
+        """
+        self.transfers += transfers
+        self.bytes += num_bytes
+        self.busy_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+
+class I2CBus:
+    """
+    Owns the shared I2C bus and accounts for its use.
+
+    Parameters
+    ----------
+    scl : board pin
+        Clock pin.
+    sda : board pin
+        Data pin.
+    frequency : int
+        Bus clock in Hz (default I2C_FREQUENCY).
+    """
+
+    def __init__(self, scl, sda, frequency=I2C_FREQUENCY):
+        self.i2c = busio.I2C(scl, sda, frequency=frequency)
+        self.frequency = frequency
+
+        self.devices = {}
+        self.display_stats = self.register("display")
+        self.scheduled = []
+        self.last_service_ns = time.monotonic_ns()
+        self.window_start_ns = time.monotonic_ns()
+
+    def register(self, name):
+        """
+        Get the stats object for a device, creating it if needed.
+
+        Parameters
+        ----------
+        name : str
+            Device name.
+
+        Returns
+        -------
+        BusStats
+            Counters to pass to the device driver.
+        """
+        if name not in self.devices:
+            self.devices[name] = BusStats(name)
+        return self.devices[name]
+
+    def schedule(self, callback):
+        """
+        Run a callback in the bus gap after every display refresh.
+
+        Parameters
+        ----------
+        callback : callable
+            Called with no arguments, e.g. AccelerometerInput.service.
+        """
+        self.scheduled.append(callback)
+
+    def service(self):
+        """Run all scheduled bus work now."""
+        self.last_service_ns = time.monotonic_ns()
+        for callback in self.scheduled:
+            callback()
+
+    def service_if_idle(self, interval_ns):
+        """
+        Run the scheduled bus work if nothing has run it for a while.
+
+        Parameters
+        ----------
+        interval_ns : int
+            Time since the last refresh or service() after which the work
+            runs now rather than waiting for the next refresh.
+        """
+        if time.monotonic_ns() - self.last_service_ns >= interval_ns:
+            self.service()
+
+    def refresh(self, display):
+        """
+        Refresh the display, account for it, then run scheduled bus work.
+
+        Parameters
+        ----------
+        display : adafruit_displayio_ssd1306.SSD1306
+            Display to refresh (auto_refresh should be off).
+        """
+        start_ns = time.monotonic_ns()
+        display.refresh()
+        # displayio only sends dirty areas; count a full frame as upper bound
+        self.display_stats.record(DISPLAY_FRAME_BYTES, time.monotonic_ns() - start_ns)
+
+        self.service()
+
+    def set_brightness(self, display, brightness):
+        """
+        Set the display contrast and account for the command.
+
+        Parameters
+        ----------
+        display : adafruit_displayio_ssd1306.SSD1306
+            Display to adjust.
+        brightness : float
+            Contrast from 0.0 to 1.0 (one SSD1306 command).
+        """
+        start_ns = time.monotonic_ns()
+        display.brightness = brightness
+        self.display_stats.record(
+            DISPLAY_COMMAND_BYTES, time.monotonic_ns() - start_ns
+        )
+
+    def utilization(self):
+        """
+        Get each device's share of wall time since the last reset.
+
+        Returns
+        -------
+        dict
+            Device name -> fraction of time (0.0-1.0) the device held the bus.
+        """
+        window_ns = time.monotonic_ns() - self.window_start_ns
+        if window_ns <= 0:
+            window_ns = 1
+        return {name: stats.busy_ns / window_ns for name, stats in self.devices.items()}
+
+    def reset_stats(self):
+        """Zero all counters and start a new measurement window."""
+        for stats in self.devices.values():
+            stats.reset()
+        self.window_start_ns = time.monotonic_ns()
+
+    def print_report(self):
+        """Print bytes, transfer times and utilization per device."""
+        usage = self.utilization()
+        print(f"I2C @ {self.frequency // 1000} kHz")
+        print("Device    | Transfers | Bytes   | Avg (ms) | Max (ms) | Bus %")
+        print("-" * 62)
+        for name, stats in self.devices.items():
+            avg_ms = stats.busy_ns / max(stats.transfers, 1) / 1_000_000
+            print(
+                f"{name:9s} | {stats.transfers:9d} | {stats.bytes:7d} | "
+                f"{avg_ms:8.2f} | {stats.max_ns / 1_000_000:8.2f} | "
+                f"{usage[name] * 100:5.1f}"
+            )
@@ -2,30 +2,106 @@
 # input_handler.py
 """Input handling for multiplexer, accelerometer, and rotary encoder."""
 
+import array
 import time
 
 import adafruit_adxl34x
 import board
+import supervisor
 from analogio import AnalogIn
 from digitalio import DigitalInOut, Direction, Pull
+from adxl345_stream import ADXL345Stream, counts_from_ms2
 from game_config import (
+    ACCEL_DATA_RATE,
+    ACCEL_TILT_RELEASE_THRESHOLD,
     ACCEL_TILT_THRESHOLD,
+    ACCEL_USE_FIFO,
+    BUTTON_DEBOUNCE_INTERVAL,
+    BUTTON_MAX_EVENTS,
     DEBUG_PRINT_INPUTS,
+    ENCODER_DIVISOR,
+    ENCODER_MAX_EVENTS,
+    ENCODER_SCAN_INTERVAL,
+    MUX_CAPTURE_BITS,
+    MUX_CAPTURE_MODE,
+    MUX_CAPTURE_RATE,
+    MUX_CAPTURE_SAMPLES,
     MUX_DEBOUNCE_SAMPLES,
+    MUX_SAMPLE_INTERVAL,
     MUX_SETTLE_TIME,
     MUX_VOLTAGE_THRESHOLD,
 )
+from mux_calibration import load_calibration
+from tilt_classifier import TiltClassifier
+
+# analogbufio and keypad are only built on some ports; fall back without them
+try:
+    import analogbufio
+except ImportError:
+    analogbufio = None
+
+try:
+    import keypad
+except ImportError:
+    keypad = None
+
+try:
+    import rotaryio
+except ImportError:
+    rotaryio = None
+
+
+def classify_samples(samples, threshold):
+    """
+    Classify a captured switch waveform as pressed or released.
+
+    A released normally-open switch reads a stable HIGH through the pull-up.
+    A pressed switch either sits LOW or flickers between LOW and HIGH, so a
+    single sample below the threshold is enough to call it pressed.
+
+    Parameters
+    ----------
+    samples : array.array
+        Raw ADC samples captured from one channel.
+    threshold : int
+        ADC value below which a sample counts as LOW, in the same units
+        as the samples.
+
+    Returns
+    -------
+    bool
+        True if switch is pressed, False otherwise.
+    """
+    for raw_value in samples:
+        if raw_value < threshold:
+            return True
+    return False
 
 
 class MultiplexerInput:
     """
     Handles 8 limit switches via CD74HC4067 multiplexer.
 
-    Uses instability detection method for normally-open switches.
+    Uses instability detection method for normally-open switches. Each
+    channel is captured as a short waveform into a preallocated buffer,
+    either in one native call (analogbufio.BufferedIn) or sample by sample
+    through AnalogIn, then classified with classify_samples().
     """
 
-    def __init__(self):
-        """Initialize multiplexer control pins and analog input."""
+    def __init__(self, capture_mode=MUX_CAPTURE_MODE, adc=None):
+        """
+        Initialize multiplexer control pins and analog input.
+
+        Parameters
+        ----------
+        capture_mode : str
+            "buffered" to require analogbufio, "analog" to force AnalogIn,
+            or "auto" to use analogbufio when the port supports it.
+        adc : object or None
+            Optional sample source used instead of the A2 pin. Objects with
+            a readinto() method are treated like BufferedIn, anything else
+            like AnalogIn (its value attribute is read per sample).
+        """
         # Control pins S0, S1, S2
         self.s0 = DigitalInOut(board.D8)
         self.s0.direction = Direction.OUTPUT
@@ -36,15 +112,69 @@ class MultiplexerInput:
         self.s2 = DigitalInOut(board.D10)
         self.s2.direction = Direction.OUTPUT
 
-        # Analog signal input
-        self.analog_sig = AnalogIn(board.A2)
+        # Analog signal input: bulk capture if possible, AnalogIn otherwise
+        self.buffered_sig = None
+        self.analog_sig = None
+
+        if adc is not None:
+            if hasattr(adc, "readinto"):
+                self.buffered_sig = adc
+            else:
+                self.analog_sig = adc
+        elif capture_mode != "analog":
+            if analogbufio is not None:
+                try:
+                    self.buffered_sig = analogbufio.BufferedIn(
+                        board.A2, sample_rate=MUX_CAPTURE_RATE
+                    )
+                except (NotImplementedError, RuntimeError, ValueError):
+                    if capture_mode == "buffered":
+                        raise
+            elif capture_mode == "buffered":
+                raise RuntimeError("analogbufio is not available on this board")
+
+        if self.buffered_sig is None and self.analog_sig is None:
+            self.analog_sig = AnalogIn(board.A2)
+
+        # Preallocated capture buffer; sample_shift converts 16-bit AnalogIn
+        # units into the buffer's native units
+        if self.buffered_sig is not None:
+            self.capture_mode = "buffered"
+            self.samples = array.array("H", bytes(2 * MUX_CAPTURE_SAMPLES))
+            self.sample_shift = 16 - MUX_CAPTURE_BITS
+        else:
+            self.capture_mode = "analog"
+            self.samples = array.array("H", bytes(2 * MUX_DEBOUNCE_SAMPLES))
+            self.sample_shift = 0
+
+        # Per-channel thresholds and settle time, from NVM if calibrated
+        calibration = load_calibration()
+        self.is_calibrated = calibration is not None
+        if calibration is None:
+            self.apply_calibration([MUX_VOLTAGE_THRESHOLD] * 8, MUX_SETTLE_TIME)
+        else:
+            self.apply_calibration(*calibration)
 
         # Track previous states for edge detection
         self.prev_states = [False] * 8
 
-    def select_channel(self, channel):
+    def apply_calibration(self, thresholds, settle_time):
         """
-        Select multiplexer channel (0-7).
+        Use per-channel thresholds and a settle time for scanning.
+
+        Parameters
+        ----------
+        thresholds : list
+            8 ADC thresholds in 16-bit AnalogIn units, one per channel.
+        settle_time : float
+            Seconds to wait after switching channels.
+        """
+        self.thresholds = [threshold >> self.sample_shift for threshold in thresholds]
+        self.settle_time = settle_time
+
+    def set_channel(self, channel):
+        """
+        Drive the select pins for a channel without waiting for it to settle.
 
         Parameters
         ----------
@@ -54,11 +184,22 @@ class MultiplexerInput:
         self.s0.value = (channel & 0b001) != 0
         self.s1.value = (channel & 0b010) != 0
         self.s2.value = (channel & 0b100) != 0
-        time.sleep(MUX_SETTLE_TIME)
 
-    def read_switch(self, channel):
+    def select_channel(self, channel):
         """
-        Read switch state using instability detection.
+        Select multiplexer channel (0-7).
+
+        Parameters
+        ----------
+        channel : int
+            Channel number (0-7).
+        """
+        self.set_channel(channel)
+        time.sleep(self.settle_time)
+
+    def capture(self, channel):
+        """
+        Capture a burst of raw ADC samples from one channel.
 
         Parameters
         ----------
@@ -67,24 +208,38 @@ class MultiplexerInput:
 
         Returns
         -------
-        bool
-            True if switch is pressed, False otherwise.
+        array.array
+            The preallocated sample buffer, overwritten on every call.
         """
         self.select_channel(channel)
 
-        # Take multiple samples to detect instability
-        samples = []
-        for _ in range(MUX_DEBOUNCE_SAMPLES):
-            raw_value = self.analog_sig.value
-            samples.append(raw_value < MUX_VOLTAGE_THRESHOLD)
-            time.sleep(0.001)
+        samples = self.samples
+        if self.buffered_sig is not None:
+            # One native call fills the whole buffer at MUX_CAPTURE_RATE
+            self.buffered_sig.readinto(samples)
+        else:
+            analog_sig = self.analog_sig
+            for i in range(len(samples)):
+                samples[i] = analog_sig.value
+                time.sleep(MUX_SAMPLE_INTERVAL)
 
-        # If we see variation in samples, switch is pressed (unstable)
-        # If all samples are the same, switch is not pressed (stable)
-        variations = len(set(samples))
-        is_pressed = variations > 1 or samples[0]
+        return samples
 
-        return is_pressed
+    def read_switch(self, channel):
+        """
+        Read switch state using instability detection.
+
+        Parameters
+        ----------
+        channel : int
+            Channel number (0-7).
+
+        Returns
+        -------
+        bool
+            True if switch is pressed, False otherwise.
+        """
+        return classify_samples(self.capture(channel), self.thresholds[channel])
 
     def scan_all(self):
         """
@@ -115,26 +270,12 @@ class MultiplexerInput:
                 pressed.append(channel + 1)  # Return 1-indexed button numbers
         return pressed
 
-    def wait_for_button_press(self):
-        """
-        Block until any button is pressed, then return button number.
-
-        Returns
-        -------
-        int
-            Button number (1-8) that was pressed.
-        """
-        while True:
-            for channel in range(8):
-                if self.read_switch(channel):
-                    if DEBUG_PRINT_INPUTS:
-                        print(f"Button {channel + 1} pressed")
-                    return channel + 1
-            time.sleep(0.01)
-
     def deinit(self):
         """Clean up resources."""
-        self.analog_sig.deinit()
+        if self.buffered_sig is not None:
+            self.buffered_sig.deinit()
+        if self.analog_sig is not None:
+            self.analog_sig.deinit()
         self.s0.deinit()
         self.s1.deinit()
         self.s2.deinit()
@@ -145,9 +286,14 @@ class AccelerometerInput:
     Handles ADXL345 accelerometer for gesture detection.
 
     Detects tilts in 4 directions: left, right, up (forward), down (back).
+    In FIFO mode the sensor buffers samples itself (see adxl345_stream.py)
+    and each check drains the whole queue, so no tilt sample is missed
+    between polls. Otherwise each check burst-reads one raw sample. Either
+    way samples stay int16 counts and feed a TiltClassifier, which filters
+    out jolts and reports direction, confidence and onset time.
     """
 
-    def __init__(self, i2c):
+    def __init__(self, i2c, int_pin=None, use_fifo=ACCEL_USE_FIFO, bus_stats=None):
         """
         Initialize accelerometer.
 
@@ -155,9 +301,29 @@ class AccelerometerInput:
         ----------
         i2c : busio.I2C
             I2C bus object.
+        int_pin : board pin or None
+            Pin wired to ADXL345 INT1. With it, the FIFO is only read when
+            the activity or watermark interrupt fires.
+        use_fifo : bool
+            If True, stream samples through the ADXL345 FIFO.
+        bus_stats : BusStats or None
+            Counters that record this device's I2C traffic (see i2c_bus.py).
         """
         self.accelerometer = adafruit_adxl34x.ADXL345(i2c)
 
+        # Raw register access (data rate, range, FIFO) on top of the driver
+        self.stream = ADXL345Stream(i2c, int_pin=int_pin, stats=bus_stats)
+        self.stream.configure(fifo=use_fifo)
+        self.use_fifo = use_fifo
+
+        # Streaming classifier with thresholds in raw counts, converted once
+        self.classifier = TiltClassifier(
+            counts_from_ms2(ACCEL_TILT_THRESHOLD),
+            counts_from_ms2(ACCEL_TILT_RELEASE_THRESHOLD),
+        )
+        self.sample_period_ms = int(1000 / ACCEL_DATA_RATE)
+        self.last_direction = None
+
     def get_acceleration(self):
         """
         Get current acceleration values.
@@ -173,65 +339,160 @@ class AccelerometerInput:
         """
         Detect current tilt direction.
 
+        Every new sample (all queued FIFO entries in FIFO mode) is fed to
+        the classifier; see self.classifier for confidence and onset time.
+
         Returns
         -------
         str or None
             "left", "right", "up", "down", or None if no clear tilt.
         """
-        x, y, z = self.accelerometer.acceleration
+        stream = self.stream
+        classifier = self.classifier
+        now_ms = supervisor.ticks_ms()
+
+        if not self.use_fifo:
+            raw = stream.read_raw()
+            classifier.update(raw[0], raw[1], now_ms)
+            return classifier.direction
+
+        if stream.pending():
+            samples = stream.samples
+            count = stream.drain()
+            period_ms = self.sample_period_ms
+            confirmed = None
+
+            # FIFO entries are oldest first; the newest was taken about now
+            for i in range(count):
+                timestamp_ms = now_ms - (count - 1 - i) * period_ms
+                direction = classifier.update(
+                    samples[3 * i], samples[3 * i + 1], timestamp_ms
+                )
+                if confirmed is None:
+                    confirmed = direction
+
+            # A tilt confirmed and released within one burst still counts
+            if confirmed is not None:
+                return confirmed
+
+        return classifier.direction
+
+    def service(self):
+        """
+        Drain new samples into the classifier.
 
-        # Check X-axis (left/right)
-        if x < -ACCEL_TILT_THRESHOLD:
-            return "left"
-        elif x > ACCEL_TILT_THRESHOLD:
-            return "right"
+        Scheduled on the I2CBus so it runs in the gap right after a display
+        refresh instead of contending with one (or from input_task when the
+        screen hasn't refreshed for a while). The latest result is kept in
+        self.last_direction.
+        """
+        self.last_direction = self.detect_tilt_direction()
 
-        # Check Y-axis (forward/back = up/down on screen)
-        if y > ACCEL_TILT_THRESHOLD:
-            return "up"
-        elif y < -ACCEL_TILT_THRESHOLD:
-            return "down"
+    def reset(self):
+        """Forget queued samples and any tilt in progress (e.g. at a new prompt)."""
+        self.classifier.reset()
+        self.last_direction = None
+        if self.use_fifo:
+            self.stream.flush()
 
-        return None
+    def deinit(self):
+        """Clean up resources."""
+        self.stream.deinit()
 
-    def wait_for_tilt(self, timeout=2.0):
-        """
-        Wait for a tilt gesture within timeout period.
 
-        Parameters
-        ----------
-        timeout : float
-            Maximum time to wait in seconds (default 2.0).
+# Quadrature step for each (previous state << 2 | new state), with state
+# = CLK << 1 | DT and 1 meaning the pin is pulled low. Clockwise runs
+# 0, 2, 3, 1, 0; impossible jumps (both pins changed) count as 0.
+_QUADRATURE_STEPS = (0, -1, 1, 0, 1, 0, 0, -1, -1, 0, 0, 1, 0, 1, -1, 0)
 
-        Returns
-        -------
-        str or None
-            Direction tilted ("left", "right", "up", "down") or None if timeout.
-        """
-        start_time = time.monotonic()
 
-        while time.monotonic() - start_time < timeout:
-            direction = self.detect_tilt_direction()
-            if direction is not None:
-                if DEBUG_PRINT_INPUTS:
-                    print(f"Tilt detected: {direction}")
-                return direction
-            time.sleep(0.05)  # Check 20 times per second
+class KeypadEncoder:
+    """
+    Quadrature encoder decoded in software, for boards without rotaryio.
+
+    keypad.Keys scans the CLK and DT pins in the background every
+    ENCODER_SCAN_INTERVAL and queues every edge, so reading `position`
+    only has to replay the queued edges through the quadrature table.
+    Has the same position/deinit interface as rotaryio.IncrementalEncoder.
+
+    Parameters
+    ----------
+    clk_pin : board pin
+        Pin connected to encoder CLK (A).
+    dt_pin : board pin
+        Pin connected to encoder DT (B).
+    divisor : int
+        Quadrature transitions per detent.
+    """
+
+    def __init__(self, clk_pin, dt_pin, divisor=ENCODER_DIVISOR):
+        self.keys = keypad.Keys(
+            (clk_pin, dt_pin),
+            value_when_pressed=False,
+            pull=True,
+            interval=ENCODER_SCAN_INTERVAL,
+            max_events=ENCODER_MAX_EVENTS,
+        )
+        # Reused for every edge so decoding never allocates
+        self.event = keypad.Event()
+        self.divisor = divisor
+        self.state = 0  # Both pins high at a detent
+        self.steps = 0  # Quadrature steps since the last detent
+        self.detents = 0
+
+    @property
+    def position(self):
+        """Detents turned since start (positive is clockwise)."""
+        event = self.event
+        events = self.keys.events
+        state = self.state
+        steps = self.steps
+        while events.get_into(event):
+            # CLK is key 0 (bit 1), DT key 1 (bit 0)
+            bit = 2 if event.key_number == 0 else 1
+            new_state = state | bit if event.pressed else state & ~bit
+            steps += _QUADRATURE_STEPS[state << 2 | new_state]
+            state = new_state
+
+            # Back at rest: count the detent(s) just completed, rounding so
+            # a lost edge still counts and a jiggle back and forth doesn't
+            if state == 0 and steps:
+                half = self.divisor // 2
+                if steps > 0:
+                    self.detents += (steps + half) // self.divisor
+                else:
+                    self.detents -= (half - steps) // self.divisor
+                steps = 0
+        if events.overflowed:
+            # Edges were lost: the next detent may be off by one
+            events.overflowed = False
+        self.state = state
+        self.steps = steps
+        return self.detents
 
-        if DEBUG_PRINT_INPUTS:
-            print("Tilt timeout")
-        return None
+    def deinit(self):
+        """Stop scanning the pins."""
+        self.keys.deinit()
 
 
 class RotaryEncoderButton:
     """
-    Handles rotary encoder button input.
-
-    Note: This simplified version only handles the button.
-    Full rotary encoder support (CLK/DT pins) can be added later.
+    Handles rotary encoder button and rotation input.
+
+    The button is scanned by CircuitPython's native keypad.Keys in the
+    background: it debounces the pin and queues timestamped press/release
+    events, so presses between frames are never missed. Callers drain the
+    queue with was_pressed() once per frame. Boards without keypad fall
+    back to edge detection on a DigitalInOut each time the queue is polled.
+
+    Rotation is counted in hardware by rotaryio.IncrementalEncoder, so
+    get_delta() is a single position read and cheap enough for every frame.
+    Ports without rotaryio (the ESP32-C3) decode it from keypad edges
+    instead (KeypadEncoder). Without CLK/DT pins, or neither module,
+    get_delta() always returns 0.
     """
 
-    def __init__(self, pin=board.D7):
+    def __init__(self, pin=board.D7, clk_pin=None, dt_pin=None):
         """
         Initialize button on rotary encoder.
 
@@ -239,13 +500,99 @@ class RotaryEncoderButton:
         ----------
         pin : board pin
             Pin connected to encoder button (default D7).
+        clk_pin : board pin or None
+            Pin connected to encoder CLK (A), or None for button only.
+        dt_pin : board pin or None
+            Pin connected to encoder DT (B), or None for button only.
         """
-        self.button = DigitalInOut(pin)
-        self.button.direction = Direction.INPUT
-        self.button.pull = Pull.UP
+        self.encoder = None
+        if clk_pin is not None and dt_pin is not None:
+            if rotaryio is not None:
+                self.encoder = rotaryio.IncrementalEncoder(
+                    clk_pin, dt_pin, divisor=ENCODER_DIVISOR
+                )
+            elif keypad is not None:
+                self.encoder = KeypadEncoder(clk_pin, dt_pin)
+            elif DEBUG_PRINT_INPUTS:
+                print("rotaryio and keypad not available, rotation disabled")
+        self.last_position = 0
+
+        self.keys = None
+        self.button = None
+
+        if keypad is not None:
+            self.keys = keypad.Keys(
+                (pin,),
+                value_when_pressed=False,
+                pull=True,
+                interval=BUTTON_DEBOUNCE_INTERVAL,
+                max_events=BUTTON_MAX_EVENTS,
+            )
+            # Reused for every event so draining the queue never allocates
+            self.event = keypad.Event()
+            # Let the first background scan run so is_pressed() sees a
+            # button that is already held at boot
+            time.sleep(BUTTON_DEBOUNCE_INTERVAL * 2)
+        else:
+            self.button = DigitalInOut(pin)
+            self.button.direction = Direction.INPUT
+            self.button.pull = Pull.UP
 
         # Track state for edge detection
         self.prev_state = True  # Not pressed (pull-up)
+        self.held = False
+        self.pending_presses = 0
+        self.last_press_ms = 0
+
+    def poll(self):
+        """
+        Drain queued button events and update the held state.
+
+        Returns
+        -------
+        int
+            Number of presses waiting to be consumed by was_pressed().
+        """
+        if self.keys is not None:
+            event = self.event
+            events = self.keys.events
+            while events.get_into(event):
+                if event.pressed:
+                    self.held = True
+                    self.pending_presses += 1
+                    self.last_press_ms = event.timestamp
+                else:
+                    self.held = False
+        else:
+            state = self.button.value
+            if self.prev_state and not state:
+                self.pending_presses += 1
+                self.last_press_ms = int(time.monotonic() * 1000)
+            self.prev_state = state
+            self.held = not state
+
+        return self.pending_presses
+
+    def was_pressed(self):
+        """
+        Consume one queued press, if any.
+
+        Returns
+        -------
+        bool
+            True if the button was pressed since the last call.
+        """
+        if self.poll() > 0:
+            self.pending_presses -= 1
+            if DEBUG_PRINT_INPUTS:
+                print("Encoder button pressed")
+            return True
+        return False
+
+    def clear_events(self):
+        """Discard presses queued before now (e.g. from a previous screen)."""
+        self.poll()
+        self.pending_presses = 0
 
     def is_pressed(self):
         """
@@ -256,24 +603,35 @@ class RotaryEncoderButton:
         bool
             True if pressed (active LOW with pull-up).
         """
-        return not self.button.value
+        self.poll()
+        return self.held
 
-    def wait_for_press(self):
-        """Block until button is pressed (with debouncing)."""
-        # Wait for button to be released first
-        while self.is_pressed():
-            time.sleep(0.01)
+    def get_delta(self):
+        """
+        Get encoder detents turned since the last call.
 
-        # Wait for button to be pressed
-        while not self.is_pressed():
-            time.sleep(0.01)
+        Returns
+        -------
+        int
+            Positive for clockwise, negative for counter-clockwise, 0 if the
+            encoder hasn't moved (or rotation isn't available).
+        """
+        if self.encoder is None:
+            return 0
 
-        # Debounce delay
-        time.sleep(0.05)
+        position = self.encoder.position
+        delta = position - self.last_position
+        self.last_position = position
 
-        if DEBUG_PRINT_INPUTS:
-            print("Encoder button pressed")
+        if delta and DEBUG_PRINT_INPUTS:
+            print(f"Encoder turned {delta:+d}")
+        return delta
 
     def deinit(self):
         """Clean up resources."""
-        self.button.deinit()
+        if self.keys is not None:
+            self.keys.deinit()
+        else:
+            self.button.deinit()
+        if self.encoder is not None:
+            self.encoder.deinit()
@@ -0,0 +1,361 @@
+# input_trace.py
+"""
+Record a play session's inputs and replay them for regression runs.
+
+Everything the game reacts to goes through ctx.events, so a session is
+fully described by the random seed and the events input_task queued, with
+the game tick (ctx.ticks, see game_tasks.py) each was queued on.
+Recording logs exactly that into a preallocated buffer; replay feeds the
+same events back on the same ticks while input_task keeps scanning the
+hardware (so the scan and I2C load stay the same) but drops what it
+reads. While recording or replaying, the game's spawn and gesture timing
+runs on ticks rather than wall-clock time (fixed_step), so with the same
+seed the same shapes, targets, gesture prompts and hits come up however
+fast or slow the frames are drawn, and the frame timings of two builds can
+be compared on the same session. In these modes only, frames slower than
+FRAME_DELAY slow the game down instead of making it skip ahead.
+
+Select the mode with INPUT_TRACE_MODE in game_config.py. A recording is
+written to INPUT_TRACE_PATH when the game stops; CIRCUITPY is read-only to
+code unless boot.py remounts it, so otherwise it is sent like an ADC trace
+(usb_cdc.data, or base64 between markers on the console). Save the console
+block to a file and copy it to INPUT_TRACE_PATH to replay it; load()
+accepts both the binary and a console log.
+
+Trace format (little-endian):
+    header  "<4sBI"   magic b"DNIN", version, random seed
+    records "<IBhH"   game tick the event was queued on, event kind,
+                      event value, ms between the event's timestamp and
+                      queueing
+    a final record of kind TRACE_END marks the tick the session stopped on
+"""
+
+import struct
+import time
+
+import asyncio
+import supervisor
+from game_config import (
+    INPUT_SCAN_INTERVAL,
+    INPUT_TRACE_CAPACITY,
+    INPUT_TRACE_PATH,
+    INPUT_TRACE_SEED,
+)
+
+# usb_cdc.data is only present when enabled in boot.py
+try:
+    import usb_cdc
+except ImportError:
+    usb_cdc = None
+
+TRACE_MAGIC = b"DNIN"
+TRACE_VERSION = 2
+TRACE_HEADER_FORMAT = "<4sBI"
+TRACE_RECORD_FORMAT = "<IBhH"
+TRACE_HEADER_SIZE = struct.calcsize(TRACE_HEADER_FORMAT)
+TRACE_RECORD_SIZE = struct.calcsize(TRACE_RECORD_FORMAT)
+TRACE_END = 0  # Record kind marking the end of the session
+
+# Console fallback framing (base64 lines between markers)
+TRACE_BEGIN_MARKER = "--- DNIN BEGIN ---"
+TRACE_END_MARKER = "--- DNIN END ---"
+
+# supervisor.ticks_ms() wraps at 2**29
+_TICKS_MASK = (1 << 29) - 1
+_MAX_LAG_MS = 0xFFFF
+
+
+def _now_ms():
+    return time.monotonic_ns() // 1_000_000
+
+
+def discard_event(kind, value=0, timestamp_ms=None):
+    """Stand-in for EventQueue.put that drops the event (live inputs on replay)."""
+
+
+def new_seed():
+    """
+    Pick a random seed for a recorded session.
+
+    Returns
+    -------
+    int
+        INPUT_TRACE_SEED if set, otherwise 32 bits from the hardware RNG.
+    """
+    if INPUT_TRACE_SEED is not None:
+        return INPUT_TRACE_SEED
+    import os
+
+    return int.from_bytes(os.urandom(4), "little")
+
+
+class InputRecorder:
+    """
+    Records the events input_task queues, with the session's seed.
+
+    Records go into one preallocated buffer, so recording never allocates
+    during play. When it is full, later events are counted but not kept
+    (a replay has to start from the beginning, so the oldest are the ones
+    worth keeping).
+
+    Parameters
+    ----------
+    seed : int or None
+        Random seed the game is started with (new_seed() if None).
+    capacity : int
+        Maximum number of events kept.
+    """
+
+    # Game logic runs on ticks while this trace is active (see game_tasks.py)
+    fixed_step = True
+
+    def __init__(self, seed=None, capacity=INPUT_TRACE_CAPACITY):
+        self.seed = new_seed() if seed is None else seed
+        self.capacity = capacity
+        self.buffer = bytearray(TRACE_HEADER_SIZE + (capacity + 1) * TRACE_RECORD_SIZE)
+        struct.pack_into(
+            TRACE_HEADER_FORMAT, self.buffer, 0, TRACE_MAGIC, TRACE_VERSION, self.seed
+        )
+        self.count = 0
+        self.dropped = 0
+        self.ctx = None
+        self.end_tick = None
+
+    def record(self, kind, value, timestamp_ms):
+        """
+        Log one event on the current game tick.
+
+        Parameters
+        ----------
+        kind : int
+            Event kind (EVENT_* constant).
+        value : int
+            Event value.
+        timestamp_ms : int or None
+            The event's supervisor.ticks_ms() timestamp (now if None).
+        """
+        if self.count == self.capacity:
+            self.dropped += 1
+            return
+        lag = 0
+        if timestamp_ms is not None:
+            lag = min((supervisor.ticks_ms() - timestamp_ms) & _TICKS_MASK, _MAX_LAG_MS)
+        struct.pack_into(
+            TRACE_RECORD_FORMAT,
+            self.buffer,
+            TRACE_HEADER_SIZE + self.count * TRACE_RECORD_SIZE,
+            0 if self.ctx is None else self.ctx.ticks,
+            kind,
+            value,
+            lag,
+        )
+        self.count += 1
+
+    def input_sink(self, events):
+        """
+        Wrap events.put so every input event is also recorded.
+
+        Parameters
+        ----------
+        events : EventQueue
+            The game's input queue (ctx.events).
+
+        Returns
+        -------
+        callable
+            Drop-in replacement for events.put, used by input_task.
+        """
+        put = events.put
+        record = self.record
+
+        def recording_put(kind, value=0, timestamp_ms=None):
+            record(kind, value, timestamp_ms)
+            put(kind, value, timestamp_ms)
+
+        return recording_put
+
+    async def run(self, ctx):
+        """Follow the game clock (a task beside the game, see run_tasks)."""
+        self.ctx = ctx
+
+    def encode(self):
+        """
+        Close the session and pack it into the trace format.
+
+        Returns
+        -------
+        memoryview
+            Header, one record per event and the TRACE_END record.
+        """
+        if self.end_tick is None:
+            self.end_tick = 0 if self.ctx is None else self.ctx.ticks
+        end = TRACE_HEADER_SIZE + self.count * TRACE_RECORD_SIZE
+        struct.pack_into(
+            TRACE_RECORD_FORMAT,
+            self.buffer,
+            end,
+            self.end_tick,
+            TRACE_END,
+            0,
+            0,
+        )
+        return memoryview(self.buffer)[: end + TRACE_RECORD_SIZE]
+
+    def dump(self):
+        """
+        Send the recording to the host in one transfer.
+
+        Uses the binary usb_cdc.data channel when it is enabled, otherwise
+        prints the trace as base64 between TRACE_BEGIN/END markers on the
+        console.
+        """
+        payload = self.encode()
+
+        if usb_cdc is not None and usb_cdc.data is not None:
+            usb_cdc.data.write(payload)
+            print(f"Input trace sent on usb_cdc.data ({len(payload)} bytes)")
+            return
+
+        import binascii
+
+        print(TRACE_BEGIN_MARKER)
+        # 57 raw bytes per line keeps base64 lines at 76 characters
+        for offset in range(0, len(payload), 57):
+            print(binascii.b2a_base64(payload[offset : offset + 57]).decode(), end="")
+        print(TRACE_END_MARKER)
+
+    def finish(self, path=INPUT_TRACE_PATH):
+        """
+        Save the recording to path, or send it to the host if that fails.
+
+        Parameters
+        ----------
+        path : str
+            File to write (needs a writable filesystem).
+        """
+        payload = self.encode()
+        print(
+            f"Recorded {self.count} input events, seed {self.seed}"
+            f" ({self.dropped} over capacity)"
+        )
+        try:
+            with open(path, "wb") as f:
+                f.write(payload)
+            print(f"Input trace written to {path} ({len(payload)} bytes)")
+        except OSError as e:
+            print(f"Can't write {path} ({e}), sending the trace instead")
+            self.dump()
+
+
+def extract_payload(data):
+    """
+    Return the binary trace from raw bytes or a console log.
+
+    Parameters
+    ----------
+    data : bytes
+        A binary trace, or console output containing the base64 block
+        between TRACE_BEGIN_MARKER and TRACE_END_MARKER.
+
+    Returns
+    -------
+    bytes
+        The binary trace.
+    """
+    if data[:4] == TRACE_MAGIC:
+        return data
+
+    import binascii
+
+    text = data.decode()
+    start = text.find(TRACE_BEGIN_MARKER)
+    end = text.find(TRACE_END_MARKER, start)
+    if start < 0 or end < 0:
+        raise ValueError("No DNIN trace found in input")
+    body = text[start + len(TRACE_BEGIN_MARKER) : end]
+    return binascii.a2b_base64("".join(body.split()))
+
+
+class InputPlayer:
+    """
+    Replays a recorded session into ctx.events.
+
+    Live inputs are still scanned but dropped (see input_sink), and run()
+    queues each recorded event as soon as the game clock reaches its
+    recorded tick, before the game task looks at the queue again. When the
+    session's end is reached the game is stopped and the frame rate
+    printed.
+
+    Parameters
+    ----------
+    payload : bytes
+        A binary trace (see extract_payload).
+    """
+
+    # Game logic runs on ticks while this trace is active (see game_tasks.py)
+    fixed_step = True
+
+    def __init__(self, payload):
+        magic, version, seed = struct.unpack_from(TRACE_HEADER_FORMAT, payload, 0)
+        if magic != TRACE_MAGIC:
+            raise ValueError(f"Bad input trace magic {magic!r}")
+        if version != TRACE_VERSION:
+            raise ValueError(f"Unsupported input trace version {version}")
+        self.seed = seed
+        self.payload = payload
+        self.count = (len(payload) - TRACE_HEADER_SIZE) // TRACE_RECORD_SIZE
+        self.replayed = 0
+        self.start_ms = _now_ms()
+        self.end_ms = None
+
+    @classmethod
+    def load(cls, path=INPUT_TRACE_PATH):
+        """Read a trace from a binary file or a saved console log."""
+        with open(path, "rb") as f:
+            return cls(extract_payload(f.read()))
+
+    def input_sink(self, events):
+        """Replacement for events.put that drops live inputs."""
+        return discard_event
+
+    async def run(self, ctx):
+        """
+        Queue the recorded events on their ticks, then stop the game.
+
+        Runs as a task beside the game (see run_tasks). It checks the clock
+        every INPUT_SCAN_INTERVAL, several times per tick, so an event is
+        queued while the game task sleeps through the tick it was recorded
+        on, just like input_task queued it.
+        """
+        events = ctx.events
+        payload = self.payload
+        self.start_ms = _now_ms()
+        frames_start = ctx.frames_rendered
+
+        for index in range(self.count):
+            tick, kind, value, lag = struct.unpack_from(
+                TRACE_RECORD_FORMAT,
+                payload,
+                TRACE_HEADER_SIZE + index * TRACE_RECORD_SIZE,
+            )
+            while ctx.ticks < tick:
+                await asyncio.sleep(INPUT_SCAN_INTERVAL)
+            if kind == TRACE_END:
+                break
+            events.put(kind, value, (supervisor.ticks_ms() - lag) & _TICKS_MASK)
+            self.replayed += 1
+
+        self.end_ms = _now_ms()
+        seconds = (self.end_ms - self.start_ms) / 1000
+        frames = ctx.frames_rendered - frames_start
+        print(
+            f"\nReplayed {self.replayed} input events (seed {self.seed}): "
+            f"{ctx.ticks} ticks, {frames} frames in {seconds:.2f} s "
+            f"({frames / max(seconds, 0.001):.1f} FPS)"
+        )
+        ctx.stop()
+
+    def finish(self):
+        """Report an interrupted replay (a finished one reports itself)."""
+        if self.end_ms is None:
+            print(f"Replay stopped after {self.replayed} of {self.count - 1} events")
@@ -0,0 +1,301 @@
+# mux_calibration.py
+"""
+Per-channel multiplexer calibration persisted to microcontroller.nvm.
+
+Every unit's wiring differs: channels settle at different speeds and sit at
+slightly different pull-up voltages. calibrate_multiplexer() measures each
+channel's released baseline, noise and settling time once, derives a
+threshold per channel plus the minimum safe settle time, and stores them in
+NVM. MultiplexerInput loads them at boot through load_calibration().
+
+Run with all switches released, e.g. from the REPL:
+
+    >>> from input_handler import MultiplexerInput
+    >>> from mux_calibration import calibrate_multiplexer
+    >>> calibrate_multiplexer(MultiplexerInput())
+"""
+
+import struct
+import time
+
+import microcontroller
+from game_config import (
+    MUX_CAL_MAX_SETTLE,
+    MUX_CAL_MIN_BASELINE,
+    MUX_CAL_MIN_MARGIN,
+    MUX_CAL_MIN_SETTLE,
+    MUX_CAL_NOISE_FACTOR,
+    MUX_CAL_NVM_OFFSET,
+    MUX_CAL_SAMPLES,
+    MUX_CAL_SETTLE_BAND,
+    MUX_CAL_SETTLE_SAFETY,
+    MUX_CAL_STABLE_READS,
+    MUX_CAPTURE_RATE,
+    MUX_VOLTAGE_THRESHOLD,
+)
+
+# NVM record: magic, version, 8 thresholds, settle time (us), checksum
+_MAGIC = b"DMUX"
+_VERSION = 1
+_RECORD_FORMAT = "<4sB8HHH"
+_RECORD_SIZE = struct.calcsize(_RECORD_FORMAT)
+
+# Long settle used while measuring, well above anything the wiring needs
+_MEASURE_SETTLE = MUX_CAL_MAX_SETTLE * 2
+
+
+def _checksum(thresholds, settle_us):
+    """Simple 16-bit checksum over the stored values."""
+    return (sum(thresholds) + settle_us + _VERSION) & 0xFFFF
+
+
+def load_calibration():
+    """
+    Load per-channel calibration from NVM.
+
+    Returns
+    -------
+    tuple or None
+        (thresholds, settle_time) with 8 thresholds in 16-bit AnalogIn units
+        and the settle time in seconds, or None if NVM holds no valid record.
+    """
+    nvm = microcontroller.nvm
+    if nvm is None or len(nvm) < MUX_CAL_NVM_OFFSET + _RECORD_SIZE:
+        return None
+
+    record = nvm[MUX_CAL_NVM_OFFSET : MUX_CAL_NVM_OFFSET + _RECORD_SIZE]
+    fields = struct.unpack(_RECORD_FORMAT, record)
+    magic, version = fields[0], fields[1]
+    thresholds = list(fields[2:10])
+    settle_us, checksum = fields[10], fields[11]
+
+    if magic != _MAGIC or version != _VERSION:
+        return None
+    if checksum != _checksum(thresholds, settle_us):
+        return None
+
+    return (thresholds, settle_us / 1_000_000)
+
+
+def save_calibration(thresholds, settle_time):
+    """
+    Store per-channel calibration in NVM.
+
+    Parameters
+    ----------
+    thresholds : list
+        8 ADC thresholds in 16-bit AnalogIn units.
+    settle_time : float
+        Minimum safe settle time in seconds.
+    """
+    nvm = microcontroller.nvm
+    if nvm is None or len(nvm) < MUX_CAL_NVM_OFFSET + _RECORD_SIZE:
+        raise RuntimeError("Not enough NVM to store mux calibration")
+
+    settle_us = int(settle_time * 1_000_000)
+    record = struct.pack(
+        _RECORD_FORMAT,
+        _MAGIC,
+        _VERSION,
+        *thresholds,
+        settle_us,
+        _checksum(thresholds, settle_us),
+    )
+    nvm[MUX_CAL_NVM_OFFSET : MUX_CAL_NVM_OFFSET + _RECORD_SIZE] = record
+
+
+def clear_calibration():
+    """Invalidate the stored calibration so defaults are used at next boot."""
+    nvm = microcontroller.nvm
+    if nvm is not None and len(nvm) >= MUX_CAL_NVM_OFFSET + _RECORD_SIZE:
+        end = MUX_CAL_NVM_OFFSET + len(_MAGIC)
+        nvm[MUX_CAL_NVM_OFFSET:end] = bytes(len(_MAGIC))
+
+
+def _read_raw(mux):
+    """Read one raw sample in 16-bit AnalogIn units."""
+    if mux.buffered_sig is not None:
+        samples = mux.samples
+        mux.buffered_sig.readinto(samples)
+        return samples[0] << mux.sample_shift
+    return mux.analog_sig.value
+
+
+def measure_baseline(mux, channel, num_samples=MUX_CAL_SAMPLES):
+    """
+    Measure the released level and noise of one channel.
+
+    Parameters
+    ----------
+    mux : MultiplexerInput
+        Multiplexer to measure.
+    channel : int
+        Channel number (0-7).
+    num_samples : int
+        Number of samples to average (default MUX_CAL_SAMPLES).
+
+    Returns
+    -------
+    tuple
+        (baseline, noise) in 16-bit AnalogIn units, where noise is the
+        peak-to-peak spread of the readings.
+    """
+    mux.set_channel(channel)
+    time.sleep(_MEASURE_SETTLE)
+
+    total = 0
+    min_raw = 65535
+    max_raw = 0
+    for _ in range(num_samples):
+        raw = _read_raw(mux)
+        total += raw
+        if raw < min_raw:
+            min_raw = raw
+        if raw > max_raw:
+            max_raw = raw
+
+    return (total // num_samples, max_raw - min_raw)
+
+
+def measure_settle_time(mux, channel, baseline, band):
+    """
+    Measure how long a channel takes to settle after switching to it.
+
+    The previous channel in scan order is selected first, because that is
+    the transition read_switch() sees during scan_all().
+
+    Parameters
+    ----------
+    mux : MultiplexerInput
+        Multiplexer to measure.
+    channel : int
+        Channel number (0-7).
+    baseline : int
+        Settled level of the channel in 16-bit AnalogIn units.
+    band : int
+        Readings within baseline +/- band count as settled.
+
+    Returns
+    -------
+    float
+        Settle time in seconds (MUX_CAL_MAX_SETTLE if it never settled).
+    """
+    mux.set_channel((channel - 1) % 8)
+    time.sleep(_MEASURE_SETTLE)
+
+    if mux.buffered_sig is not None:
+        # Whole transition captured in one call; find where it stays in band
+        samples = mux.samples
+        shift = mux.sample_shift
+        mux.set_channel(channel)
+        mux.buffered_sig.readinto(samples)
+
+        settled_index = len(samples)
+        for i in range(len(samples) - 1, -1, -1):
+            if abs((samples[i] << shift) - baseline) > band:
+                break
+            settled_index = i
+        if settled_index >= len(samples) - MUX_CAL_STABLE_READS:
+            return MUX_CAL_MAX_SETTLE
+        return settled_index / MUX_CAPTURE_RATE
+
+    analog_sig = mux.analog_sig
+    timeout_ns = int(MUX_CAL_MAX_SETTLE * 1_000_000_000)
+    stable_reads = 0
+    settled_ns = 0
+
+    mux.set_channel(channel)
+    start_ns = time.monotonic_ns()
+    while True:
+        raw = analog_sig.value
+        now_ns = time.monotonic_ns() - start_ns
+        if abs(raw - baseline) <= band:
+            if stable_reads == 0:
+                settled_ns = now_ns
+            stable_reads += 1
+            if stable_reads >= MUX_CAL_STABLE_READS:
+                return settled_ns / 1_000_000_000
+        else:
+            stable_reads = 0
+        if now_ns > timeout_ns:
+            return MUX_CAL_MAX_SETTLE
+
+
+def derive_threshold(baseline, noise):
+    """
+    Derive a press threshold from a channel's released level and noise.
+
+    The threshold sits far enough below the baseline that released noise
+    never crosses it, while staying as close as possible so the flicker of
+    a pressed switch is still caught.
+
+    Returns
+    -------
+    int or None
+        Threshold in 16-bit AnalogIn units, or None if the baseline is too
+        low to be a released switch (pressed during calibration or miswired).
+    """
+    if baseline < MUX_CAL_MIN_BASELINE:
+        return None
+
+    margin = max(MUX_CAL_MIN_MARGIN, noise * MUX_CAL_NOISE_FACTOR)
+    return max(baseline - margin, MUX_CAL_MIN_BASELINE // 2)
+
+
+def calibrate_multiplexer(mux, save=True):
+    """
+    Calibrate every channel, store the result and apply it to mux.
+
+    All switches must be released while this runs. Channels that do not
+    look released keep the default MUX_VOLTAGE_THRESHOLD.
+
+    Parameters
+    ----------
+    mux : MultiplexerInput
+        Multiplexer to calibrate.
+    save : bool
+        If True, write the calibration to NVM (default True).
+
+    Returns
+    -------
+    tuple
+        (thresholds, settle_time) as applied to mux.
+    """
+    print("\n=== MUX CALIBRATION ===")
+    print("Keep all switches released...")
+    print("Ch | Baseline | Noise | Settle(us) | Threshold")
+    print("-" * 50)
+
+    thresholds = []
+    worst_settle = MUX_CAL_MIN_SETTLE
+
+    for channel in range(8):
+        baseline, noise = measure_baseline(mux, channel)
+        band = noise + MUX_CAL_SETTLE_BAND
+        settle = measure_settle_time(mux, channel, baseline, band)
+        threshold = derive_threshold(baseline, noise)
+
+        if threshold is None:
+            threshold = MUX_VOLTAGE_THRESHOLD
+            status = " (not released, using default)"
+        else:
+            status = ""
+
+        thresholds.append(threshold)
+        if settle > worst_settle:
+            worst_settle = settle
+
+        print(
+            f" {channel} | {baseline:8d} | {noise:5d} | {int(settle * 1_000_000):10d} | {threshold:9d}{status}"
+        )
+
+    settle_time = min(worst_settle * MUX_CAL_SETTLE_SAFETY, MUX_CAL_MAX_SETTLE)
+    print(f"Settle time: {int(settle_time * 1_000_000)} us per channel")
+
+    if save:
+        save_calibration(thresholds, settle_time)
+        print("✓ Calibration saved to NVM")
+
+    mux.apply_calibration(thresholds, settle_time)
+    mux.is_calibrated = True
+    return (thresholds, settle_time)
@@ -1,6 +1,17 @@
 # This file was made with the use of various A.I. LLMs, specifically, Claude sonnet 4.5
 # neopixel_manager.py
-"""NeoPixel health indicator management."""
+"""
+NeoPixel health indicator management.
+
+Every show() bit-bangs the whole strip with interrupts disabled, so
+NeoPixelManager keeps a copy of what is on the LEDs and only marks the
+strip dirty when a pixel actually changes; show() is a no-op otherwise.
+Animations are generators that yield the delay until their next step.
+tick() advances the running animation by at most one step per call, so the
+main loop keeps rendering and scanning inputs while the LEDs animate.
+"""
+
+import time
 
 import board
 import neopixel
@@ -9,9 +20,21 @@ from game_config import (
     COLOR_HEALTH_OFF,
     COLOR_POWER_ON,
     NEOPIXEL_BRIGHTNESS,
+    NEOPIXEL_BRIGHTNESS_STEP,
+    NEOPIXEL_MAX_BRIGHTNESS,
+    NEOPIXEL_MIN_BRIGHTNESS,
     NUM_NEOPIXELS,
 )
 
+# Rainbow cycle used by the victory animation
+VICTORY_COLORS = (
+    (255, 0, 0),  # Red
+    (255, 127, 0),  # Orange
+    (255, 255, 0),  # Yellow
+    (0, 255, 0),  # Green
+    (0, 0, 255),  # Blue
+)
+
 
 class NeoPixelManager:
     """
@@ -34,18 +57,58 @@ class NeoPixelManager:
             pin, NUM_NEOPIXELS, brightness=NEOPIXEL_BRIGHTNESS, auto_write=False
         )
 
+        # What is currently latched on the strip (None forces the first write)
+        self.colors = [None] * NUM_NEOPIXELS
+        self.dirty = False
+
+        self.health = 5
+        self.animation = None
+        self.next_step_time = 0
+
         # Turn on power indicator
-        self.pixels[0] = COLOR_POWER_ON
+        self.set_pixel(0, COLOR_POWER_ON)
 
         # Initialize all health LEDs to full
         self.set_health(5)
 
+    def set_pixel(self, index, color):
+        """
+        Set one LED, marking the strip dirty only if the color changed.
+
+        Parameters
+        ----------
+        index : int
+            LED index (0-5).
+        color : tuple
+            (r, g, b) color.
+        """
+        if self.colors[index] != color:
+            self.colors[index] = color
+            self.pixels[index] = color
+            self.dirty = True
+
+    def show(self):
+        """
+        Write the strip if any pixel changed since the last write.
+
+        Returns
+        -------
+        bool
+            True if the strip was written.
+        """
+        if not self.dirty:
+            return False
         self.pixels.show()
+        self.dirty = False
+        return True
 
     def set_health(self, health):
         """
         Set health LEDs based on current health value.
 
+        While an animation is running the new value is only remembered and
+        shown once the animation finishes.
+
         Parameters
         ----------
         health : int
@@ -57,22 +120,96 @@ class NeoPixelManager:
         if health > 5:
             health = 5
 
+        self.health = health
+        if self.animation is None:
+            self._draw_health()
+            self.show()
+
+    def _draw_health(self):
+        """Put the power and health colors back on the LEDs (not shown)."""
+        self.set_pixel(0, COLOR_POWER_ON)
+
         # Update LEDs 1-5 (indices 1-5)
         for i in range(5):
             led_index = i + 1  # Offset by 1 (LED 0 is power indicator)
 
-            if i < health:
+            if i < self.health:
                 # This LED is still alive
-                self.pixels[led_index] = COLOR_HEALTH_FULL
+                self.set_pixel(led_index, COLOR_HEALTH_FULL)
             else:
                 # This LED is dead
-                self.pixels[led_index] = COLOR_HEALTH_OFF
+                self.set_pixel(led_index, COLOR_HEALTH_OFF)
 
-        self.pixels.show()
+    def adjust_brightness(self, steps):
+        """
+        Change LED brightness by a number of encoder detents.
+
+        Parameters
+        ----------
+        steps : int
+            Detents turned (positive = brighter, negative = dimmer).
+        """
+        brightness = self.pixels.brightness + steps * NEOPIXEL_BRIGHTNESS_STEP
+        if brightness < NEOPIXEL_MIN_BRIGHTNESS:
+            brightness = NEOPIXEL_MIN_BRIGHTNESS
+        if brightness > NEOPIXEL_MAX_BRIGHTNESS:
+            brightness = NEOPIXEL_MAX_BRIGHTNESS
+
+        if brightness != self.pixels.brightness:
+            self.pixels.brightness = brightness
+            self.dirty = True
+            self.show()
+
+    @property
+    def is_animating(self):
+        """True while an animation still has steps left."""
+        return self.animation is not None
+
+    def start_animation(self, steps):
+        """
+        Start an animation, replacing any that is running.
+
+        Parameters
+        ----------
+        steps : generator
+            Sets pixels with set_pixel() and yields the seconds to wait
+            before its next step.
+        """
+        self.animation = steps
+        self.next_step_time = time.monotonic()
+
+    def stop_animation(self):
+        """End the running animation and restore the health display."""
+        self.animation = None
+        self._draw_health()
+        self.show()
+
+    def tick(self, now=None):
+        """
+        Advance the running animation by one step if it is due.
+
+        Call once per main-loop iteration. Cheap when nothing is animating
+        and nothing changed.
+
+        Parameters
+        ----------
+        now : float or None
+            Current time.monotonic() (read here if not given).
+        """
+        if self.animation is not None:
+            if now is None:
+                now = time.monotonic()
+            if now >= self.next_step_time:
+                try:
+                    self.next_step_time = now + next(self.animation)
+                except StopIteration:
+                    self.animation = None
+                    self._draw_health()
+        self.show()
 
     def flash_health(self, times=3, delay=0.1):
         """
-        Flash health LEDs (for visual feedback).
+        Start flashing the health LEDs (for visual feedback).
 
         Parameters
         ----------
@@ -81,62 +218,41 @@ class NeoPixelManager:
         delay : float
             Delay between flashes in seconds (default 0.1).
         """
-        import time
-
-        # Store current health colors
-        original_colors = [self.pixels[i] for i in range(1, 6)]
+        self.start_animation(self._flash_steps(times, delay))
 
+    def _flash_steps(self, times, delay):
         for _ in range(times):
             # Turn off health LEDs
             for i in range(1, 6):
-                self.pixels[i] = COLOR_HEALTH_OFF
-            self.pixels.show()
-            time.sleep(delay)
+                self.set_pixel(i, COLOR_HEALTH_OFF)
+            yield delay
 
-            # Restore original colors
-            for i in range(1, 6):
-                self.pixels[i] = original_colors[i - 1]
-            self.pixels.show()
-            time.sleep(delay)
+            # Restore current health colors
+            self._draw_health()
+            yield delay
 
     def turn_off_all(self):
         """Turn off all LEDs (for cleanup/shutdown)."""
+        self.animation = None
         for i in range(NUM_NEOPIXELS):
-            self.pixels[i] = (0, 0, 0)
-        self.pixels.show()
+            self.set_pixel(i, (0, 0, 0))
+        self.show()
 
     def victory_animation(self, duration=2.0):
         """
-        Play a victory animation (level complete).
+        Start the victory animation (level complete).
 
         Parameters
         ----------
         duration : float
             Duration of animation in seconds (default 2.0).
         """
-        import time
+        self.start_animation(self._victory_steps(duration))
 
+    def _victory_steps(self, duration, step_delay=0.1):
         # Rainbow cycle through health LEDs
-        colors = [
-            (255, 0, 0),  # Red
-            (255, 127, 0),  # Orange
-            (255, 255, 0),  # Yellow
-            (0, 255, 0),  # Green
-            (0, 0, 255),  # Blue
-        ]
-
-        start_time = time.monotonic()
-        frame = 0
-
-        while time.monotonic() - start_time < duration:
+        num_colors = len(VICTORY_COLORS)
+        for frame in range(int(duration / step_delay)):
             for i in range(5):
-                color_index = (i + frame) % len(colors)
-                self.pixels[i + 1] = colors[color_index]
-
-            self.pixels.show()
-            time.sleep(0.1)
-            frame += 1
-
-        # Restore power indicator
-        self.pixels[0] = COLOR_POWER_ON
-        self.pixels.show()
+                self.set_pixel(i + 1, VICTORY_COLORS[(i + frame) % num_colors])
+            yield step_delay
@@ -0,0 +1,263 @@
+# soak.py
+"""
+Memory soak test: a bot plays the whole game and the heap is tracked.
+
+With SOAK_TEST = True in game_config.py, code.py starts the game with a
+SoakBot in place of the player (like a replay, see input_trace.py). It
+plays the rounds in SOAK_PLAN: a "win" round hits every shape and gesture
+through all levels to the victory screen, a "lose" round hits the shapes
+but tilts the wrong way at every prompt until the game is over. Both end
+in GameState.reset_game(), so later rounds replay levels the heap has
+already seen.
+
+At the start of every level the bot collects garbage and samples
+gc.mem_free(), the largest block that can still be allocated and the
+number of layers in the display's root group. After the last round the
+samples are printed as CSV and compared level by level across rounds
+(from the second round on where there are enough, as the first includes
+one-time allocations): free heap or the largest block shrinking by more
+than SOAK_LEAK_BYTES / SOAK_FRAGMENT_BYTES, or root group layers growing,
+are flagged.
+
+The same test runs on the desktop (simulator/run_game.py --soak), where
+gc.mem_free() counts the Python memory allocated since startup. That
+shows leaks, but not fragmentation: the desktop heap never fragments, so
+there the largest block always equals the free heap.
+"""
+
+import array
+import gc
+import time
+
+import asyncio
+from event_queue import EVENT_BUTTON, EVENT_SWITCH, EVENT_TILT, TILT_DIRECTIONS
+from game_config import (
+    INPUT_SCAN_INTERVAL,
+    NUM_LEVELS,
+    SOAK_FRAGMENT_BYTES,
+    SOAK_LEAK_BYTES,
+    SOAK_PLAN,
+    SOAK_PRESS_INTERVAL,
+    SOAK_REACTION_TIME,
+    SOAK_SEED,
+)
+from input_trace import discard_event
+
+CSV_HEADER = "soak,round,plan,level,free,largest,layers"
+
+
+def largest_free_block(granularity=64):
+    """
+    Find the largest block the heap can still allocate.
+
+    Binary search over bytearray allocations, each freed right away.
+
+    Parameters
+    ----------
+    granularity : int
+        Stop once the answer is known to within this many bytes.
+
+    Returns
+    -------
+    int
+        Size in bytes of the largest allocation that succeeded.
+    """
+    gc.collect()
+    low = 0
+    high = gc.mem_free()
+    while high - low > granularity:
+        size = (low + high) // 2
+        try:
+            block = bytearray(size)
+        except MemoryError:
+            high = size
+        else:
+            del block
+            low = size
+    gc.collect()
+    return low
+
+
+class SoakBot:
+    """
+    Plays SOAK_PLAN unattended and samples the heap at level boundaries.
+
+    Takes the place of an InputRecorder/InputPlayer on the GameContext:
+    live inputs are dropped and run() queues the bot's presses and tilts.
+
+    Parameters
+    ----------
+    plan : tuple of str
+        "win" or "lose" per round (default SOAK_PLAN).
+    seed : int
+        Random seed the game is started with.
+    """
+
+    def __init__(self, plan=SOAK_PLAN, seed=SOAK_SEED):
+        self.plan = plan
+        self.seed = seed
+        self.round = 0
+        self.done = False
+
+        # One sample per level played, plus the closing one; preallocated so
+        # the samples don't show up in the heap they measure
+        capacity = len(plan) * NUM_LEVELS + 1
+        self.count = 0
+        self.rounds = bytearray(capacity)
+        self.levels = bytearray(capacity)
+        self.layers = bytearray(capacity)
+        self.free = array.array("i", bytes(4 * capacity))
+        self.largest = array.array("i", bytes(4 * capacity))
+
+    def input_sink(self, events):
+        """Replacement for events.put that drops live inputs."""
+        return discard_event
+
+    def sample(self, ctx, level):
+        """Record the heap at the start of a level of the current round."""
+        i = self.count
+        if i == len(self.free):
+            return
+        self.largest[i] = largest_free_block()
+        self.free[i] = gc.mem_free()
+        self.rounds[i] = self.round
+        self.levels[i] = level
+        self.layers[i] = len(ctx.display.root_group)
+        self.count += 1
+
+    async def run(self, ctx):
+        """
+        Play the plan, then report and stop the game.
+
+        Runs as a task beside the game (see run_tasks).
+        """
+        events = ctx.events
+        sampled = False
+        pressed_shape = None
+        gesture_at = None
+        next_press = 0
+
+        while True:
+            await asyncio.sleep(INPUT_SCAN_INTERVAL)
+            now = time.monotonic()
+            state = ctx.game_state
+
+            # A level starts with both counters at zero
+            if (
+                state is not None
+                and state.shapes_completed == 0
+                and state.gestures_completed == 0
+                and not state.is_game_over
+            ):
+                if not sampled:
+                    sampled = True
+                    if state.level == 1 and self.count:
+                        self.round += 1
+                    self.sample(ctx, state.level)
+                    if self.round == len(self.plan):
+                        break
+            else:
+                sampled = False
+
+            shape = ctx.shape
+            gesture = ctx.gesture
+            if gesture is not None:
+                # Tilt after a human-like delay, the wrong way when losing
+                if gesture_at is None:
+                    gesture_at = now + SOAK_REACTION_TIME
+                elif now >= gesture_at:
+                    if self.plan[self.round] != "win":
+                        gesture = (gesture + 1) % len(TILT_DIRECTIONS)
+                    events.put(EVENT_TILT, gesture)
+                    gesture_at = now + SOAK_PRESS_INTERVAL
+            elif shape is not None:
+                gesture_at = None
+                # The press is handled after the next move, which stops on the
+                # target: press within one step of it for a perfect hit
+                distance = shape.get_distance_from_target()
+                if shape is not pressed_shape and 0 < distance <= shape.speed:
+                    events.put(EVENT_SWITCH, shape.button_number)
+                    pressed_shape = shape
+            else:
+                gesture_at = None
+                # Splash, countdown and result screens wait for a start press
+                if now >= next_press:
+                    events.put(EVENT_BUTTON)
+                    next_press = now + SOAK_PRESS_INTERVAL
+
+        self.done = True
+        self.report()
+        ctx.stop()
+
+    def analyze(self):
+        """
+        Compare each level's samples across rounds.
+
+        Returns
+        -------
+        list of str
+            One line per problem found (empty if the heap looks stable).
+        """
+        problems = []
+        for level in range(1, NUM_LEVELS + 1):
+            first = None
+            second = None
+            last = None
+            for i in range(self.count):
+                if self.levels[i] == level:
+                    if first is None:
+                        first = i
+                    elif second is None:
+                        second = i
+                    last = i
+            if second is None:
+                continue
+            # The first round includes one-time allocations (caches, first
+            # use of screens), so compare from the second when there are
+            # three or more samples
+            if second != last:
+                first = second
+
+            rounds = self.rounds[last] - self.rounds[first]
+            lost = self.free[first] - self.free[last]
+            if lost > SOAK_LEAK_BYTES:
+                problems.append(
+                    f"LEAK level {level}: {lost} B less free heap "
+                    f"after {rounds} more rounds"
+                )
+            shrunk = self.largest[first] - self.largest[last]
+            if shrunk > SOAK_FRAGMENT_BYTES:
+                problems.append(
+                    f"FRAGMENTATION level {level}: largest block {shrunk} B "
+                    f"smaller after {rounds} more rounds"
+                )
+            added = self.layers[last] - self.layers[first]
+            if added > 0:
+                problems.append(
+                    f"LAYERS level {level}: {added} more root group layers "
+                    f"after {rounds} more rounds"
+                )
+        return problems
+
+    def report(self):
+        """Print the samples as CSV and the trends found."""
+        print(f"\n=== Soak test: {self.round} of {len(self.plan)} rounds ===")
+        print(CSV_HEADER)
+        for i in range(self.count):
+            plan_round = self.rounds[i]
+            plan = self.plan[plan_round] if plan_round < len(self.plan) else "end"
+            print(
+                f"soak,{plan_round},{plan},{self.levels[i]},{self.free[i]},"
+                f"{self.largest[i]},{self.layers[i]}"
+            )
+
+        problems = self.analyze()
+        for problem in problems:
+            print(problem)
+        if not problems:
+            print("No heap trend found across rounds")
+
+    def finish(self):
+        """Report an interrupted soak (a finished one reports itself)."""
+        if not self.done:
+            self.report()
@@ -2,12 +2,11 @@
 # splash_screen.py
 """Splash screen animation for Dancie."""
 
-import time
-
 import displayio
 import terminalio
 from adafruit_display_text import label
-from game_config import DISPLAY_CENTER, DISPLAY_WIDTH, FRAME_DELAY
+from event_queue import EVENT_BUTTON, EVENT_ROTATE
+from game_config import DISPLAY_CENTER, DISPLAY_WIDTH, NUM_LEVELS
 from helpers_esp32c3 import (
     clear_displayio_bitmap,
     convert_bitmap_str_to_np,
@@ -16,27 +15,27 @@ from helpers_esp32c3 import (
 from splash_frames import SPLASH_FRAMES
 
 
-def run_splash_screen(display, bitmap, button):
+async def run_splash_screen(ctx):
     """
     Run the splash screen animation until button is pressed.
 
     Parameters
     ----------
-    display : adafruit_displayio_ssd1306.SSD1306
-        The display object.
-    bitmap : displayio.Bitmap
-        The bitmap to draw on.
-    button : digitalio.DigitalInOut
-        The button input (configured with Pull.UP).
+    ctx : GameContext
+        Shared game context (display, bitmap and input events).
 
     Returns
     -------
-    bool
-        True if button was pressed to continue.
+    int
+        Starting level chosen with the encoder (1 if it wasn't turned).
     """
     print("\n=== SPLASH SCREEN ===")
     print("Animating kaleidoscope...")
     print("Press button to start game!")
+    bitmap = ctx.bitmap
+    button = ctx.inputs["button"]
+    if button.encoder is not None:
+        print("Turn encoder to choose starting level")
 
     # Create "Press Start" text label
     text_label = label.Label(terminalio.FONT, text="Press Start", color=0xFFFFFF)
@@ -51,39 +50,64 @@ def run_splash_screen(display, bitmap, button):
     text_group = displayio.Group()
     text_group.append(text_label)
 
+    # Starting level selector, only shown when the encoder can rotate
+    starting_level = 1
+    level_label = None
+    if button.encoder is not None:
+        level_label = label.Label(
+            terminalio.FONT, text=f"Level {starting_level}", color=0xFFFFFF
+        )
+        level_label.x = 0
+        level_label.y = 4
+        text_group.append(level_label)
+
     # Add text group to display (on top of bitmap)
-    root_group = display.root_group
+    root_group = ctx.display.root_group
     root_group.append(text_group)
 
     # Convert frames on-the-fly to save memory
     frame_idx = 0
     num_frames = len(SPLASH_FRAMES)
 
+    # Ignore presses queued before the splash screen appeared
+    events = ctx.events
+    events.clear()
+
     # Animation loop - continues until button pressed
     try:
         while True:
-            # Check button (active LOW with pull-up)
-            if not button.value:
-                print("\n✓ Button pressed! Starting game...")
-                # Clean up text group before returning
-                root_group.remove(text_group)
-                return True
+            # Drain queued input events (none are lost between frames)
+            while len(events):
+                kind = events.pop()
+                if kind == EVENT_BUTTON:
+                    print(
+                        f"\n✓ Button pressed! Starting game at level {starting_level}..."
+                    )
+                    # Clean up text group before returning
+                    root_group.remove(text_group)
+                    return starting_level
+
+                # Turning the encoder selects the starting level
+                if kind == EVENT_ROTATE and level_label is not None:
+                    starting_level = min(
+                        max(starting_level + events.value, 1), NUM_LEVELS
+                    )
+                    level_label.text = f"Level {starting_level}"
 
             # Animate splash screen
-            display.auto_refresh = False
             clear_displayio_bitmap(bitmap)
 
             # Draw current kaleidoscope frame
             frame_np = convert_bitmap_str_to_np(SPLASH_FRAMES[frame_idx])
             draw_numpy_to_displayio_bitmap(frame_np, bitmap, origin=DISPLAY_CENTER)
 
-            display.refresh()
+            ctx.request_frame()
 
             # Move to next frame (loop animation)
             frame_idx = (frame_idx + 1) % num_frames
 
-            # Control frame rate
-            time.sleep(FRAME_DELAY)
+            # Control frame rate (other tasks run meanwhile)
+            await ctx.sleep()
 
     except Exception as e:
         # Make sure to clean up on any error
@@ -0,0 +1,154 @@
+# tilt_classifier.py
+"""
+Streaming tilt classifier with low-pass filtering and hysteresis.
+
+Classifying raw samples one at a time lets a jolt (e.g. from pressing a
+limit switch) register as a gesture, and checking X before Y means X always
+wins. TiltClassifier instead keeps a running low-pass filter of X and Y,
+picks the dominant axis, and only confirms a direction once the filtered
+value has stayed past the enter threshold for a few samples. A confirmed
+direction is held until the filtered value drops below a lower exit
+threshold. Every update is O(1) integer math, so it can run at the full
+sensor rate inside the frame loop.
+"""
+
+from game_config import ACCEL_FILTER_SHIFT, ACCEL_TILT_DWELL_SAMPLES
+
+# Filter state is kept in 1/16 counts so small shifts don't lose precision
+_FIXED_SHIFT = 4
+
+
+class TiltClassifier:
+    """
+    Incremental tilt classifier.
+
+    After each update(), `direction` holds the confirmed tilt ("left",
+    "right", "up", "down" or None), `confidence` how clear it is (0-100) and
+    `onset_ms` the timestamp of the sample where the tilt started.
+
+    Parameters
+    ----------
+    enter_threshold : int
+        Filtered acceleration (raw counts) that starts a tilt.
+    exit_threshold : int
+        Filtered acceleration (raw counts) below which a tilt ends.
+    dwell_samples : int
+        Consecutive samples past enter_threshold needed to confirm a tilt.
+    filter_shift : int
+        Low-pass strength: each sample moves the filter 1/2**filter_shift
+        of the way to the new value.
+    """
+
+    def __init__(
+        self,
+        enter_threshold,
+        exit_threshold,
+        dwell_samples=ACCEL_TILT_DWELL_SAMPLES,
+        filter_shift=ACCEL_FILTER_SHIFT,
+    ):
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+        self.dwell_samples = dwell_samples
+        self.filter_shift = filter_shift
+        self.reset()
+
+    def reset(self):
+        """Forget the filter history and any tilt in progress."""
+        self.filtered_x = 0
+        self.filtered_y = 0
+        self.primed = False
+
+        self.candidate = None
+        self.candidate_count = 0
+        self.candidate_onset_ms = 0
+
+        self.direction = None
+        self.confidence = 0
+        self.onset_ms = 0
+
+    def update(self, x, y, timestamp_ms):
+        """
+        Feed one sample.
+
+        Parameters
+        ----------
+        x : int
+            X-axis acceleration in raw counts.
+        y : int
+            Y-axis acceleration in raw counts.
+        timestamp_ms : int
+            Time the sample was taken, in milliseconds.
+
+        Returns
+        -------
+        str or None
+            The direction if this sample confirmed a new tilt, else None.
+        """
+        # Low-pass filter (first sample seeds it so there's no ramp-up)
+        if self.primed:
+            shift = self.filter_shift
+            self.filtered_x += ((x << _FIXED_SHIFT) - self.filtered_x) >> shift
+            self.filtered_y += ((y << _FIXED_SHIFT) - self.filtered_y) >> shift
+        else:
+            self.filtered_x = x << _FIXED_SHIFT
+            self.filtered_y = y << _FIXED_SHIFT
+            self.primed = True
+
+        fx = self.filtered_x >> _FIXED_SHIFT
+        fy = self.filtered_y >> _FIXED_SHIFT
+        abs_x = fx if fx >= 0 else -fx
+        abs_y = fy if fy >= 0 else -fy
+
+        # Dominant axis decides the candidate direction
+        if abs_x >= abs_y:
+            magnitude = abs_x
+            other = abs_y
+            leaning = "right" if fx > 0 else "left"
+        else:
+            magnitude = abs_y
+            other = abs_x
+            leaning = "up" if fy > 0 else "down"
+
+        # Holding a confirmed tilt: release below the exit threshold
+        if self.direction is not None:
+            if leaning != self.direction or magnitude < self.exit_threshold:
+                self.direction = None
+                self.confidence = 0
+                self.candidate = None
+                self.candidate_count = 0
+            else:
+                self.confidence = self._confidence(magnitude, other)
+                return None
+
+        if magnitude < self.enter_threshold:
+            self.candidate = None
+            self.candidate_count = 0
+            return None
+
+        if leaning != self.candidate:
+            self.candidate = leaning
+            self.candidate_count = 0
+            self.candidate_onset_ms = timestamp_ms
+
+        self.candidate_count += 1
+        if self.candidate_count < self.dwell_samples:
+            return None
+
+        self.direction = leaning
+        self.confidence = self._confidence(magnitude, other)
+        self.onset_ms = self.candidate_onset_ms
+        return leaning
+
+    def _confidence(self, magnitude, other):
+        """
+        Rate a tilt from 0 to 100.
+
+        50 at the enter threshold rising to 100 at twice the threshold, minus
+        up to 50 for acceleration on the other axis (a diagonal is unclear).
+        """
+        strength = magnitude * 50 // self.enter_threshold
+        if strength > 100:
+            strength = 100
+        confidence = strength - other * 50 // magnitude
+        return confidence if confidence > 0 else 0
+
@@ -0,0 +1,23 @@
+# conftest.py
+"""
+Run the device modules under pytest through the simulator's shims.
+
+src/ is importable as on CIRCUITPY, with the CircuitPython modules
+(board, analogio, ...) provided by simulator/shims. src/ goes last on the
+path so its code.py doesn't shadow the standard library's code module
+(pytest's debugger imports it). The simulated board runs on its virtual
+clock, so time.sleep() in the code under test returns at once.
+"""
+
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, os.path.join(REPO_DIR, "simulator", "shims"))
+sys.path.append(os.path.join(REPO_DIR, "src"))
+
+# sim_hardware has to come first: board imports it through microcontroller
+import sim_hardware  # noqa: E402
+
+sim_hardware.install(realtime=False)
@@ -0,0 +1,117 @@
+# test_game_tasks.py
+"""
+GameContext waits and tilt detection while the game task waits.
+
+A gesture prompt draws its arrow once, then waits for EVENT_TILT without
+requesting frames, so the accelerometer is never serviced by a refresh.
+These checks run input_task against the simulated ADXL345 and tilt the
+board through the simulator while nothing is rendered, and check that
+waits wake on the event and time out on the clock (or on ticks with
+fixed_step).
+"""
+
+import asyncio
+import time
+
+import board
+import pytest
+import sim_hardware
+from event_queue import EVENT_BUTTON, EVENT_TILT, TILT_DIRECTIONS
+from game_config import FRAME_DELAY
+from game_tasks import GameContext, input_task
+from i2c_bus import I2CBus
+from input_handler import AccelerometerInput, MultiplexerInput, RotaryEncoderButton
+
+
+@pytest.fixture
+def ctx():
+    bus = I2CBus(board.SCL, board.SDA)
+    accel = AccelerometerInput(bus.i2c, bus_stats=bus.register("accel"))
+    bus.schedule(accel.service)
+    inputs = {
+        "mux": MultiplexerInput(),
+        "accel": accel,
+        "button": RotaryEncoderButton(
+            pin=board.D7, clk_pin=board.D0, dt_pin=board.D1
+        ),
+        "bus": bus,
+    }
+    yield GameContext(None, None, inputs, None, None, None, None)
+    sim_hardware.get_hardware().set_tilt(None)
+
+
+def run_prompt(ctx, tilt_at, hold, timeout):
+    """Tilt left at tilt_at s into a prompt, return the tilt seen (or None)."""
+    hardware = sim_hardware.get_hardware()
+
+    async def tilt():
+        await asyncio.sleep(tilt_at)
+        hardware.set_tilt("left")
+        await asyncio.sleep(hold)
+        hardware.set_tilt(None)
+
+    async def prompt():
+        scanner = asyncio.create_task(input_task(ctx))
+        tilter = asyncio.create_task(tilt())
+        try:
+            ctx.inputs["accel"].reset()
+            ctx.events.clear()
+            if await ctx.wait_for_event(EVENT_TILT, timeout=timeout):
+                return TILT_DIRECTIONS[ctx.events.value]
+            return None
+        finally:
+            scanner.cancel()
+            tilter.cancel()
+
+    return asyncio.run(prompt())
+
+
+def test_tilt_during_static_prompt_is_detected(ctx):
+    assert run_prompt(ctx, tilt_at=1.0, hold=0.5, timeout=2.0) == "left"
+    # Nothing was drawn: the sensor was read by input_task alone
+    assert ctx.bus.display_stats.transfers == 0
+    assert ctx.bus.devices["accel"].transfers > 0
+
+
+def test_no_tilt_times_out(ctx):
+    assert run_prompt(ctx, tilt_at=5.0, hold=0.5, timeout=1.0) is None
+
+
+async def wait_after_put(ctx, put_at, timeout):
+    """Queue a button press put_at s into a wait; return (result, seconds, ticks)."""
+
+    async def press():
+        await asyncio.sleep(put_at)
+        ctx.events.put(EVENT_BUTTON)
+
+    presser = asyncio.create_task(press())
+    start = time.monotonic()
+    try:
+        result = await ctx.wait_for_event(EVENT_BUTTON, timeout=timeout)
+        return result, time.monotonic() - start, ctx.ticks
+    finally:
+        presser.cancel()
+
+
+def test_wait_wakes_on_the_event(ctx):
+    result, seconds, ticks = asyncio.run(
+        wait_after_put(ctx, put_at=0.123, timeout=None)
+    )
+    assert result
+    assert seconds == pytest.approx(0.123, abs=0.002)
+    assert ticks == int(0.123 / FRAME_DELAY)
+
+
+def test_wait_timeout_follows_the_clock_or_ticks(ctx):
+    async def waits():
+        result, seconds, _ = await wait_after_put(ctx, put_at=5.0, timeout=0.42)
+        assert not result
+        assert seconds == pytest.approx(0.42, abs=0.002)
+
+        ctx.fixed_step = True
+        ctx.ticks = 0
+        result, _, ticks = await wait_after_put(ctx, put_at=5.0, timeout=0.42)
+        assert not result
+        assert ticks == round(0.42 / FRAME_DELAY)
+
+    asyncio.run(waits())
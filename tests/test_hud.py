@@ -0,0 +1,60 @@
+# test_hud.py
+"""HUD number fields and the fallback without the font file."""
+
+import os
+
+import displayio
+import pytest
+from hud import Font5x8, Hud
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets")
+
+
+@pytest.fixture
+def hud():
+    font = Font5x8(os.path.join(ASSETS_DIR, "font5x8.bin"))
+    return Hud(displayio.Group(), font=font)
+
+
+def text(hud):
+    return bytes(hud.cells).decode()
+
+
+@pytest.mark.parametrize(
+    "score, shown",
+    [
+        (0, "    0"),
+        (-5, "   -5"),
+        (1234, " 1234"),
+        (-9999, "-9999"),
+        (-10000, "-9999"),
+        (-123456, "-9999"),
+        (99999, "99999"),
+        (100000, "99999"),
+    ],
+)
+def test_score_is_clamped_to_its_field(hud, score, shown):
+    assert hud.update(1, score, 5)
+    assert text(hud)[5:10] == shown
+
+
+def test_level_and_health_are_clamped(hud):
+    hud.update(150, 0, 12)
+    assert text(hud).startswith("L99 S")
+    assert text(hud).endswith("H9")
+
+
+def test_unchanged_values_need_no_refresh(hud):
+    assert hud.update(3, 42, 4)
+    assert not hud.update(3, 42, 4)
+
+
+def test_missing_font_disables_the_hud(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    hud = Hud(displayio.Group())
+
+    assert hud.font is None
+    assert "HUD disabled" in capsys.readouterr().out
+    assert not hud.update(1, 10, 5)
+    hud.visible = True
+    assert hud.visible
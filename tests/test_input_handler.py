@@ -0,0 +1,154 @@
+# test_input_handler.py
+"""
+Switch detection on recorded multiplexer waveforms.
+
+The fake ADCs replay per-channel waveforms shaped like adc_trace.py
+captures of the console's switches: a released switch holds a steady HIGH
+through the pull-up with a little noise, a pressed one sits LOW, and one
+caught while bouncing flickers between the two. FakeBufferedIn hands them
+out as 12-bit BufferedIn samples, FakeAnalogIn as 16-bit AnalogIn reads.
+"""
+
+import array
+
+import pytest
+from game_config import (
+    MUX_CAPTURE_BITS,
+    MUX_CAPTURE_SAMPLES,
+    MUX_DEBOUNCE_SAMPLES,
+    MUX_VOLTAGE_THRESHOLD,
+)
+from input_handler import MultiplexerInput, classify_samples
+
+# 16-bit AnalogIn waveforms
+RELEASED = (60112, 59968, 60240, 60016, 59904, 60176, 60080, 59952)
+PRESSED = (912, 1040, 976, 1104, 880, 1008, 944, 1072)
+BOUNCING = (59840, 60064, 22480, 3120, 58912, 60128, 41760, 1296)
+# Just above and just below the default threshold
+NEAR_RELEASED = (31040, 31200, 30960, 31120, 31008, 31168, 31072, 30992)
+NEAR_PRESSED = (31040, 31200, 28880, 31120, 31008, 31168, 31072, 30992)
+
+
+def waveform(samples, length, shift=0):
+    """Repeat a waveform to fill a capture, in the ADC's native units."""
+    return [samples[i % len(samples)] >> shift for i in range(length)]
+
+
+class FakeAnalogIn:
+    """AnalogIn stand-in reading the waveform of the selected channel."""
+
+    def __init__(self, waveforms):
+        self.waveforms = waveforms
+        self.mux = None
+        self.positions = [0] * 8
+
+    @property
+    def value(self):
+        channel = self.mux.s0.value | self.mux.s1.value << 1 | self.mux.s2.value << 2
+        samples = self.waveforms.get(channel, RELEASED)
+        position = self.positions[channel]
+        self.positions[channel] = position + 1
+        return samples[position % len(samples)]
+
+    def deinit(self):
+        pass
+
+
+class FakeBufferedIn(FakeAnalogIn):
+    """BufferedIn stand-in filling the buffer with 12-bit samples."""
+
+    def readinto(self, buffer):
+        for i in range(len(buffer)):
+            buffer[i] = self.value >> (16 - MUX_CAPTURE_BITS)
+        return len(buffer)
+
+
+def make_mux(fake):
+    mux = MultiplexerInput(adc=fake)
+    fake.mux = mux
+    return mux
+
+
+@pytest.fixture(params=[FakeAnalogIn, FakeBufferedIn], ids=["analog", "buffered"])
+def adc_class(request):
+    return request.param
+
+
+@pytest.mark.parametrize(
+    "samples, pressed",
+    [
+        (RELEASED, False),
+        (PRESSED, True),
+        (BOUNCING, True),
+        (NEAR_RELEASED, False),
+        (NEAR_PRESSED, True),
+    ],
+)
+def test_classify_samples(samples, pressed):
+    assert classify_samples(array.array("H", samples), MUX_VOLTAGE_THRESHOLD) is pressed
+
+
+def test_classify_samples_threshold_is_exclusive():
+    samples = array.array("H", [MUX_VOLTAGE_THRESHOLD] * 4)
+    assert not classify_samples(samples, MUX_VOLTAGE_THRESHOLD)
+    assert classify_samples(samples, MUX_VOLTAGE_THRESHOLD + 1)
+
+
+def test_capture_modes():
+    analog = make_mux(FakeAnalogIn({}))
+    assert analog.capture_mode == "analog"
+    assert analog.sample_shift == 0
+    assert len(analog.samples) == MUX_DEBOUNCE_SAMPLES
+
+    buffered = make_mux(FakeBufferedIn({}))
+    assert buffered.capture_mode == "buffered"
+    assert buffered.sample_shift == 16 - MUX_CAPTURE_BITS
+    assert len(buffered.samples) == MUX_CAPTURE_SAMPLES
+
+
+def test_thresholds_shift_to_native_units(adc_class):
+    mux = make_mux(adc_class({}))
+    shift = mux.sample_shift
+    assert mux.thresholds == [MUX_VOLTAGE_THRESHOLD >> shift] * 8
+
+    calibrated = [30000, 31000, 32000, 33000, 34000, 35000, 36000, 65535]
+    mux.apply_calibration(calibrated, 0.002)
+    assert mux.thresholds == [threshold >> shift for threshold in calibrated]
+    assert mux.settle_time == 0.002
+
+
+def test_capture_fills_the_preallocated_buffer(adc_class):
+    fake = adc_class({2: BOUNCING})
+    mux = make_mux(fake)
+    buffer = mux.samples
+
+    samples = mux.capture(2)
+    assert samples is buffer
+    assert list(samples) == waveform(BOUNCING, len(buffer), mux.sample_shift)
+
+
+def test_read_switch_per_channel(adc_class):
+    # NEAR_RELEASED only reads released in buffered mode because the
+    # threshold was shifted down to 12-bit units along with the samples
+    waveforms = {1: PRESSED, 4: BOUNCING, 5: NEAR_PRESSED, 6: NEAR_RELEASED}
+    assert make_mux(adc_class(waveforms)).get_pressed_buttons() == [2, 5, 6]
+
+    assert make_mux(adc_class(waveforms)).scan_all() == [
+        False,
+        True,
+        False,
+        False,
+        True,
+        True,
+        False,
+        False,
+    ]
+
+
+def test_release_after_press(adc_class):
+    waveforms = {3: PRESSED}
+    mux = make_mux(adc_class(waveforms))
+    assert mux.read_switch(3)
+
+    waveforms[3] = RELEASED
+    assert not mux.read_switch(3)